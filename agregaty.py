@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+from functools import partial
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from scipy import stats
+
+# Kolumny tabeli statystyk dostatecznych grupy
+KOLUMNY = ['n', 'mean', 'm2']
+
+
+def statystyki_grup(values, groups):
+    """
+    Statystyki dostateczne dla każdej grupy: liczność, średnia i suma kwadratów odchyleń (M2).
+
+    Tabele z różnych plików lub fragmentów danych łączy funkcja polacz, więc można je
+    liczyć niezależnie (także równolegle) i scalić na końcu.
+
+    Parametry:
+    - values: array-like — wartości liczbowe
+    - groups: array-like — etykiety grup (ta sama długość co values)
+
+    Zwraca:
+    - pd.DataFrame indeksowany grupą, z kolumnami n, mean, m2
+    """
+    values = np.asarray(values, dtype=np.float64)
+    groups = pd.Series(np.asarray(groups))
+    mask = ~np.isnan(values) & groups.notna().to_numpy()
+    codes, labels = pd.factorize(groups[mask], sort=True)
+    v = values[mask]
+
+    n = np.bincount(codes, minlength=len(labels)).astype(np.float64)
+    mean = np.bincount(codes, weights=v, minlength=len(labels)) / n
+    m2 = np.bincount(codes, weights=(v - mean[codes]) ** 2, minlength=len(labels))
+    return pd.DataFrame({'n': n, 'mean': mean, 'm2': m2}, index=pd.Index(labels, name='group'))
+
+
+def polacz(*tables):
+    """
+    Łączy tabele statystyk dostatecznych (wzór Chana dla średniej i M2).
+
+    Grupy występujące tylko w części tabel są przenoszone bez zmian.
+    """
+    tables = [t for t in tables if len(t)]
+    if not tables:
+        return pd.DataFrame(columns=KOLUMNY, index=pd.Index([], name='group'), dtype=float)
+    result = tables[0]
+    for table in tables[1:]:
+        a, b = result.align(table, join='outer', fill_value=0.0)
+        n = a['n'] + b['n']
+        delta = b['mean'] - a['mean']
+        mean = a['mean'] + delta * b['n'] / n
+        m2 = a['m2'] + b['m2'] + delta ** 2 * a['n'] * b['n'] / n
+        result = pd.DataFrame({'n': n, 'mean': mean, 'm2': m2})
+    return result.sort_index()
+
+
+def agreguj(chunks, func=statystyki_grup, workers=1):
+    """
+    Liczy tabele statystyk dla kolejnych fragmentów danych i łączy je w jedną.
+
+    Fragmenty są pobierane z chunks dopiero wtedy, gdy jest wolny proces: w toku jest
+    najwyżej 2 * workers fragmentów, a gotowe tabele są od razu dołączane do wyniku,
+    więc generator fragmentów (np. czytający kolejne pliki) nie jest wczytywany w całości.
+
+    Parametry:
+    - chunks: iterable — krotki (values, groups), np. po jednej na plik lub fragment pliku
+    - func: callable — funkcja (values, groups) -> tabela (statystyki_grup lub odchylenia_grup
+      z ustalonymi środkami przez functools.partial)
+    - workers: int — liczba procesów (1 = w bieżącym procesie)
+    """
+    result = polacz()
+    if workers == 1:
+        for values, groups in chunks:
+            result = polacz(result, func(values, groups))
+        return result
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for values, groups in chunks:
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                result = polacz(result, *(future.result() for future in done))
+            pending.add(executor.submit(func, values, groups))
+        for future in pending:
+            result = polacz(result, future.result())
+    return result
+
+
+def tabela_grup(data, labels=None, workers=1):
+    """
+    Statystyki dostateczne grup podanych jako osobne serie (np. po jednej na plik):
+    tabela każdej serii jest liczona osobno i łączona przez agreguj, bez sklejania
+    wszystkich wartości w jedną tablicę.
+
+    Parametry:
+    - data: list — serie danych kolejnych grup (NaN są pomijane)
+    - labels: list | None — etykiety grup; domyślnie 1..k
+    - workers: int — liczba procesów (patrz agreguj)
+    """
+    labels = list(range(1, len(data) + 1)) if labels is None else labels
+    chunks = ((g, np.full(len(g), label)) for label, g in zip(labels, data))
+    return agreguj(chunks, workers=workers)
+
+
+def odchylenia_grup(values, groups, centers):
+    """
+    Statystyki dostateczne bezwzględnych odchyleń z = |x - środek grupy| (drugi przebieg
+    testu Levene'a / Browna-Forsythe'a). Wynik łączy się funkcją polacz.
+
+    Parametry:
+    - values, groups: array-like — dane i etykiety grup
+    - centers: pd.Series | dict — środek każdej grupy (średnia albo mediana)
+    """
+    groups = np.asarray(groups)
+    center = pd.Series(groups).map(pd.Series(centers)).to_numpy(dtype=np.float64)
+    z = np.abs(np.asarray(values, dtype=np.float64) - center)
+    return statystyki_grup(z, groups)
+
+
+def anova_z_agregatow(table):
+    """
+    Jednoczynnikowa ANOVA z tabeli statystyk dostatecznych.
+
+    Zwraca krotkę (F, p, df_między, df_wewnątrz).
+    """
+    n, mean, m2 = table['n'].to_numpy(), table['mean'].to_numpy(), table['m2'].to_numpy()
+    k, total = len(n), n.sum()
+    grand_mean = (n * mean).sum() / total
+    ss_between = (n * (mean - grand_mean) ** 2).sum()
+    ss_within = m2.sum()
+    df_between, df_within = k - 1, total - k
+    f_val = (ss_between / df_between) / (ss_within / df_within)
+    p_val = stats.f.sf(f_val, df_between, df_within)
+    return f_val, p_val, df_between, df_within
+
+
+def welch_z_agregatow(table):
+    """
+    ANOVA Welcha (bez założenia równych wariancji) z tabeli statystyk dostatecznych.
+
+    Zwraca krotkę (F, p, df1, df2).
+    """
+    n, mean, m2 = table['n'].to_numpy(), table['mean'].to_numpy(), table['m2'].to_numpy()
+    k = len(n)
+    weights = n / (m2 / (n - 1))
+    total_weight = weights.sum()
+    weighted_mean = (weights * mean).sum() / total_weight
+    a = (weights * (mean - weighted_mean) ** 2).sum() / (k - 1)
+    lam = ((1 - weights / total_weight) ** 2 / (n - 1)).sum()
+    b = 1 + 2 * (k - 2) / (k ** 2 - 1) * lam
+    f_val = a / b
+    df1, df2 = k - 1, (k ** 2 - 1) / (3 * lam)
+    return f_val, stats.f.sf(f_val, df1, df2), df1, df2
+
+
+def levene_z_agregatow(z_table):
+    """
+    Statystyka Levene'a (Browna-Forsythe'a przy środkach = medianach) z tabeli
+    odchyleń zwróconej przez odchylenia_grup / agreguj. Jest to ANOVA na z.
+
+    Zwraca krotkę (W, p).
+    """
+    w, p, _, _ = anova_z_agregatow(z_table)
+    return w, p
+
+
+def levene(data, center='median', workers=1):
+    """
+    Test Levene'a dla grup w pamięci, liczony przez statystyki dostateczne.
+
+    Parametry:
+    - data: list — serie danych kolejnych grup (np. po jednej na plik)
+    - center: str — 'median' (Brown-Forsythe, jak scipy.stats.levene) lub 'mean'
+    - workers: int — liczba procesów (patrz agreguj)
+
+    Środek każdej grupy liczony jest z jej własnych danych, a tabele odchyleń grup są
+    łączone przez agreguj, więc wartości wszystkich grup nie są sklejane w jedną tablicę.
+    Mediany nie da się złożyć ze statystyk dostatecznych fragmentów, więc przy
+    center='median' potrzebne są całe dane każdej grupy. Dla danych strumieniowanych
+    środki można wziąć z przybliżonych median (quantile(0.5) szkicu strumien.SzkicKLL,
+    osobnego dla każdej grupy) i przekazać do odchylenia_grup / agreguj; wynik jest
+    wtedy przybliżony.
+    """
+    data = [np.asarray(g, dtype=np.float64) for g in data]
+    center_func = np.median if center == 'median' else np.mean
+    centers = pd.Series([center_func(g) for g in data])
+    chunks = ((g, np.full(len(g), i)) for i, g in enumerate(data))
+    return levene_z_agregatow(agreguj(chunks, partial(odchylenia_grup, centers=centers), workers))
@@ -1,35 +1,116 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from scipy.stats import shapiro, levene, kruskal
-from statsmodels.formula.api import ols
-from statsmodels.stats.anova import anova_lm
 import funct as fun
+import pomiary
+import schemat
+import skaner
+import wyniki
 
-def analyze_base_folder(base_folder):
-    # Analiza folderu *_base: statystyki opisowe i test Shapiro-Wilka dla plików T_*, R_*, Y_.
-    base_folder = Path(base_folder)
-    results = []
+strumien = fun.leniwy_import("strumien")
 
-    all_data = []
-    # Przetwarzaj pliki CSV rozpoczynające się od T_, R_ lub Y_
-    for file_path in base_folder.glob("*.csv"):
-        name = file_path.name
-        if not (name.startswith("T_") or name.startswith("R_") or name.startswith("Y_")):
-            continue
-        # Wczytaj plik CSV
+def zapisz_wyniki(results, output_file):
+    # Zapis listy linii wyników do pliku tekstowego
+    with open(output_file, "w", encoding="utf-8") as f:
+        for line in results:
+            f.write(line + "\n")
+
+def opisz_levene(record):
+    # Linie raportu dla rekordu testu Levene'a
+    if record.get('blad') is not None:
+        return [f"  Błąd w teście Levene'a: {record['blad']}"]
+    return [f"  Test Levene'a: statystyka={record['statystyka']:.4f}, p={record['p']:.4f}",
+            f"  Wariancje równe? {'TAK' if record['decyzja'] == 'równe wariancje' else 'NIE'}"]
+
+def add_records(records, new_records, **context):
+    # Dopisuje rekordy z kontekstem (folder, plik) do listy zbiorczej
+    if records is not None:
+        for record in new_records:
+            wyniki.dodaj(records, record, **context)
+
+def permutation_options(options):
+    # Argumenty testu permutacyjnego z opcji analizy (None = test wyłączony)
+    if not options or not options.get("permutations"):
+        return None
+    return {"n_permutations": options["permutations"], "seed": options.get("seed"),
+            "workers": options.get("permutation_workers", 1), "early_stop": options.get("early_stop", True)}
+
+def bootstrap_options(options):
+    # Argumenty bootstrapu przedziałów ufności z opcji analizy (None = bez bootstrapu)
+    if not options or not options.get("bootstrap"):
+        return None
+    return {"n_resamples": options["bootstrap"], "seed": options.get("seed")}
+
+def posthoc_options(options):
+    # Ustawienia testów post hoc z opcji analizy (None = domyślne funct.anova)
+    if not options:
+        return None
+    return {key: options[key] for key in ("p_adjust", "max_pairs") if key in options}
+
+def compare_groups(all_data, results, normal, records=None, folder=None, options=None):
+    # Testy porównawcze grup: Levene, równoliczność chi², ANOVA lub Kruskal-Wallis
+    group_records = []
+    # Sprawdź liczbę grup i wielkości próbek
+    if len(all_data) < 2 or all(len(g) < 2 for g in all_data):
+        results.append("  Brak wystarczających grup lub danych do testów porównawczych.")
+    else:
+        # Test Levene'a na równość wariancji (Brown-Forsythe jak scipy.stats.levene),
+        # ze statystyk odchyleń liczonych osobno dla każdego pliku i łączonych
         try:
-            df = pd.read_csv(file_path, header=None)
+            with pomiary.etap('levene'):
+                stat_lev, p_lev = fun.agregaty.levene(all_data)
+            equal_var = (p_lev > 0.05)
+            record = wyniki.rekord('levene', stat_lev, p_lev, n=[len(g) for g in all_data],
+                                   decyzja='równe wariancje' if equal_var else 'różne wariancje')
         except Exception as e:
-            results.append(f"Nie można wczytać pliku {name}: {e}")
-            continue
-        # Sprawdź czy plik jest pusty
-        if df.empty:
-            results.append(f"Plik {name} jest pusty lub nie zawiera danych.")
-            continue
+            record = wyniki.rekord('levene', blad=str(e))
+            equal_var = False
+        group_records.append(record)
+        results.extend(opisz_levene(record))
+
+        # test równolicznosci chi kwadrat
+        with pomiary.etap('test_rownolicznosci'):
+            results = fun.test_rownolicznosci(all_data, results, group_records)
 
-        # Weź pierwszą kolumnę jako dane liczbowe, pomiń inne kolumny jeśli występują
-        data = df.iloc[:, 0]
+        # ANOVA lub Kruskal-Wallisa
+        results = fun.anova(all_data, results, normal, equal_var, group_records,
+                            permutation_options(options), posthoc_options(options))
+
+        # Wielkość efektu z przedziałami bootstrap
+        if bootstrap_options(options) is not None:
+            results = fun.wielkosc_efektu(all_data, results, bootstrap_options(options), group_records)
+
+    add_records(records, group_records, folder=folder)
+    results.append("-" * 40)
+    return results
+
+def analyze_base_data(items, base_folder, records=None, options=None, opisowe=None):
+    """
+    Analiza danych folderu *_base: statystyki opisowe, test normalności i testy porównawcze.
+
+    Parametry:
+    - items: list — krotki (nazwa pliku, pd.Series z danymi) lub (nazwa pliku, komunikat błędu)
+    - base_folder: Path — folder, którego dotyczą wyniki (do opisu w raporcie)
+    - records: list | None — lista, do której dopisywane są rekordy wyników testów
+    - options: dict | None — opcje analizy (normality, permutations, bootstrap, seed, p_adjust, max_pairs)
+    - opisowe: dict | None — gotowe tabele statystyk opisowych plików (read_csv_items_stream)
+
+    Zwraca listę linii wyników albo None, gdy brak poprawnych danych.
+    """
+    base_folder = Path(base_folder)
+    results = []
+    all_data = []
+    normal = None
+    for name, data in items:
+        if isinstance(data, str):
+            results.append(data)
+            continue
         data = pd.to_numeric(data, errors='coerce')  # konwersja do numeric, błędy na NaN
         data = data.dropna()
         if data.empty:
@@ -37,10 +118,17 @@ def analyze_base_folder(base_folder):
             continue
         
         results.append(f"Plik: {name} w folderze {base_folder}")
+        file_records = []
         # Oblicz statystyki opisowe
-        results = fun.statystyki_opisowe(data, results)
+        with pomiary.etap('statystyki_opisowe', plik=name):
+            results = fun.statystyki_opisowe(data, results, file_records, bootstrap_options(options),
+                                             (opisowe or {}).get(name))
         # Test normalności Shapiro-Wilka
-        results, normal = fun.test_normalnosci(data, results)
+        with pomiary.etap('test_normalnosci', plik=name):
+            results, normal = fun.test_normalnosci(data, results, records=file_records,
+                                                   backend=(options or {}).get("normality", "auto"),
+                                                   seed=(options or {}).get("seed"))
+        add_records(records, file_records, folder=base_folder.name, plik=name)
 
         if not data.empty:
             all_data.append(data)
@@ -50,73 +138,50 @@ def analyze_base_folder(base_folder):
         results.append(f"Brak poprawnych danych w folderze {base_folder.name}.")
         return
 
-    # Sprawdź liczbę grup i wielkości próbek
-    if len(all_data) < 2 or all(len(g) < 2 for g in all_data):
-        results.append("  Brak wystarczających grup lub danych do testów porównawczych.")
-    else:
-        # Test Levene'a na równość wariancji
-        try:
-            stat_lev, p_lev = levene(*all_data)
-            equal_var = (p_lev > 0.05)
-            results.append(f"  Test Levene'a: statystyka={stat_lev:.4f}, p={p_lev:.4f}")
-            results.append(f"  Wariancje równe? {'TAK' if equal_var else 'NIE'}")
-        except Exception as e:
-            results.append(f"  Błąd w teście Levene'a: {e}")
-            equal_var = False
+    return compare_groups(all_data, results, normal, records, base_folder.name, options)
 
-        # test równolicznosci chi kwadrat
-        results = fun.test_rownolicznosci(all_data, results)
-
-        # ANOVA lub Kruskal-Wallisa
-        results = fun.anova(all_data, results, normal, equal_var)
+def analyze_ttff_data(items, ttff_folder, records=None, options=None, opisowe=None):
+    """
+    Analiza danych folderu *_TTFF: statystyki TTFF, normalność, testy grupowe.
 
-    results.append("-" * 40)
-    # Zapisz wyniki do pliku results.txt w folderze base
-    output_file = base_folder / "results.txt"
-    with open(output_file, "w", encoding="utf-8") as f:
-        for line in results:
-            f.write(line + "\n")
+    Parametry:
+    - items: list — krotki (nazwa pliku, pd.DataFrame z kolumnami 'TTFF' i 'group')
+      lub (nazwa pliku, komunikat błędu)
+    - ttff_folder: Path — folder, którego dotyczą wyniki (do opisu w raporcie)
+    - records: list | None — lista, do której dopisywane są rekordy wyników testów
+    - options: dict | None — opcje analizy (normality, permutations, bootstrap, seed, p_adjust, max_pairs)
+    - opisowe: dict | None — gotowe tabele statystyk opisowych plików (read_csv_items_stream)
 
-def analyze_ttff_folder(ttff_folder):
-    # Analiza folderu *_TTFF: statystyki TTFF, normalność, testy grupowe.
+    Zwraca listę linii wyników albo None, gdy brak poprawnych danych.
+    """
     ttff_folder = Path(ttff_folder)
     results = []
     all_data = []
-    # Przetwarzaj pliki CSV w folderze TTFF
-    for file_path in ttff_folder.glob("*.csv"):
-        name = file_path.name
-        # Wczytaj plik CSV
-        try:
-            df = pd.read_csv(file_path, header=None)
-        except Exception as e:
-            results.append(f"Nie można wczytać pliku {name}: {e}")
-            continue
-
-        # Sprawdź czy plik jest pusty
-        if df.empty:
-            results.append(f"Plik {name} jest pusty lub nie zawiera danych.")
+    normal = None
+    for name, data in items:
+        if isinstance(data, str):
+            results.append(data)
             continue
 
-        # Sprawdź liczbę kolumn (min. 4 wymagane)
-        if df.shape[1] < 4:
-            results.append(f"Plik {name}: zbyt mało kolumn (wymagane min. 4).")
-            continue
-        
         results.append(f"Plik: {name} w folderze {ttff_folder}")
-        # Wybierz kolumnę 2 jako TTFF i kolumnę 3 jako zmienną grupującą
-        TTFF = pd.to_numeric(df.iloc[:, 2], errors='coerce')
-        group = df.iloc[:, 3]
-        data = pd.DataFrame({'TTFF': TTFF, 'group': group})
+        data = data.assign(TTFF=pd.to_numeric(data['TTFF'], errors='coerce'))
         data = data.dropna(subset=['TTFF', 'group'])
         if data.empty:
             results.append(f"Plik {name}: brak poprawnych danych TTFF lub zmiennej grupującej.")
             continue
 
+        file_records = []
         # Statystyki opisowe TTFF
-        results = fun.statystyki_opisowe(data['TTFF'], results)
+        with pomiary.etap('statystyki_opisowe', plik=name):
+            results = fun.statystyki_opisowe(data['TTFF'], results, file_records, bootstrap_options(options),
+                                             (opisowe or {}).get(name))
 
         # Test normalności Shapiro-Wilka
-        results, normal = fun.test_normalnosci(data['TTFF'], results)
+        with pomiary.etap('test_normalnosci', plik=name):
+            results, normal = fun.test_normalnosci(data['TTFF'], results, records=file_records,
+                                                   backend=(options or {}).get("normality", "auto"),
+                                                   seed=(options or {}).get("seed"))
+        add_records(records, file_records, folder=ttff_folder.name, plik=name)
 
         if not data.empty:
             all_data.append(data["TTFF"])
@@ -126,54 +191,409 @@ def analyze_ttff_folder(ttff_folder):
         results.append(f"Brak poprawnych danych w folderze {ttff_folder.name}.")
         return
 
-    # Sprawdź liczbę grup i wielkości próbek
-    if len(all_data) < 2 or all(len(g) < 2 for g in all_data):
-        results.append("  Brak wystarczających grup lub danych do testów porównawczych.")
-    else:
-        # Test Levene'a na równość wariancji
+    return compare_groups(all_data, results, normal, records, ttff_folder.name, options)
+
+def read_csv_items(folder, check):
+    # Wczytuje pliki CSV folderu; check(name, df) zwraca dane albo komunikat błędu
+    items = []
+    for file_path in sorted(folder.glob("*.csv")):
+        name = file_path.name
+        # Wczytaj plik CSV (komunikat błędu, gdy nie można go wczytać lub jest pusty)
+        with pomiary.etap('read_csv', plik=name):
+            df = skaner.wczytaj_csv(file_path)
+        items.append((name, df if isinstance(df, str) else check(name, df)))
+    return items
+
+def read_csv_items_stream(folder, check, chunksize):
+    """
+    Jak read_csv_items, ale każdy plik jest czytany fragmentami po chunksize wierszy.
+
+    Z fragmentu zostaje tylko kolumna wartości wybrana przez check (base_column,
+    ttff_columns) zamieniona na liczby (bez braków, jak w analyze_base_data /
+    analyze_ttff_data), a statystyki opisowe liczy strumien.opisowe_strumieniowo.
+    W pamięci nie ma więc całej ramki tekstowej pliku, tylko wartości potrzebne testom.
+
+    Zwraca krotkę (items, opisowe): elementy jak read_csv_items i {plik: tabela statystyk}.
+    """
+    items = []
+    opisowe = {}
+    for file_path in sorted(folder.glob("*.csv")):
+        name = file_path.name
+        parts, errors = [], []
+
+        def fragmenty():
+            # Wartości kolejnych fragmentów pliku (jedna grupa); zapamiętuje części do testów
+            for chunk in pd.read_csv(file_path, header=None, chunksize=chunksize):
+                data = check(name, chunk)
+                if isinstance(data, str):
+                    errors.append(data)
+                    return
+                if isinstance(data, pd.DataFrame):
+                    data = data.assign(TTFF=pd.to_numeric(data["TTFF"], errors="coerce"))
+                    data = data.dropna(subset=["TTFF", "group"])
+                    values = data["TTFF"]
+                else:
+                    data = values = pd.to_numeric(data, errors="coerce").dropna()
+                parts.append(data)
+                yield values, np.zeros(len(values), dtype=np.int64)
+
+        with pomiary.etap('read_csv', plik=name):
+            try:
+                opisowe[name] = strumien.opisowe_strumieniowo(fragmenty())
+            except Exception as e:
+                items.append((name, f"Nie można wczytać pliku {name}: {e}"))
+                continue
+        if errors:
+            items.append((name, errors[0]))
+        else:
+            items.append((name, pd.concat(parts, ignore_index=True)))
+    return items, opisowe
+
+def base_column(name, df):
+    # Kolumna 0 to indeks zapisany przez to_csv (funct.export_data), wartości są w kolumnie 1
+    # (te same dane co pipeline.analyze_frames); pomiń inne kolumny jeśli występują
+    if df.shape[1] < 2:
+        return f"Plik {name}: zbyt mało kolumn (wymagane min. 2)."
+    return df.iloc[:, 1]
+
+def ttff_columns(name, df):
+    # Sprawdź liczbę kolumn (min. 4 wymagane)
+    if df.shape[1] < 4:
+        return f"Plik {name}: zbyt mało kolumn (wymagane min. 4)."
+    # Wybierz kolumnę 2 jako TTFF i kolumnę 3 jako zmienną grupującą
+    return pd.DataFrame({'TTFF': df.iloc[:, 2], 'group': df.iloc[:, 3]})
+
+def table_items(table, files, folder):
+    """
+    Elementy folderu z tabeli skanera (skaner.skanuj) w postaci read_csv_items + check,
+    bez ponownego czytania plików. Kolumny jak w analyze_base_folder / analyze_ttff_folder:
+    w *_base kolumna 1 pliku (wartość), w *_TTFF kolumny 2 (TTFF) i 3 (grupa).
+    """
+    folder = Path(folder)
+    kategoria, rodzaj = folder.name.rsplit("_", 1)
+    rows = table[(table["kategoria"] == kategoria) & (table["rodzaj"] == rodzaj)]
+    by_file = {name: part for name, part in rows.groupby("plik", observed=True, sort=False)}
+    items = []
+    for entry in files[files["folder"] == folder.name].itertuples():
+        # Plik z samym nagłówkiem nie ma wierszy w tabeli
+        part = by_file.get(entry.plik, rows.iloc[:0])
+        # Brak błędu jest zapisany w tabeli plików jako NaN, nie None
+        if pd.notna(entry.blad):
+            items.append((entry.plik, entry.blad))
+        elif rodzaj == "base" and entry.kolumny < 2:
+            items.append((entry.plik, f"Plik {entry.plik}: zbyt mało kolumn (wymagane min. 2)."))
+        elif rodzaj == "base":
+            items.append((entry.plik, part["wartosc"].astype("float64").reset_index(drop=True)))
+        elif entry.kolumny < 4:
+            items.append((entry.plik, f"Plik {entry.plik}: zbyt mało kolumn (wymagane min. 4)."))
+        else:
+            # Typy jak w tabeli bez kompaktowania: float64 i tekst (braki jako pd.NA)
+            items.append((entry.plik, pd.DataFrame({"TTFF": part["wartosc"].to_numpy(dtype="float64"),
+                                                    "group": part["poziom"].astype("string").to_numpy(dtype=object)})))
+    return items
+
+def analyze_base_folder(base_folder, write=True, records=None, options=None, items=None):
+    # Analiza folderu *_base: statystyki opisowe i test Shapiro-Wilka dla plików T_*, R_*, Y_.
+    # Zwraca listę linii wyników (None gdy brak danych); przy write=False nie zapisuje results.txt.
+    # items: elementy z table_items zamiast czytania plików folderu; przy opcji "stream"
+    # pliki są czytane fragmentami (read_csv_items_stream).
+    base_folder = Path(base_folder)
+    opisowe = None
+    if items is None and (options or {}).get("stream"):
+        items, opisowe = read_csv_items_stream(base_folder, base_column, options["stream"])
+    elif items is None:
+        items = read_csv_items(base_folder, base_column)
+    # Przetwarzaj pliki CSV rozpoczynające się od T_, R_ lub Y_
+    items = [(name, data) for name, data in items
+             if name.startswith("T_") or name.startswith("R_") or name.startswith("Y_")]
+    results = analyze_base_data(items, base_folder, records, options, opisowe)
+
+    # Zapisz wyniki do pliku results.txt w folderze base
+    if write and results is not None:
+        zapisz_wyniki(results, base_folder / "results.txt")
+    return results
+
+def analyze_ttff_folder(ttff_folder, write=True, records=None, options=None, items=None):
+    # Analiza folderu *_TTFF: statystyki TTFF, normalność, testy grupowe.
+    # Zwraca listę linii wyników (None gdy brak danych); przy write=False nie zapisuje results.txt.
+    # items: elementy z table_items zamiast czytania plików folderu; przy opcji "stream"
+    # pliki są czytane fragmentami (read_csv_items_stream).
+    ttff_folder = Path(ttff_folder)
+    opisowe = None
+    if items is None and (options or {}).get("stream"):
+        items, opisowe = read_csv_items_stream(ttff_folder, ttff_columns, options["stream"])
+    elif items is None:
+        items = read_csv_items(ttff_folder, ttff_columns)
+    results = analyze_ttff_data(items, ttff_folder, records, options, opisowe)
+
+    # Zapisz wyniki do pliku results.txt w folderze TTFF
+    if write and results is not None:
+        zapisz_wyniki(results, ttff_folder / "results.txt")
+    return results
+
+def analyze_folder_pair(base_folder, ttff_folder=None, options=None, items=None):
+    """
+    Analizuje parę folderów *_base / *_TTFF bez zapisu plików (funkcja robocza puli procesów).
+    items: opcjonalnie {nazwa folderu: elementy z table_items} zamiast czytania plików.
+
+    Zwraca listę krotek (folder, wyniki, rekordy, błąd) w kolejności base, TTFF. Błąd
+    w jednym folderze jest zapisywany jako tekst i nie przerywa analizy pozostałych.
+    """
+    output = []
+    for folder, analyze in ((base_folder, analyze_base_folder), (ttff_folder, analyze_ttff_folder)):
+        if folder is None:
+            continue
+        records = []
         try:
-            stat_lev, p_lev = levene(*all_data)
-            equal_var = (p_lev > 0.05)
-            results.append(f"  Test Levene'a: statystyka={stat_lev:.4f}, p={p_lev:.4f}")
-            results.append(f"  Wariancje równe? {'TAK' if equal_var else 'NIE'}")
+            folder_items = None if items is None else items.get(folder.name)
+            with pomiary.etap('folder', folder=folder.name):
+                output.append((folder, analyze(folder, write=False, records=records, options=options,
+                                               items=folder_items), records, None))
         except Exception as e:
-            results.append(f"  Błąd w teście Levene'a: {e}")
-            equal_var = False
+            output.append((folder, None, [], f"{type(e).__name__}: {e}"))
+    return output
 
-        # test równolicznosci chi kwadrat
-        results = fun.test_rownolicznosci(all_data, results)
+def _z_pomiarami(output, events):
+    # Wynik analyze_folder_pair z procesu roboczego; jego pomiary trafiają do śladu
+    pomiary.dolacz(events)
+    return output
 
-        # ANOVA lub Kruskal-Wallisa
-        results = fun.anova(all_data, results, normal, equal_var)
+def find_folder_pairs(data_dir):
+    # Pary (folder *_base, folder *_TTFF lub None) posortowane po nazwie
+    pairs = []
+    for base_folder in sorted(data_dir.iterdir()):
+        if base_folder.is_dir() and base_folder.name.endswith("_base"):
+            prefix = base_folder.name[:-5]  # usuń sufiks '_base'
+            ttff_folder = data_dir / f"{prefix}_TTFF"
+            if not (ttff_folder.exists() and ttff_folder.is_dir()):
+                print(f"Nie znaleziono odpowiadającego folderu TTFF dla {base_folder.name}")
+                ttff_folder = None
+            pairs.append((base_folder, ttff_folder))
+    return pairs
 
-    results.append("-" * 40)
+# Manifest analizy przyrostowej: hashe plików wejściowych i ustawień dla każdego folderu
+manifest_name = ".analysis_manifest.json"
 
-    # Zapisz wyniki do pliku results.txt w folderze TTFF
-    output_file = ttff_folder / "results.txt"
-    with open(output_file, "w", encoding="utf-8") as f:
-        for line in results:
-            f.write(line + "\n")
+# Moduły, od których zależą wyniki analizy (także importowane leniwie, np. moduły
+# statystyczne funct); skrypty wykresów, usługa i benchmark nie unieważniają wyników
+analysis_modules = ("analize_data", "funct", "agregaty", "permutacje", "posthoc", "bootstrap",
+                    "normalnosc", "strumien", "skaner", "eksport_data", "schemat", "wyniki")
+
+def analysis_settings(options=None):
+    # Ustawienia wpływające na wyniki: kod modułów analysis_modules (ścieżki obok
+    # analize_data, bez ładowania modułów) i opcje
+    digest = hashlib.sha256()
+    for name in analysis_modules:
+        module_file = Path(__file__).with_name(f"{name}.py")
+        digest.update(module_file.name.encode())
+        with open(module_file, "rb") as f:
+            digest.update(f.read())
+    settings = {"code": digest.hexdigest()}
+    if options:
+        settings["options"] = options
+    return settings
 
-def main():
+def folder_hash(folder):
+    # Hash zawartości wszystkich plików CSV folderu (nazwy i treść, w stałej kolejności)
+    digest = hashlib.sha256()
+    for file_path in sorted(folder.glob("*.csv")):
+        digest.update(file_path.name.encode())
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+def load_manifest(data_dir):
+    manifest_path = data_dir / manifest_name
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_manifest(data_dir, manifest):
+    with open(data_dir / manifest_name, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+def main(data_dir="data_to_analysis", workers=1, incremental=False, force=False, options=None, scan=False,
+         compact=False, memory_log=None):
+    """
+    Analiza całego drzewa danych.
+
+    Parametry:
+    - data_dir: str | Path — katalog główny z folderami *_base / *_TTFF
+    - workers: int — liczba procesów roboczych (1 = szeregowo, 0 lub None = liczba rdzeni CPU)
+    - incremental: bool — analizuj tylko foldery, których pliki CSV lub ustawienia zmieniły się
+      od ostatniej analizy (manifest .analysis_manifest.json w data_dir)
+    - force: bool — pełna przebudowa także w trybie incremental (manifest jest odświeżany)
+    - options: dict | None — opcje analizy, np. {"permutations": 9999, "seed": 0} dodaje
+      permutacyjne p-wartości ANOVA / Kruskala-Wallisa (liczone w "permutation_workers"
+      procesach, "early_stop": False wyłącza wczesne zatrzymanie), {"bootstrap": 10000} przedziały
+      ufności bootstrap statystyk opisowych i wielkości efektu, {"normality": "anderson"}
+      zmienia test normalności (domyślnie "auto": Shapiro-Wilk do 5000 wartości),
+      {"p_adjust": "holm", "max_pairs": 45} ustawia testy post hoc (patrz funct.anova),
+      {"stream": 1000000} czyta pliki fragmentami po tyle wierszy (read_csv_items_stream)
+    - scan: bool — wczytaj całe drzewo jednym wielowątkowym przebiegiem (skaner.skanuj)
+      zamiast czytania plików osobno w każdym folderze
+    - compact: bool — zwarte typy kolumn tabeli skanera (schemat.kompaktuj; tylko z scan)
+    - memory_log: list | None — jeśli podana, pamięć tabeli skanera jest wypisywana
+      i dopisywana do listy (schemat.raport_pamieci)
+    """
     # Katalog główny z danymi
-    data_dir = Path("data_to_analysis")
+    data_dir = Path(data_dir)
     if not data_dir.exists():
-        print("Nie znaleziono katalogu 'data_to_analysis'.")
+        print(f"Nie znaleziono katalogu '{data_dir}'.")
         return
-    # Przeglądanie folderów zakończonych na _base
-    for base_folder in data_dir.iterdir():
-        print(f'Analiza folderów: {base_folder}')
-        if base_folder.is_dir() and base_folder.name.endswith("_base"):
-            analyze_base_folder(base_folder)
-            # Szukaj odpowiadającego folderu TTFF
-            prefix = base_folder.name[:-5]  # usuń sufiks '_base'
-            ttff_folder = data_dir / f"{prefix}_TTFF"
-            if ttff_folder.exists() and ttff_folder.is_dir():
-                analyze_ttff_folder(ttff_folder)
+    pairs = find_folder_pairs(data_dir)
+    if not workers:
+        workers = os.cpu_count() or 1
+
+    # Wybór folderów do analizy na podstawie manifestu; pliki CSV i kod są hashowane
+    # tylko w trybie incremental (bez niego manifest nie jest uzupełniany)
+    manifest = load_manifest(data_dir)
+    settings = analysis_settings(options) if incremental else None
+    hashes = {}
+    todo = []
+    for base, ttff in pairs:
+        selected = []
+        for folder in (base, ttff):
+            if folder is None:
+                selected.append(None)
+                continue
+            if not incremental:
+                selected.append(folder)
+                continue
+            hashes[folder.name] = folder_hash(folder)
+            entry = manifest.get(folder.name)
+            up_to_date = (entry is not None and entry["inputs"] == hashes[folder.name]
+                          and entry["settings"] == settings
+                          and (not entry["results"] or (folder / "results.txt").exists()))
+            if not force and up_to_date:
+                print(f"Bez zmian, pominięto: {folder}")
+                selected.append(None)
             else:
-                print(f"Nie znaleziono odpowiadającego folderu TTFF dla {base_folder.name}")
+                selected.append(folder)
+        if selected != [None, None]:
+            todo.append(tuple(selected))
 
-if __name__ == "__main__":
-    main()
+    # Elementy folderów z jednej tabeli całego drzewa
+    items = [None] * len(todo)
+    if scan and todo:
+        with pomiary.etap('skaner'):
+            table, files = skaner.skanuj(data_dir)
+        if memory_log is not None:
+            schemat.raport_pamieci('skaner: tabela', table, memory_log)
+        if compact:
+            table = schemat.kompaktuj(table)
+            if memory_log is not None:
+                schemat.raport_pamieci('skaner: tabela zwarta', table, memory_log)
+        items = [{folder.name: table_items(table, files, folder) for folder in pair if folder is not None}
+                 for pair in todo]
 
+    if workers == 1:
+        outputs = (analyze_folder_pair(base, ttff, options, pair_items)
+                   for (base, ttff), pair_items in zip(todo, items))
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        if pomiary.wlaczone():
+            # Pomiary w procesach roboczych wracają razem z wynikami i są dołączane do śladu
+            futures = [executor.submit(pomiary.w_procesie, pomiary.pamiec_wlaczona(), analyze_folder_pair,
+                                       base, ttff, options, pair_items)
+                       for (base, ttff), pair_items in zip(todo, items)]
+            outputs = (_z_pomiarami(*future.result()) for future in futures)
+        else:
+            futures = [executor.submit(analyze_folder_pair, base, ttff, options, pair_items)
+                       for (base, ttff), pair_items in zip(todo, items)]
+            outputs = (future.result() for future in futures)
 
+    # Zapis wyników w stałej kolejności folderów, niezależnie od kolejności ukończenia zadań
+    all_records = []
+    analyzed = set()
+    try:
+        for output in outputs:
+            for folder, results, records, error in output:
+                print(f'Analiza folderów: {folder}')
+                analyzed.add(folder.name)
+                if error is not None:
+                    print(f"  Błąd analizy folderu {folder.name}: {error}")
+                    manifest.pop(folder.name, None)
+                    continue
+                if results is not None:
+                    with pomiary.etap('zapis wyników', folder=folder.name):
+                        zapisz_wyniki(results, folder / "results.txt")
+                all_records.extend(records)
+                if incremental:
+                    manifest[folder.name] = {"inputs": hashes[folder.name], "settings": settings,
+                                             "results": results is not None}
+                else:
+                    # results.txt mógł powstać z innymi opcjami niż zapisane w manifeście
+                    manifest.pop(folder.name, None)
+    finally:
+        if workers != 1:
+            executor.shutdown()
+        # Rekordy przeanalizowanych folderów zastępują poprzednie w magazynie całego drzewa
+        wyniki.aktualizuj_magazyn(data_dir / wyniki.store_name, all_records, analyzed)
+        save_manifest(data_dir, manifest)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analiza statystyczna folderów data_to_analysis.")
+    parser.add_argument("--data-dir", default="data_to_analysis",
+                        help="katalog główny z folderami *_base i *_TTFF")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="liczba procesów roboczych (0 = liczba rdzeni CPU)")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="analizuj tylko foldery ze zmienionymi danymi lub ustawieniami")
+    parser.add_argument("--force", action="store_true",
+                        help="pełna przebudowa wszystkich folderów (także z --incremental)")
+    parser.add_argument("--scan", action="store_true",
+                        help="wczytaj całe drzewo jednym wielowątkowym przebiegiem")
+    parser.add_argument("--compact", action="store_true",
+                        help="zwarte typy kolumn tabeli skanera (z --scan)")
+    parser.add_argument("--memory", action="store_true", help="wypisz pamięć tabeli skanera")
+    parser.add_argument("--trace", default=None,
+                        help="zapisz czas, czas CPU i pamięć etapów do pliku (format Chrome trace)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="szczytowa pamięć każdego etapu w śladzie (tracemalloc, wolniej)")
+    parser.add_argument("--normality", default="auto", choices=["auto"] + list(fun.normalnosc.BACKENDY),
+                        help="test normalności (auto = Shapiro-Wilk do 5000 wartości, powyżej D'Agostino-Pearson)")
+    parser.add_argument("--permutations", type=int, default=0,
+                        help="liczba permutacji testu permutacyjnego F/H (0 = bez testu)")
+    parser.add_argument("--permutation-workers", type=int, default=1,
+                        help="liczba procesów testu permutacyjnego (0 = liczba rdzeni CPU)")
+    parser.add_argument("--no-early-stop", action="store_true",
+                        help="wykonaj wszystkie permutacje (bez wczesnego zatrzymania po rozstrzygnięciu "
+                             "decyzji; wynik nie zależy wtedy od --permutation-workers)")
+    parser.add_argument("--bootstrap", type=int, default=0,
+                        help="liczba prób bootstrap przedziałów ufności (0 = bez bootstrapu)")
+    parser.add_argument("--p-adjust", default="bonferroni", choices=["bonferroni", "holm", "fdr_bh", "none"],
+                        help="korekta wielokrotnych porównań testu Dunna")
+    parser.add_argument("--max-pairs", type=int, default=45,
+                        help="powyżej tej liczby par raportuj tylko pary istotne")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="ziarno losowania permutacji, prób bootstrap i podpróby testu normalności")
+    parser.add_argument("--stream", type=int, default=0, metavar="CHUNKSIZE",
+                        help="czytaj pliki fragmentami po CHUNKSIZE wierszy, statystyki opisowe "
+                             "strumieniowo (0 = całe pliki; nie z --scan)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    options = {"normality": args.normality, "permutations": args.permutations,
+               "bootstrap": args.bootstrap, "seed": args.seed,
+               "p_adjust": None if args.p_adjust == "none" else args.p_adjust, "max_pairs": args.max_pairs}
+    if args.stream:
+        if args.scan:
+            sys.exit("Opcji --stream nie można łączyć z --scan.")
+        options["stream"] = args.stream
+    if args.permutation_workers != 1:
+        options["permutation_workers"] = args.permutation_workers
+    if args.no_early_stop:
+        options["early_stop"] = False
+    if not (args.permutations or args.bootstrap or args.normality != "auto"
+            or args.p_adjust != "bonferroni" or args.max_pairs != 45 or args.stream):
+        options = None
+    if args.trace:
+        pomiary.wlacz(args.trace_memory)
+    main(args.data_dir, args.workers, args.incremental, args.force, options, args.scan,
+         args.compact, [] if args.memory else None)
+    if args.trace:
+        pomiary.zakoncz(args.trace)
@@ -0,0 +1,245 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import scipy
+import analize_data as ad
+import funct as f
+import syntetyczne
+
+# Plik z wynikami odniesienia (zapisywany przez --save)
+baseline_path = Path(__file__).with_name('benchmark_baseline.json')
+
+# Mierzone procedury w kolejności raportu
+PROCEDURY = ['statystyki_opisowe', 'test_normalnosci', 'test_rownolicznosci', 'anova', 'kruskal',
+             'qqplot', 'qqplot_fast', 'analyze_base_folder', 'analyze_ttff_folder']
+
+# Maksymalna liczba uczestników procedur, których czas rośnie zbyt szybko (bootstrap seaborn)
+LIMITY = {'qqplot': 10**5}
+
+# Skrypty i moduły, których czas uruchomienia mierzy start()
+PUNKTY_WEJSCIA = ['funct', 'analize_data', 'general_plots', 'corelation_plots', 'pipeline',
+                  'szeroki', 'strumien', 'eksport_data', 'skaner']
+
+# Ciężkie biblioteki, których załadowanie przy imporcie raportuje start()
+CIEZKIE = ['scipy.stats', 'seaborn', 'matplotlib.pyplot', 'statsmodels']
+
+# Pomiar w nowym interpreterze: czas importu, załadowane ciężkie biblioteki (moduły
+# funct.leniwy_import jeszcze nieużyte mają typ _LazyModule) i szczytowa pamięć procesu
+_START = '''
+import json, sys, time
+start = time.perf_counter()
+import {modul}
+czas = time.perf_counter() - start
+heavy = [n for n in {ciezkie!r} if n in sys.modules and type(sys.modules[n]).__name__ != '_LazyModule']
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+except ImportError:
+    rss = 0
+print(json.dumps({{'czas': czas, 'pamiec': rss, 'zaladowane': heavy}}))
+'''
+
+# Czas dłuższy od odniesienia o ten współczynnik jest raportowany jako regresja
+tolerancja = 1.5
+
+
+def _qqplot(values, fast):
+    fig, ax = plt.subplots()
+    try:
+        f.qqplot(values, ax, fast=fast)
+    finally:
+        plt.close(fig)
+
+
+def przypadki(frame, data_dir):
+    """
+    Wywołania mierzonych procedur na danych syntetycznych (nazwa → funkcja bez argumentów).
+
+    Procedury funct dostają TTFF wszystkich uczestników albo listę serii TTFF poziomów
+    kolumny 'grupa' (jak compare_groups); analizatory folderów czytają drzewo data_dir
+    (TTFF_base i GRUPA_TTFF) bez zapisu results.txt.
+    """
+    values = frame['R jacket']
+    groups = [part.reset_index(drop=True) for _, part in frame.groupby('grupa', sort=True)['R jacket']]
+    data_dir = Path(data_dir)
+    return {
+        'statystyki_opisowe': lambda: f.statystyki_opisowe(values, []),
+        'test_normalnosci': lambda: f.test_normalnosci(values, []),
+        'test_rownolicznosci': lambda: f.test_rownolicznosci(groups, []),
+        'anova': lambda: f.anova(groups, [], True, True),
+        'kruskal': lambda: f.anova(groups, [], False, False),
+        'qqplot': lambda: _qqplot(values, False),
+        'qqplot_fast': lambda: _qqplot(values, True),
+        'analyze_base_folder': lambda: ad.analyze_base_folder(data_dir / 'TTFF_base', write=False),
+        'analyze_ttff_folder': lambda: ad.analyze_ttff_folder(data_dir / f'{syntetyczne.grupa_name}_TTFF',
+                                                              write=False),
+    }
+
+
+def zmierz(func, repeat=3):
+    """
+    Najkrótszy czas z repeat wywołań (bez śledzenia pamięci) i szczytowa pamięć
+    alokacji Pythona i numpy z osobnego wywołania pod tracemalloc.
+
+    Zwraca dict {'czas': s, 'pamiec': bajty}.
+    """
+    times = []
+    with redirect_stdout(StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {'czas': min(times), 'pamiec': peak}
+
+
+def klucz(procedura, n, levels):
+    return f'{procedura} n={n} poziomy={levels}'
+
+
+def uruchom(sizes, levels, procedury=None, repeat=3, seed=0):
+    """
+    Mierzy procedury dla każdej pary (liczba uczestników, liczba poziomów).
+
+    Pary z mniej niż 5 uczestnikami na poziom są pomijane, tak jak procedury powyżej
+    LIMITY. Drzewo danych analizatorów jest zapisywane do katalogu tymczasowego tylko
+    wtedy, gdy są one wybrane.
+
+    Zwraca:
+    - dict {klucz: {'czas': s, 'pamiec': bajty}}
+    """
+    procedury = procedury or PROCEDURY
+    # Leniwe moduły funct (scipy.stats, seaborn, moduły testów) ładowane przed pomiarami
+    for module in (f.stats, f.sns, f.agregaty, f.bootstrap, f.normalnosc, f.permutacje, f.posthoc):
+        module.__name__
+    out = {}
+    for n in sizes:
+        for k in levels:
+            if n < 5 * k:
+                continue
+            frame = syntetyczne.uczestnicy(n, k, seed)
+            with tempfile.TemporaryDirectory() as data_dir:
+                if any(name.startswith('analyze_') for name in procedury):
+                    syntetyczne.zapisz_drzewo(frame, data_dir)
+                calls = przypadki(frame, data_dir)
+                for name in procedury:
+                    if n > LIMITY.get(name, n):
+                        continue
+                    out[klucz(name, n, k)] = zmierz(calls[name], repeat)
+                    print(f"{klucz(name, n, k)}: {out[klucz(name, n, k)]['czas']:.4f} s")
+    return out
+
+
+def start(entry_points=None, repeat=5):
+    """
+    Czas importu punktów wejścia, każdy w nowym interpreterze (najkrótszy z repeat prób).
+
+    Zwraca:
+    - dict {'start <moduł>': {'czas': s, 'pamiec': bajty, 'zaladowane': lista ciężkich bibliotek}}
+    """
+    out = {}
+    for name in entry_points or PUNKTY_WEJSCIA:
+        code = _START.format(modul=name, ciezkie=CIEZKIE)
+        runs = [json.loads(subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).parent,
+                                          capture_output=True, text=True, check=True).stdout)
+                for _ in range(repeat)]
+        best = min(runs, key=lambda run: run['czas'])
+        out[f'start {name}'] = best
+        print(f"start {name}: {best['czas']:.4f} s, załadowane: {', '.join(best['zaladowane']) or '-'}")
+    return out
+
+
+def srodowisko():
+    # Wersje bibliotek i maszyna, na której zmierzono wyniki odniesienia
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'scipy': scipy.__version__, 'maszyna': platform.machine(), 'system': platform.system()}
+
+
+def porownaj(measured, baseline):
+    """
+    Tabela pomiarów z ilorazami względem odniesienia; kolumna regresja oznacza czas
+    dłuższy niż tolerancja × czas odniesienia.
+    """
+    rows = []
+    for key, value in measured.items():
+        ref = baseline.get(key)
+        rows.append({'pomiar': key, 'czas [s]': value['czas'], 'pamiec [MB]': value['pamiec'] / 2**20,
+                     'czas / odn.': value['czas'] / ref['czas'] if ref else np.nan,
+                     'pamiec / odn.': value['pamiec'] / ref['pamiec'] if ref and ref['pamiec'] else np.nan})
+    table = pd.DataFrame(rows, columns=['pomiar', 'czas [s]', 'pamiec [MB]', 'czas / odn.', 'pamiec / odn.'])
+    table['regresja'] = table['czas / odn.'] > tolerancja
+    return table
+
+
+def main(sizes=(10**2, 10**3, 10**4, 10**5), levels=(3, 30, 300), procedury=None, repeat=3, seed=0,
+         save=False, baseline=baseline_path, startup=False):
+    """
+    Uruchamia benchmark i porównuje go z wynikami odniesienia (plik baseline).
+
+    Parametry:
+    - sizes: tuple — liczby uczestników (10² … 10⁷)
+    - levels: tuple — liczby poziomów kategorii GRUPA
+    - procedury: list | None — nazwy z PROCEDURY; None = wszystkie
+    - repeat: int — liczba powtórzeń pomiaru czasu
+    - seed: int — ziarno generatora danych
+    - save: bool — dopisz pomiary do pliku odniesienia (zastępując te same klucze)
+    - baseline: str | Path — plik odniesienia
+    - startup: bool — zamiast procedur zmierz czas importu punktów wejścia (start())
+
+    Zwraca tabelę porównania (pd.DataFrame).
+    """
+    baseline = Path(baseline)
+    stored = json.loads(baseline.read_text(encoding='utf-8')) if baseline.exists() else {}
+    if startup:
+        measured = start(repeat=max(repeat, 5))
+    else:
+        measured = uruchom(sizes, levels, procedury, repeat, seed)
+    table = porownaj(measured, stored.get('pomiary', {}))
+    print(table.to_string(index=False, float_format=lambda x: f'{x:.4f}'))
+    if table['regresja'].any():
+        print(f"Regresje (czas > {tolerancja} × odniesienie): {', '.join(table.loc[table['regresja'], 'pomiar'])}")
+    if save:
+        stored = {'srodowisko': srodowisko(), 'pomiary': dict(stored.get('pomiary', {}), **measured)}
+        baseline.write_text(json.dumps(stored, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    return table
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark procedur analizy na danych syntetycznych.")
+    parser.add_argument("-n", "--sizes", type=int, nargs="+", default=[10**2, 10**3, 10**4, 10**5],
+                        help="liczby uczestników")
+    parser.add_argument("--levels", type=int, nargs="+", default=[3, 30, 300],
+                        help="liczby poziomów kategorii GRUPA")
+    parser.add_argument("--procedures", nargs="+", default=None, choices=PROCEDURY,
+                        help="mierzone procedury (domyślnie wszystkie)")
+    parser.add_argument("--repeat", type=int, default=3, help="liczba powtórzeń pomiaru czasu")
+    parser.add_argument("--seed", type=int, default=0, help="ziarno generatora danych")
+    parser.add_argument("--save", action="store_true", help="zapisz pomiary jako wyniki odniesienia")
+    parser.add_argument("--baseline", default=baseline_path, help="plik wyników odniesienia")
+    parser.add_argument("--startup", action="store_true",
+                        help="zmierz czas importu skryptów i modułów zamiast procedur")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args.sizes, args.levels, args.procedures, args.repeat, args.seed, args.save, args.baseline,
+         args.startup)
@@ -0,0 +1,243 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from scipy import stats
+
+# Statystyki opisowe z przedziałami bootstrap: nazwa kolumny → kwantyl (None = średnia)
+OPISOWE = {'mean': None, 'median': 0.5, 'q1': 0.25, 'q3': 0.75}
+
+# Wielkości efektu różnic między grupami
+EFEKTY = ['eta2', 'epsilon2']
+
+# Kolumny tabeli wyników bootstrapu
+KOLUMNY = ['estymata', 'perc_lo', 'perc_hi', 'bca_lo', 'bca_hi']
+
+
+def _kwantyle_wierszy(sorted_rows, q):
+    # Kwantyl z interpolacją liniową (jak w pandas) każdego wiersza posortowanej macierzy
+    pos = (sorted_rows.shape[1] - 1) * q
+    lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+    return sorted_rows[:, lo] + (sorted_rows[:, hi] - sorted_rows[:, lo]) * (pos - lo)
+
+
+def statystyki_wierszy(rows, counts=None):
+    """
+    Średnia, mediana, Q1 i Q3 każdego wiersza macierzy prób (próba × obserwacje).
+
+    Jedno sortowanie macierzy wzdłuż wierszy, kwantyle przez indeksowanie kolumn.
+    Parametr counts jest ignorowany (zgodność z efekty_wierszy).
+    """
+    sorted_rows = np.sort(rows, axis=1)
+    return np.column_stack([sorted_rows.mean(axis=1) if q is None else _kwantyle_wierszy(sorted_rows, q)
+                            for q in OPISOWE.values()])
+
+
+def poprawka_wiazan(rows):
+    # Σ (t³ - t) po grupach wiązań każdego wiersza, bez pętli po wierszach (NaN nie tworzą wiązań)
+    sorted_rows = np.sort(rows, axis=1)
+    new_run = np.ones(sorted_rows.shape, dtype=bool)
+    new_run[:, 1:] = sorted_rows[:, 1:] != sorted_rows[:, :-1]
+    run_id = np.cumsum(new_run.ravel()) - 1
+    lengths = np.bincount(run_id).astype(np.float64)
+    run_row = np.nonzero(new_run.ravel())[0] // rows.shape[1]
+    return np.bincount(run_row, weights=lengths ** 3 - lengths, minlength=rows.shape[0])
+
+
+def efekty_wierszy(rows, counts):
+    """
+    Eta² (ANOVA) i epsilon² (Kruskal-Wallis) każdego wiersza macierzy prób, w której
+    kolejne bloki kolumn o licznościach counts należą do kolejnych grup.
+    """
+    # Puste grupy nie mają kolumn ani wkładu do sum (np.add.reduceat nie obsługuje pustych bloków)
+    counts = counts[counts > 0]
+    n = rows.shape[1]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    total = rows.sum(axis=1)
+    between = (np.add.reduceat(rows, starts, axis=1) ** 2 / counts).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        eta2 = (between - total ** 2 / n) / ((rows ** 2).sum(axis=1) - total ** 2 / n)
+
+    ranks = stats.rankdata(rows, axis=1)
+    rank_between = (np.add.reduceat(ranks, starts, axis=1) ** 2 / counts).sum(axis=1)
+    h = 12 / (n * (n + 1)) * rank_between - 3 * (n + 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        h = h / (1 - poprawka_wiazan(rows) / (n ** 3 - n))
+    return np.column_stack([eta2, h / (n - 1)])
+
+
+def _indeksy_prob(rng, counts, size):
+    # Macierz indeksów losowania ze zwracaniem w obrębie każdego bloku grupy
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return np.concatenate([start + rng.integers(0, count, (size, count))
+                           for start, count in zip(starts, counts)], axis=1)
+
+
+def _fragment(func, values, counts, size, seed):
+    # Statystyki jednego fragmentu size prób bootstrap
+    rng = np.random.default_rng(seed)
+    return func(values[_indeksy_prob(rng, counts, size)], counts)
+
+
+def jackknife_opisowe(values, counts=None):
+    """
+    Statystyki statystyki_wierszy wszystkich prób z pominięciem jednej obserwacji,
+    w postaci zamkniętej: średnia z sumy, kwantyle z posortowanej próby (pominięcie
+    obserwacji o pozycji r przesuwa pozycje >= r o jeden). Czas O(n log n) zamiast O(n²).
+
+    Wiersze są w kolejności posortowanych wartości (dla BCa kolejność nie ma znaczenia).
+    """
+    sorted_values = np.sort(values)
+    n = len(sorted_values)
+    removed = np.arange(n)
+    columns = []
+    for q in OPISOWE.values():
+        if q is None:
+            columns.append((sorted_values.sum() - sorted_values) / (n - 1))
+            continue
+        pos = (n - 2) * q
+        lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+        low = sorted_values[lo + (lo >= removed)]
+        high = sorted_values[hi + (hi >= removed)]
+        columns.append(low + (high - low) * (pos - lo))
+    return np.column_stack(columns)
+
+
+def jackknife_efekty(values, counts):
+    """
+    Eta² i epsilon² (efekty_wierszy) wszystkich prób z pominięciem jednej obserwacji,
+    w postaci zamkniętej, czas O(n·k·log n) dla k grup zamiast O(n²).
+
+    - eta²: sumy grup, suma i suma kwadratów pomniejszone o pominiętą wartość
+    - epsilon²: po pominięciu x rangi większych wartości maleją o 1, a rangi wartości
+      równych x o 1/2; sumy rang grup z liczby wartości większych i równych x w każdej
+      grupie (searchsorted), poprawka na wiązania z liczności grupy wiązań x
+    """
+    group = np.repeat(np.arange(len(counts)), counts)
+    n = len(values)
+    n1 = n - 1
+    loo_counts = counts[group] - 1
+
+    # Eta²: ANOVA bez obserwacji i
+    sums = np.bincount(group, weights=values, minlength=len(counts))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        between = (sums ** 2 / counts).sum()
+        own = np.where(loo_counts > 0, (sums[group] - values) ** 2 / np.maximum(loo_counts, 1), 0)
+        between = between - sums[group] ** 2 / counts[group] + own
+        total = values.sum() - values
+        eta2 = (between - total ** 2 / n1) / ((values ** 2).sum() - values ** 2 - total ** 2 / n1)
+
+    # Epsilon²: sumy rang grup bez obserwacji i
+    ranks = stats.rankdata(values)
+    rank_sums = np.bincount(group, weights=ranks, minlength=len(counts))
+    rank_between = np.zeros(n)
+    for h, count in enumerate(counts):
+        sorted_group = np.sort(values[group == h])
+        right = np.searchsorted(sorted_group, values, 'right')
+        greater = count - right
+        equal = right - np.searchsorted(sorted_group, values, 'left')
+        own_group = group == h
+        loo_sum = rank_sums[h] - greater - 0.5 * (equal - own_group) - np.where(own_group, ranks, 0)
+        loo_count = count - own_group
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rank_between += np.where(loo_count > 0, loo_sum ** 2 / np.maximum(loo_count, 1), 0)
+    ties = np.unique(values, return_inverse=True, return_counts=True)
+    t = ties[2][ties[1]].astype(np.float64)
+    correction = poprawka_wiazan(values[None, :])[0] - (t ** 3 - t) + ((t - 1) ** 3 - (t - 1))
+    h = 12 / (n1 * (n1 + 1)) * rank_between - 3 * (n1 + 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        h = h / (1 - correction / (n1 ** 3 - n1))
+    return np.column_stack([eta2, h / (n1 - 1)])
+
+
+def _przedzialy(estimate, boot, jack, ci):
+    # Przedziały percentylowe i BCa dla każdej kolumny statystyk
+    tail = (1 - ci) / 2
+    perc = np.quantile(boot, [tail, 1 - tail], axis=0)
+
+    # Poprawka obciążenia z0 (połowa wiązań liczona jako mniejsze) i przyspieszenie a z jackknife
+    below = (boot < estimate).mean(axis=0) + (boot == estimate).mean(axis=0) / 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z0 = stats.norm.ppf(below)
+        diff = jack.mean(axis=0) - jack
+        a = (diff ** 3).sum(axis=0) / (6 * ((diff ** 2).sum(axis=0)) ** 1.5)
+        bca = []
+        for z_alpha in stats.norm.ppf([tail, 1 - tail]):
+            level = stats.norm.cdf(z0 + (z0 + z_alpha) / (1 - a * (z0 + z_alpha)))
+            bca.append([np.quantile(boot[:, j], level[j]) if np.isfinite(level[j]) else np.nan
+                        for j in range(boot.shape[1])])
+    return np.column_stack([estimate, perc[0], perc[1], bca[0], bca[1]])
+
+
+def _bootstrap(func, jackknife, groups, names, n_resamples, ci, seed, chunk_size, max_memory_mb, workers):
+    groups = [np.asarray(g, dtype=np.float64) for g in groups]
+    # Grupy puste po odrzuceniu NaN nie wpływają na statystyki i nie dają się losować
+    groups = [g[~np.isnan(g)] for g in groups]
+    groups = [g for g in groups if len(g)] or [np.empty(0)]
+    counts = np.array([len(g) for g in groups])
+    values = np.concatenate(groups)
+    if len(values) < 2:
+        return pd.DataFrame(np.nan, index=pd.Index(names, name='statystyka'), columns=KOLUMNY)
+
+    # Fragment: size × N indeksów (int64) i wartości (float64), do tego kopia sortowana
+    size = int(max(1, min(n_resamples, chunk_size, max_memory_mb * 2**20 // (24 * len(values)))))
+    sizes = [size] * (n_resamples // size)
+    if n_resamples % size:
+        sizes.append(n_resamples % size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if not workers:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(sizes) < 2:
+        boot = [_fragment(func, values, counts, s, sd) for s, sd in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            boot = list(executor.map(_fragment, [func] * len(sizes), [values] * len(sizes),
+                                     [counts] * len(sizes), sizes, seeds))
+
+    estimate = func(values[None, :], counts)[0]
+    jack = jackknife(values, counts)
+    table = _przedzialy(estimate, np.concatenate(boot), jack, ci)
+    return pd.DataFrame(table, index=pd.Index(names, name='statystyka'), columns=KOLUMNY)
+
+
+def bootstrap_opisowe(values, n_resamples=10000, ci=0.95, seed=None, chunk_size=1000,
+                      max_memory_mb=64, workers=1):
+    """
+    Przedziały ufności bootstrap (percentylowe i BCa) dla średniej, mediany, Q1 i Q3.
+
+    Próby są losowane jako macierze indeksów (fragment × n) i liczone wektorowo:
+    jedno sortowanie fragmentu wzdłuż wierszy daje wszystkie kwantyle. Przyspieszenie
+    BCa pochodzi z jackknife (n prób bez jednej obserwacji, w postaci zamkniętej).
+
+    Parametry:
+    - values: array-like — dane (NaN są pomijane)
+    - n_resamples: int — liczba prób bootstrap
+    - ci: float — poziom ufności
+    - seed: int | None — ziarno; wynik nie zależy od liczby procesów
+    - chunk_size: int — liczba prób w jednym fragmencie
+    - max_memory_mb: float — limit pamięci jednego fragmentu (zmniejsza chunk_size)
+    - workers: int — liczba procesów (1 = w bieżącym procesie, 0 = liczba rdzeni CPU)
+
+    Zwraca:
+    - pd.DataFrame indeksowany statystyką (mean, median, q1, q3), kolumny KOLUMNY
+    """
+    return _bootstrap(statystyki_wierszy, jackknife_opisowe, [values], list(OPISOWE), n_resamples, ci, seed,
+                      chunk_size, max_memory_mb, workers)
+
+
+def bootstrap_efekt(data, n_resamples=10000, ci=0.95, seed=None, chunk_size=1000,
+                    max_memory_mb=64, workers=1):
+    """
+    Przedziały ufności bootstrap wielkości efektu między grupami: eta² (ANOVA)
+    i epsilon² = H / (n - 1) (Kruskal-Wallis).
+
+    Losowanie jest warstwowe (ze zwracaniem w obrębie każdej grupy), liczności grup
+    pozostają stałe. Parametry jak w bootstrap_opisowe; data to lista serii grup.
+
+    Zwraca:
+    - pd.DataFrame indeksowany statystyką (eta2, epsilon2), kolumny KOLUMNY
+    """
+    return _bootstrap(efekty_wierszy, jackknife_efekty, data, EFEKTY, n_resamples, ci, seed,
+                      chunk_size, max_memory_mb, workers)
@@ -1,15 +1,18 @@
+import argparse
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 from matplotlib.ticker import MaxNLocator
 import funct as f
+import podsumowania
+import pomiary
+import render
+import schemat
 import os
-from pandas.api.types import is_numeric_dtype
 
 
-# Styl wykresów
-sns.set(style="whitegrid")
+# matplotlib.pyplot i seaborn ładowane przy pierwszym rysowaniu (niezmienione wykresy są pomijane)
+plt = f.leniwy_import('matplotlib.pyplot')
+sns = f.leniwy_import('seaborn')
 
 prefixes = ['T_', 'R_', 'Y_']
 suffixes = ['SEX', 'EXPERIENCE', 'H&STEST_RESULTS', 'TIME', 'AGE']
@@ -39,107 +42,246 @@ plot_blacklist = {'SEX': ['O'],
 
 save_data_path = Path('data_to_analysis')
 
-TTFF_df = [0]*3
-# wczytanie TTFF
-for idx, pre in enumerate(prefixes):
-    file_name = Path(pre + 'TTFF' + file_format)
-    file_name = Path(data_path) / file_name
-    TTFF_df[idx] = pd.read_csv(file_name, header=1)
-    TTFF_df[idx] = TTFF_df[idx][[id_column, 'R jacket']]
+def load_sheet(sheet_name, sheets=None, compact=False):
+    # Arkusz z pamięci (sheets) albo z folderu data_path; compact — zwarte typy kolumn
+    if sheets is not None:
+        return schemat.kompaktuj(sheets[sheet_name]) if compact else sheets[sheet_name]
+    with pomiary.etap('wczytanie arkusza', arkusz=sheet_name):
+        return f.wczytaj_arkusz(Path(data_path) / Path(sheet_name + file_format), compact)
 
-TTFF_df = pd.concat(TTFF_df)
 
-# wczytanie danych do analizy
-for file_idx, category in enumerate(suffixes):
+def _unikalni(df, name):
+    # Ramka arkuszy jednej kategorii indeksowana numerem uczestnika; powtórzony numer
+    # zostawia pierwszy wiersz (z ostrzeżeniem), żeby złączenie nie zwielokrotniało wierszy
+    df = df.set_index(id_column)
+    duplicated = df.index.duplicated()
+    if duplicated.any():
+        print(f"Powtórzone numery uczestników w {name}: "
+              f"{sorted(set(df.index[duplicated]))}, pominięto kolejne wiersze")
+        df = df[~duplicated]
+    return df
 
-    cat_df = [0]*3
-    for idx, pre in enumerate(prefixes):
-        # wczytanie odpowiedniej kategorii danych
-        file_name = Path(pre + category + file_format)
-        file_name = Path(data_path) / file_name
-        cat_df[idx] = pd.read_csv(file_name, header=1)
-        cat_df[idx] = cat_df[idx][[id_column, col_names[file_idx]]]
-    cat_df = pd.concat(cat_df)
 
-    # łączenie df w jeden wspólny na podstawie participant nr
-    merged_df = pd.merge(TTFF_df, cat_df, on=id_column)
+def load_participants(sheets=None, compact=False):
+    """
+    Jedna ramka indeksowana numerem uczestnika: TTFF ('R jacket') i kolumny wszystkich kategorii.
 
-    # zwolnienie pamięci
-    del cat_df
+    Każdy arkusz jest wczytywany raz, numery uczestników są sprawdzane raz dla każdej
+    kategorii (powtórzenia są pomijane, patrz _unikalni), a kategorie są dołączane do TTFF
+    jednym złączeniem po unikalnym indeksie. Kolumny kategorii mają typ category, więc
+    braki po złączeniu nie zmieniają typu etykiet (np. liczb całkowitych na float).
+    """
+    TTFF_df = _unikalni(pd.concat([load_sheet(pre + 'TTFF', sheets, compact)[[id_column, 'R jacket']]
+                                   for pre in prefixes]), 'TTFF')
+    categories = []
+    for category, col in zip(suffixes, col_names):
+        cat_df = _unikalni(pd.concat([load_sheet(pre + category, sheets, compact)[[id_column, col]]
+                                      for pre in prefixes]), category)
+        categories.append(cat_df.astype({col: 'category'}))
+    # łączenie z TTFF na podstawie participant nr
+    return TTFF_df.join(categories, how='left')
 
-    # stworzenie listy subplotów
-    sb_names = list(set(merged_df[col_names[file_idx]]))
 
-    # filtrowanie błędnych wykresów
-    if category in plot_blacklist.keys():
-        sb_names = [i for i in sb_names if i not in plot_blacklist[category]]
+def subplot_data(parts, names, col):
+    # Dane jednego subplotu w układzie eksportu: participant nr, R jacket, kolumna kategorii
+    plot_data = pd.concat([parts[name] for name in names]) if len(names) > 1 else parts[names[0]]
+    return plot_data[['R jacket', col]].reset_index()
 
-    if_grouped=False
-    # grupowanie w przypadku zbyt wielu etykiet
-    if len(sb_names) > 3:
-        n = len(sb_names)//3 + 1
-        sb_names = [sb_names[i:i + n] for i in range(0, len(sb_names), n)]
 
-        if_grouped=True
+def draw_category(file_idx, category, subplots):
+    """
+    Rysuje histogramy i boxploty TTFF jednej kategorii.
 
-    # stworzenie subplotów
-    hist_fig, hist_ax = plt.subplots(nrows=1, ncols=len(sb_names), figsize=[8, 5])
-    box_fig, box_ax = plt.subplots(nrows=1, ncols=len(sb_names), figsize=[8, 2])
+    Parametry:
+    - file_idx: int — indeks kategorii w suffixes
+    - category: str — nazwa kategorii
+    - subplots: list — pary (tytuł subplotu, pd.Series z TTFF albo jej podsumowanie
+      podsumowania.podsumuj — wykresy bez surowych danych)
 
-    for idx, ax in enumerate(hist_ax):
+    Zwraca listę par (nazwa pliku bez rozszerzenia, figura) do zapisu.
+    """
+    # Styl wykresów
+    sns.set(style="whitegrid")
 
-        # tworzenie wykresu
-        if not if_grouped:
-            #filtracja danych
-            plot_data = merged_df[merged_df[col_names[file_idx]] == sb_names[idx]]   
+    # stworzenie subplotów
+    hist_fig, hist_ax = plt.subplots(nrows=1, ncols=len(subplots), figsize=[8, 5])
+    box_fig, box_ax = plt.subplots(nrows=1, ncols=len(subplots), figsize=[8, 2])
 
-            # wykres
-            ax.hist(plot_data['R jacket'], color=colors[idx])
-            temp_name = str(sb_names[idx])
+    for idx, ax in enumerate(hist_ax):
+        temp_name, ttff = subplots[idx]
 
+        summary = isinstance(ttff, dict)
+        # wykres
+        if summary:
+            podsumowania.hist(ax, ttff, colors[idx])
         else:
-            # filtracja dla pogrupowanych danych
-            plot_data = merged_df[merged_df[col_names[file_idx]].isin(sb_names[idx])]
-
-            # wykres
-            ax.hist(plot_data['R jacket'], color=colors[idx])
-
-            if category == 'AGE':
-                temp_name = f'{sb_names[idx][0]} - {sb_names[idx][-1]} [y]'
-            elif category == 'TIME':
-                temp_name = f'{sb_names[idx][0]} - {sb_names[idx][-1]} [s]'
-            else: 
-                temp_name = f'{sb_names[idx][0]} - {sb_names[idx][-1]}'
-        
+            ax.hist(ttff, color=colors[idx])
+
         #sprawdzenie czy rysowanie i zapis boxplotu się odbędzie
-        if_boxplot = is_numeric_dtype(plot_data['R jacket'])
+        if_boxplot = podsumowania.liczbowe(ttff)
 
         # rysowanie boxplotów
-        if if_boxplot:
-            box_ax[idx].boxplot(plot_data['R jacket'], 
-                                    orientation='horizontal', 
-                                    patch_artist=True,
-                                    boxprops=dict(facecolor=colors[idx]),
-                                    widths=0.5)
+        if if_boxplot and summary:
+            podsumowania.boxplot(box_ax[idx], ttff, colors[idx])
+        elif if_boxplot:
+            box_ax[idx].boxplot(ttff, 
+                                orientation='horizontal', 
+                                patch_artist=True,
+                                boxprops=dict(facecolor=colors[idx]),
+                                widths=0.5)
 
         ax.set_title(temp_name)
         # ustal, by oś Y miała tylko liczby całkowite
         ax.yaxis.set_major_locator(MaxNLocator(integer=True))
 
-        # eksport danych
-        dir_name = category + '_TTFF'
-        os.makedirs(save_data_path / dir_name, exist_ok=True)
-        f.export_data(plot_data,save_data_path / Path(dir_name) / Path(temp_name + '.csv'))
-
     hist_fig.suptitle(subtitels[file_idx])
     hist_fig.supxlabel("Czas do pierwszej fiksacji [s]")
     hist_fig.supylabel("Liczba wystapień")
-    hist_fig.savefig(plot_path / f'{category}_hist.eps')
-    hist_fig.savefig(plot_path / f'{category}_hist.png')
-    plt.close(hist_fig)
-
-    box_fig.savefig(plot_path / f'{category}_box.eps')
-    box_fig.savefig(plot_path / f'{category}_box.png')
-    #plt.show()
-    
-    pass
+    return [(f'{category}_hist', hist_fig), (f'{category}_box', box_fig)]
+
+
+def main(sheets=None, export=True, formats=render.formats_default, workers=1, force=False,
+         compact=False, memory_log=None, summary=False):
+    """
+    Rysuje histogramy i boxploty TTFF z podziałem na kategorie.
+
+    Parametry:
+    - sheets: dict | None — arkusze w pamięci {nazwa arkusza: DataFrame};
+      None = wczytanie z folderu data_path
+    - export: bool — zapis danych do folderów save_data_path/*_TTFF
+    - formats: tuple — formaty zapisu wykresów
+    - workers: int — liczba procesów rysujących (jedna kategoria na proces)
+    - force: bool — rysuj wszystkie wykresy, także niezmienione
+    - compact: bool — zwarte typy kolumn arkuszy (schemat.kompaktuj)
+    - memory_log: list | None — jeśli podana, pamięć danych po każdym etapie jest
+      wypisywana i dopisywana do listy (schemat.raport_pamieci)
+    - summary: bool — rysuj z podsumowań grup (wspólne przedziały histogramu, pięć liczb
+      boxplotu, ograniczona liczba wartości odstających), zapisanych też do
+      plot_path/podsumowania.json; czas rysowania i rozmiar plików nie zależą od liczby danych
+
+    Zwraca:
+    - dict {nazwa folderu *_TTFF: {nazwa pliku: pd.DataFrame}} z danymi dla analize_data
+    """
+    frames = {}
+    jobs = []
+    summaries = {}
+    participants = load_participants(sheets, compact)
+    if memory_log is not None:
+        schemat.raport_pamieci('corelation_plots: uczestnicy', participants, memory_log)
+
+    # wczytanie danych do analizy
+    for file_idx, category in enumerate(suffixes):
+        col = col_names[file_idx]
+
+        # podział na grupy jednym przejściem groupby (klucze posortowane, bez braków danych)
+        parts = {key: part for key, part in participants.groupby(col, observed=True, sort=True)}
+
+        # stworzenie listy subplotów
+        sb_names = list(parts)
+
+        # filtrowanie błędnych wykresów
+        if category in plot_blacklist.keys():
+            sb_names = [i for i in sb_names if i not in plot_blacklist[category]]
+
+        if_grouped=False
+        # grupowanie w przypadku zbyt wielu etykiet
+        if len(sb_names) > 3:
+            n = len(sb_names)//3 + 1
+            sb_names = [sb_names[i:i + n] for i in range(0, len(sb_names), n)]
+
+            if_grouped=True
+
+        subplots = []
+        for idx in range(len(sb_names)):
+            if not if_grouped:
+                #filtracja danych
+                plot_data = subplot_data(parts, [sb_names[idx]], col)
+                temp_name = str(sb_names[idx])
+
+            else:
+                # filtracja dla pogrupowanych danych
+                plot_data = subplot_data(parts, sb_names[idx], col)
+
+                if category == 'AGE':
+                    temp_name = f'{sb_names[idx][0]} - {sb_names[idx][-1]} [y]'
+                elif category == 'TIME':
+                    temp_name = f'{sb_names[idx][0]} - {sb_names[idx][-1]} [s]'
+                else: 
+                    temp_name = f'{sb_names[idx][0]} - {sb_names[idx][-1]}'
+            subplots.append((temp_name, plot_data['R jacket']))
+
+            dir_name = category + '_TTFF'
+            frames.setdefault(dir_name, {})[temp_name + '.csv'] = plot_data
+            # eksport danych
+            if export:
+                os.makedirs(save_data_path / dir_name, exist_ok=True)
+                with pomiary.etap('eksport', plik=dir_name):
+                    f.export_data(plot_data,save_data_path / Path(dir_name) / Path(temp_name + '.csv'))
+
+        if summary:
+            names = [name for name, _ in subplots]
+            with pomiary.etap('podsumowania', kategoria=category):
+                groups = podsumowania.podsumuj_kategorie([ttff for _, ttff in subplots])
+            summaries[category] = {'tytuly': names, 'grupy': groups}
+            subplots = list(zip(names, groups))
+        jobs.append((category, draw_category, dict(file_idx=file_idx, category=category, subplots=subplots)))
+
+    if memory_log is not None:
+        schemat.raport_pamieci('corelation_plots: dane do analizy', frames, memory_log)
+
+    if summary:
+        os.makedirs(plot_path, exist_ok=True)
+        podsumowania.zapisz(plot_path, summaries)
+
+    # rysowanie i zapis wykresów
+    with pomiary.etap('render_jobs', wykresy=plot_path.name):
+        render.render_jobs(jobs, plot_path, formats, workers, force)
+    return frames
+
+
+def rysuj_z_podsumowan(formats=render.formats_default, workers=1, force=False):
+    """
+    Rysuje wykresy ponownie z podsumowań zapisanych w plot_path/podsumowania.json
+    (main(summary=True)), bez wczytywania arkuszy.
+    """
+    stored = podsumowania.wczytaj(plot_path)
+    jobs = [(category, draw_category, dict(file_idx=file_idx, category=category,
+                                           subplots=list(zip(stored[category]['tytuly'], stored[category]['grupy']))))
+            for file_idx, category in enumerate(suffixes) if category in stored]
+    if not jobs:
+        print(f"Brak podsumowań w {plot_path / podsumowania.summary_name}.")
+    return render.render_jobs(jobs, plot_path, formats, workers, force)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Histogramy TTFF z podziałem na kategorie.")
+    parser.add_argument("--formats", nargs="+", default=list(render.formats_default),
+                        help="formaty zapisu wykresów (np. png)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="liczba procesów rysujących (0 = liczba rdzeni CPU)")
+    parser.add_argument("--force", action="store_true", help="rysuj także niezmienione wykresy")
+    parser.add_argument("--compact", action="store_true",
+                        help="zwarte typy kolumn (kategorie, mniejsze typy liczbowe)")
+    parser.add_argument("--memory", action="store_true", help="wypisz pamięć danych po każdym etapie")
+    parser.add_argument("--summary", action="store_true",
+                        help="rysuj z podsumowań grup (szybko przy bardzo wielu wierszach)")
+    parser.add_argument("--from-summaries", action="store_true",
+                        help="rysuj ponownie z zapisanych podsumowań, bez wczytywania danych")
+    parser.add_argument("--trace", default=None,
+                        help="zapisz czas, czas CPU i pamięć etapów do pliku (format Chrome trace)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="szczytowa pamięć każdego etapu w śladzie (tracemalloc, wolniej)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.trace:
+        pomiary.wlacz(args.trace_memory)
+    if args.from_summaries:
+        rysuj_z_podsumowan(tuple(args.formats), args.workers, args.force)
+    else:
+        main(formats=tuple(args.formats), workers=args.workers, force=args.force,
+             compact=args.compact, memory_log=[] if args.memory else None, summary=args.summary)
+    if args.trace:
+        pomiary.zakoncz(args.trace)
@@ -1,20 +1,589 @@
+import argparse
+import csv
+import fnmatch
+import hashlib
+import io
+import json
+import queue
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
 import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 # Ścieżka do pliku .ods
 file_path = 'ALL_DATA_TRANSPARENT_YELLOW_RED GOGLES_ON_CONSTRUCTION_SITE.ods'
 
 # Folder docelowy
 output_folder = 'eksport_csv'
-os.makedirs(output_folder, exist_ok=True)  # utwórz folder, jeśli nie istnieje
 
-# Wczytanie wszystkich arkuszy
-xls = pd.read_excel(file_path, sheet_name=None, engine='odf')
+# Plik z opisem źródła, z którego powstała pamięć podręczna kolumnowa
+manifest_name = '.cache_manifest.json'
 
-# Zapisz każdy arkusz jako osobny plik CSV
-for sheet_name, df in xls.items():
+# Obsługiwane formaty kolumnowe i rozszerzenia plików
+cache_formats = {'parquet': '.parquet', 'feather': '.feather'}
+
+
+def safe_name(sheet_name):
     # Zamień niedozwolone znaki w nazwach plików
-    safe_sheet_name = sheet_name.replace(" ", "_").replace("/", "_")
-    output_path = os.path.join(output_folder, f"{safe_sheet_name}.csv")
-    df.to_csv(output_path, index=False)
-    print(f"Zapisano: {output_path}")
+    return sheet_name.replace(" ", "_").replace("/", "_")
+
+
+def source_signature(source, check='mtime'):
+    """
+    Sygnatura pliku źródłowego do unieważniania pamięci podręcznej.
+
+    Parametry:
+    - source: str | Path — plik .ods
+    - check: str — 'mtime' (czas modyfikacji i rozmiar) lub 'hash' (SHA-256 zawartości)
+    """
+    source = Path(source)
+    st = source.stat()
+    signature = {'source': source.name, 'size': st.st_size}
+    if check == 'hash':
+        digest = hashlib.sha256()
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        signature['sha256'] = digest.hexdigest()
+    else:
+        signature['mtime_ns'] = st.st_mtime_ns
+    return signature
+
+
+def sheet_filter(include=None, exclude=None):
+    # Znormalizowany filtr arkuszy zapisywany w manifeście (kolejność wzorców bez znaczenia)
+    return {'include': sorted(set(include or [])), 'exclude': sorted(set(exclude or []))}
+
+
+def cache_is_fresh(source, folder, cache_format, check='mtime', include=None, exclude=None):
+    # Czy manifest w folderze odpowiada bieżącej wersji pliku źródłowego, formatowi
+    # i filtrowi arkuszy (inny filtr oznacza inny zestaw plików)
+    manifest_path = Path(folder) / manifest_name
+    if not manifest_path.exists():
+        return False
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != cache_format:
+        return False
+    if manifest.get('filter') != sheet_filter(include, exclude):
+        return False
+    if not all((Path(folder) / name).exists() for name in manifest.get('files', [])):
+        return False
+    return manifest.get('signature') == source_signature(source, check)
+
+
+def sheet_selected(sheet_name, include=None, exclude=None):
+    """
+    Filtr arkuszy po nazwie (wzorce fnmatch, np. 'T_*').
+
+    Parametry:
+    - include: list | None — eksportuj tylko arkusze pasujące do któregoś wzorca
+    - exclude: list | None — pomiń arkusze pasujące do któregoś wzorca
+    """
+    if include and not any(fnmatch.fnmatchcase(sheet_name, pattern) for pattern in include):
+        return False
+    if exclude and any(fnmatch.fnmatchcase(sheet_name, pattern) for pattern in exclude):
+        return False
+    return True
+
+
+def write_cache(csv_path, cache_format):
+    # Typowana kopia kolumnowa zapisanego pliku CSV arkusza
+    cache_path = Path(csv_path).with_suffix(cache_formats[cache_format])
+    typed = pd.read_csv(csv_path, header=1)
+    if cache_format == 'parquet':
+        typed.to_parquet(cache_path, index=False)
+    else:
+        typed.to_feather(cache_path)
+    return cache_path
+
+
+##################################################
+# Eksport strumieniowy: przyrostowe parsowanie content.xml
+
+ODS_NS = {'table': 'urn:oasis:names:tc:opendocument:xmlns:table:1.0',
+          'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0',
+          'text': 'urn:oasis:names:tc:opendocument:xmlns:text:1.0'}
+
+
+def _q(prefix, name):
+    # Pełna nazwa elementu/atrybutu z przestrzenią nazw
+    return f"{{{ODS_NS[prefix]}}}{name}"
+
+
+TABLE = _q('table', 'table')
+ROW = _q('table', 'table-row')
+CELLS = (_q('table', 'table-cell'), _q('table', 'covered-table-cell'))
+
+
+def _cell_text(elem):
+    # Tekst komórki z obsługą <text:s>, <text:tab> i <text:line-break>
+    parts = [elem.text or '']
+    for child in elem:
+        if child.tag == _q('text', 's'):
+            parts.append(' ' * int(child.get(_q('text', 'c'), 1)))
+        elif child.tag == _q('text', 'tab'):
+            parts.append('\t')
+        elif child.tag == _q('text', 'line-break'):
+            parts.append('\n')
+        else:
+            parts.append(_cell_text(child))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+
+# Teksty traktowane jako brak danych (domyślne na_values pd.read_excel)
+BRAKI = {'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+         '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'}
+
+# Tekst zamieniany przez pd.read_excel na liczbę
+LICZBA_RE = re.compile(r'^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$')
+
+
+def _cell_value(cell):
+    """
+    Wartość komórki z typem, jak zwraca ją czytnik ODF pandas: pierwszy znak to typ
+    ('i' liczba całkowita, 'f' rzeczywista, 'b' logiczna, 'd' data, 't' czas, 's' tekst),
+    reszta to wartość. Pusta komórka i '#N/A' to ''. Tekst CSV powstaje dopiero
+    w _formatuj, gdy znane są typy całych kolumn.
+    """
+    paragraphs = [_cell_text(p) for p in cell if p.tag == _q('text', 'p')]
+    text = '\n'.join(paragraphs)
+    if text == '#N/A':
+        return ''
+    value_type = cell.get(_q('office', 'value-type'))
+    if value_type == 'float':
+        value = float(cell.get(_q('office', 'value')))
+        return f'i{int(value)}' if value.is_integer() else f'f{value!r}'
+    if value_type in ('percentage', 'currency'):
+        return f"f{float(cell.get(_q('office', 'value')))!r}"
+    if value_type == 'boolean':
+        return 'b1' if cell.get(_q('office', 'boolean-value')) == 'true' else 'b0'
+    if value_type == 'date':
+        return 'd' + cell.get(_q('office', 'date-value'), '')
+    if value_type == 'time':
+        return 't' + text
+    return 's' + text if text else ''
+
+
+class _Kolumna:
+    """
+    Typ kolumny danych wyznaczany przyrostowo tak jak przy pd.read_excel: liczbowa, gdy
+    każda wartość jest liczbą, wartością logiczną lub tekstem liczby; rzeczywista, gdy
+    ma braki lub liczby niecałkowite; logiczna lub daty, gdy ma tylko takie wartości.
+    """
+    __slots__ = ('values', 'numeric', 'real', 'logical', 'dates', 'midnight')
+
+    def __init__(self):
+        self.values = 0
+        self.numeric = self.logical = self.dates = self.midnight = True
+        self.real = False
+
+    def dodaj(self, tagged):
+        kind, value = tagged[0], tagged[1:]
+        if kind == 's' and value in BRAKI:
+            return
+        self.values += 1
+        self.logical &= kind == 'b'
+        self.dates &= kind == 'd'
+        if kind == 'd':
+            self.midnight &= pd.Timestamp(value) == pd.Timestamp(value).normalize()
+        if kind == 'f' or (kind == 's' and LICZBA_RE.match(value) and not value.lstrip('+-').isdigit()):
+            self.real = True
+        if kind in ('d', 't') or (kind == 's' and not LICZBA_RE.match(value)):
+            self.numeric = False
+
+    def typ(self, rows):
+        # 'pusta', 'logiczna', 'calkowita', 'rzeczywista', 'daty' albo 'obiekt'
+        if not self.values:
+            return 'pusta'
+        complete = self.values == rows
+        if self.logical and complete:
+            return 'logiczna'
+        if self.numeric:
+            return 'calkowita' if complete and not self.real else 'rzeczywista'
+        return 'daty' if self.dates else 'obiekt'
+
+
+def _formatuj(tagged, typ='obiekt', midnight=False):
+    # Tekst CSV wartości komórki w kolumnie danego typu, jak df.to_csv po pd.read_excel
+    if not tagged:
+        return ''
+    kind, value = tagged[0], tagged[1:]
+    if kind == 's' and value in BRAKI and typ != 'naglowek':
+        return ''
+    if typ == 'logiczna':
+        return 'True' if value == '1' else 'False'
+    if typ == 'calkowita':
+        return value if kind == 'i' else str(int(value))
+    if typ == 'rzeczywista':
+        return repr(float(value))
+    if typ == 'daty':
+        return str(pd.Timestamp(value).date()) if midnight else str(pd.Timestamp(value))
+    if kind == 'b':
+        return 'True' if value == '1' else 'False'
+    if kind == 'd':
+        return str(pd.Timestamp(value))
+    if kind == 't':
+        return str(pd.Timestamp(value).time())
+    return value
+
+
+def _naglowek(row, width):
+    # Nazwy kolumn jak w pd.read_excel: 'Unnamed: i' dla pustych, '.1', '.2' dla powtórzeń
+    names = []
+    for i in range(width):
+        name = _formatuj(row[i], 'naglowek') if i < len(row) else ''
+        name = name or f'Unnamed: {i}'
+        base, count = name, 0
+        while name in names:
+            count += 1
+            name = f'{base}.{count}'
+        names.append(name)
+    return names
+
+
+def _row_values(row):
+    # Wartości wiersza z rozwinięciem number-columns-repeated, bez pustych komórek na końcu
+    values = []
+    pending_empty = 0
+    for cell in row:
+        if cell.tag not in CELLS:
+            continue
+        repeat = int(cell.get(_q('table', 'number-columns-repeated'), 1))
+        value = _cell_value(cell)
+        if value == '':
+            pending_empty += repeat
+            continue
+        values.extend([''] * pending_empty)
+        pending_empty = 0
+        values.extend([value] * repeat)
+    return values
+
+
+class MemoryBudget:
+    """
+    Limit bajtów w wierszach oczekujących na zapis. Parser czeka, gdy limit jest
+    wyczerpany; jeden fragment jest zawsze dopuszczany, by uniknąć zakleszczenia.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.error = None
+        self.condition = threading.Condition()
+
+    def acquire(self, nbytes):
+        with self.condition:
+            while self.error is None and self.in_flight and self.in_flight + nbytes > self.limit:
+                self.condition.wait()
+            if self.error is not None:
+                raise RuntimeError("Przerwano eksport: błąd wątku zapisującego") from self.error
+            self.in_flight += nbytes
+
+    def abort(self, error):
+        # Wątek zapisujący zakończył się błędem: parser oczekujący na limit nie może czekać dalej
+        with self.condition:
+            self.error = error
+            self.condition.notify_all()
+
+    def release(self, nbytes):
+        with self.condition:
+            self.in_flight -= nbytes
+            self.condition.notify_all()
+
+
+def _write_sheet(csv_path, chunks, budget, cache_format=None):
+    """
+    Wątek zapisujący: pobiera fragmenty wierszy z kolejki aż do None.
+
+    Wiersze z typami komórek trafiają najpierw do pliku tymczasowego, a po ostatnim
+    fragmencie są formatowane według typów kolumn (_Kolumna) i dopełniane do
+    najszerszego wiersza — wynik jest taki sam jak przy eksporcie przez pd.read_excel.
+    """
+    tmp_path = csv_path.with_name(csv_path.name + '.tmp')
+    try:
+        return _write_sheet_files(csv_path, tmp_path, chunks, budget, cache_format)
+    except BaseException as e:
+        budget.abort(e)
+        raise
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _write_sheet_files(csv_path, tmp_path, chunks, budget, cache_format):
+    error = None
+    width = rows = 0
+    columns = []
+    f = None
+    try:
+        f = open(tmp_path, 'w', newline='', encoding='utf-8')
+        writer = csv.writer(f, lineterminator='\n')
+    except Exception as e:
+        error = e
+    while (item := chunks.get()) is not None:
+        chunk, nbytes = item
+        try:
+            if error is None:
+                for row in chunk:
+                    writer.writerow(row)
+                    width = max(width, len(row))
+                    # Pierwszy wiersz arkusza to nagłówek, pozostałe wyznaczają typy kolumn
+                    rows += 1
+                    if rows > 1:
+                        columns.extend(_Kolumna() for _ in range(len(row) - len(columns)))
+                        for column, tagged in zip(columns, row):
+                            if tagged:
+                                column.dodaj(tagged)
+        except Exception as e:
+            error = e
+        finally:
+            budget.release(nbytes)
+    if f is not None:
+        f.close()
+    if error is not None:
+        raise error
+    if budget.error is not None:
+        raise RuntimeError(f"Przerwano eksport arkusza {csv_path.name}") from budget.error
+
+    # Drugi przebieg: formatowanie według typów kolumn
+    columns.extend(_Kolumna() for _ in range(width - len(columns)))
+    types = [column.typ(rows - 1) for column in columns]
+    with open(tmp_path, newline='', encoding='utf-8') as source, \
+            open(csv_path, 'w', newline='', encoding='utf-8') as target:
+        writer = csv.writer(target, lineterminator='\n')
+        if rows == 0:
+            # Pusty arkusz: df.to_csv pustej ramki zapisuje jeden pusty wiersz
+            target.write('\n')
+        for i, row in enumerate(csv.reader(source)):
+            if i == 0:
+                writer.writerow(_naglowek(row, width))
+                continue
+            row = row + [''] * (width - len(row))
+            writer.writerow([_formatuj(tagged, typ, column.midnight)
+                             for tagged, typ, column in zip(row, types, columns)])
+    print(f"Zapisano: {csv_path}")
+    if cache_format is not None:
+        cache_path = write_cache(csv_path, cache_format)
+        print(f"Zapisano: {cache_path}")
+        return [cache_path.name]
+    return []
+
+
+def eksport_strumieniowy(source, folder, cache_format=None, include=None, exclude=None,
+                         chunk_rows=5000, max_memory_mb=256, workers=4):
+    """
+    Eksport arkuszy .ods do CSV bez wczytywania całego skoroszytu do pamięci.
+
+    content.xml jest parsowany przyrostowo (iterparse), wiersze każdego arkusza trafiają
+    fragmentami po chunk_rows do wątków zapisujących, a arkusze zapisywane są równolegle.
+    Łączny rozmiar wierszy czekających na zapis ogranicza max_memory_mb. Puste wiersze
+    i kolumny na końcu arkusza są pomijane, podobnie jak w pd.read_excel.
+
+    Parametry:
+    - source: str | Path — plik .ods
+    - folder: Path — folder docelowy
+    - cache_format: str | None — dodatkowy zapis kolumnowy ('parquet' / 'feather');
+      wymaga wczytania jednego arkusza naraz
+    - include, exclude: list | None — filtr arkuszy (patrz sheet_selected)
+    - chunk_rows: int — liczba wierszy w jednym fragmencie
+    - max_memory_mb: float — limit pamięci dla fragmentów oczekujących na zapis
+    - workers: int — liczba wątków zapisujących
+    """
+    budget = MemoryBudget(int(max_memory_mb * 2**20))
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor, \
+            zipfile.ZipFile(source) as archive, archive.open('content.xml') as content:
+        stack = []
+        chunks = None
+        buffer, buffer_bytes = [], 0
+        pending_empty_rows = 0
+
+        def flush():
+            nonlocal buffer, buffer_bytes
+            if buffer:
+                budget.acquire(buffer_bytes)
+                chunks.put((buffer, buffer_bytes))
+                buffer, buffer_bytes = [], 0
+
+        try:
+            for event, elem in ET.iterparse(content, events=('start', 'end')):
+                if event == 'start':
+                    stack.append(elem)
+                    if elem.tag == TABLE:
+                        sheet_name = elem.get(_q('table', 'name'), '')
+                        if sheet_selected(sheet_name, include, exclude):
+                            chunks = queue.Queue()
+                            pending_empty_rows = 0
+                            csv_path = Path(folder) / f"{safe_name(sheet_name)}.csv"
+                            futures.append(executor.submit(_write_sheet, csv_path, chunks, budget, cache_format))
+                    continue
+
+                stack.pop()
+                if elem.tag == ROW:
+                    if chunks is not None:
+                        values = _row_values(elem)
+                        repeat = int(elem.get(_q('table', 'number-rows-repeated'), 1))
+                        if not values:
+                            pending_empty_rows += repeat
+                        else:
+                            # Puste wiersze wewnątrz arkusza są zachowywane, końcowe pomijane
+                            rows = [[] for _ in range(pending_empty_rows)] + [values] * repeat
+                            pending_empty_rows = 0
+                            for row in rows:
+                                buffer.append(row)
+                                buffer_bytes += sum(map(len, row)) + 8 * len(row) + 64
+                                if len(buffer) >= chunk_rows:
+                                    flush()
+                    # Usunięcie przetworzonego wiersza z drzewa utrzymuje stałe zużycie pamięci
+                    if stack:
+                        stack[-1].remove(elem)
+                elif elem.tag == TABLE:
+                    if chunks is not None:
+                        flush()
+                        chunks.put(None)
+                        chunks = None
+                    if stack:
+                        stack[-1].remove(elem)
+        except BaseException as e:
+            # Błąd parsowania (np. uszkodzony content.xml) lub wątku zapisującego: otwarty
+            # arkusz dostaje koniec danych, wątki zapisujące kończą się bez zapisu CSV,
+            # a niezaczęte zapisy są anulowane
+            budget.abort(e)
+            if chunks is not None:
+                chunks.put(None)
+            for future in futures:
+                future.cancel()
+            raise
+
+    written = []
+    for future in futures:
+        written.extend(future.result())
+    return written
+
+
+def to_typed_frame(df):
+    # Ramka o typach identycznych z pd.read_csv(..., header=1) na wyeksportowanym CSV
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return pd.read_csv(buffer, header=1)
+
+
+def eksport(source=file_path, folder=output_folder, cache_format=None, check='mtime', force=False,
+            stream=False, include=None, exclude=None, max_memory_mb=256, workers=4):
+    """
+    Eksport arkuszy pliku .ods do CSV i opcjonalnie do kolumnowej pamięci podręcznej.
+
+    Parametry:
+    - source: str | Path — plik .ods
+    - folder: str | Path — folder docelowy
+    - cache_format: str | None — 'parquet', 'feather' lub None (tylko CSV)
+    - check: str — sposób unieważniania pamięci podręcznej: 'mtime' lub 'hash'
+    - force: bool — eksport nawet przy aktualnej pamięci podręcznej
+    - stream: bool — eksport strumieniowy (patrz eksport_strumieniowy)
+    - include, exclude: list | None — filtr arkuszy po nazwie (wzorce fnmatch)
+    - max_memory_mb: float — w trybie stream: limit pamięci wierszy oczekujących na zapis
+    - workers: int — w trybie stream: liczba wątków zapisujących
+    """
+    folder = Path(folder)
+    os.makedirs(folder, exist_ok=True)  # utwórz folder, jeśli nie istnieje
+
+    if cache_format is not None:
+        if cache_format not in cache_formats:
+            raise ValueError(f"Nieznany format pamięci podręcznej: {cache_format}")
+        if not force and cache_is_fresh(source, folder, cache_format, check, include, exclude):
+            print(f"Pamięć podręczna aktualna, pominięto eksport: {folder}")
+            return
+
+    if stream:
+        written = eksport_strumieniowy(source, folder, cache_format, include, exclude,
+                                       max_memory_mb=max_memory_mb, workers=workers)
+    else:
+        written = eksport_calosciowy(source, folder, cache_format, include, exclude)
+
+    if cache_format is not None:
+        manifest = {'format': cache_format,
+                    'signature': source_signature(source, check),
+                    'filter': sheet_filter(include, exclude),
+                    'files': written}
+        with open(folder / manifest_name, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def wczytaj_arkusze(source=file_path, include=None, exclude=None):
+    """
+    Wczytuje arkusze .ods do pamięci jako typowane ramki, bez zapisu plików.
+
+    Zwraca dict {nazwa pliku arkusza (bez rozszerzenia): pd.DataFrame} o typach
+    identycznych z odczytem wyeksportowanych CSV (patrz to_typed_frame).
+    """
+    xls = read_selected_sheets(source, include, exclude)
+    return {safe_name(sheet_name): to_typed_frame(df) for sheet_name, df in xls.items()}
+
+
+def read_selected_sheets(source, include=None, exclude=None):
+    # pd.read_excel tylko dla arkuszy przechodzących filtr: pozostałe nie są zamieniane na ramki
+    with pd.ExcelFile(source, engine='odf') as book:
+        names = [name for name in book.sheet_names if sheet_selected(name, include, exclude)]
+        if not names:
+            return {}
+        return pd.read_excel(book, sheet_name=names)
+
+
+def eksport_calosciowy(source, folder, cache_format=None, include=None, exclude=None):
+    # Eksport przez pd.read_excel: wybrane arkusze naraz w pamięci
+    xls = read_selected_sheets(source, include, exclude)
+
+    # Zapisz każdy arkusz jako osobny plik CSV
+    written = []
+    for sheet_name, df in xls.items():
+        output_path = folder / f"{safe_name(sheet_name)}.csv"
+        df.to_csv(output_path, index=False)
+        print(f"Zapisano: {output_path}")
+
+        # Zapis typowanej ramki w formacie kolumnowym
+        if cache_format is not None:
+            cache_path = output_path.with_suffix(cache_formats[cache_format])
+            typed = to_typed_frame(df)
+            if cache_format == 'parquet':
+                typed.to_parquet(cache_path, index=False)
+            else:
+                typed.to_feather(cache_path)
+            written.append(cache_path.name)
+            print(f"Zapisano: {cache_path}")
+    return written
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Eksport arkuszy .ods do CSV.")
+    parser.add_argument("--source", default=file_path, help="plik .ods")
+    parser.add_argument("--output", default=output_folder, help="folder docelowy")
+    parser.add_argument("--cache", choices=sorted(cache_formats), default=None,
+                        help="dodatkowy zapis do kolumnowej pamięci podręcznej")
+    parser.add_argument("--check", choices=['mtime', 'hash'], default='mtime',
+                        help="sposób wykrywania zmian pliku źródłowego")
+    parser.add_argument("--force", action="store_true", help="wymuś ponowny eksport")
+    parser.add_argument("--stream", action="store_true",
+                        help="eksport strumieniowy z ograniczonym zużyciem pamięci")
+    parser.add_argument("--include", nargs="+", default=None, metavar="WZORZEC",
+                        help="eksportuj tylko arkusze pasujące do wzorców (np. 'T_*')")
+    parser.add_argument("--exclude", nargs="+", default=None, metavar="WZORZEC",
+                        help="pomiń arkusze pasujące do wzorców")
+    parser.add_argument("--max-memory-mb", type=float, default=256,
+                        help="limit pamięci wierszy oczekujących na zapis (tryb --stream)")
+    parser.add_argument("-j", "--workers", type=int, default=4,
+                        help="liczba wątków zapisujących (tryb --stream)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    eksport(args.source, args.output, args.cache, args.check, args.force,
+            args.stream, args.include, args.exclude, args.max_memory_mb, args.workers)
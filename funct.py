@@ -1,16 +1,119 @@
+import importlib.util
+import sys
+from functools import lru_cache
+from pathlib import Path
 import numpy as np
 import pandas as pd
-import seaborn as sns
-from scipy import stats
-import matplotlib.pyplot as plt
-from scipy.stats import shapiro, levene, kruskal, chisquare
-from statsmodels.formula.api import ols
-from statsmodels.stats.anova import anova_lm
-from statsmodels.stats.multicomp import pairwise_tukeyhsd
-import scikit_posthocs as sp
+import pomiary
+import schemat
+import wyniki
 
 
-def qqplot(data, ax, color='blue'):
+def leniwy_import(name):
+    """
+    Moduł ładowany dopiero przy pierwszym odwołaniu do jego atrybutu (importlib.util.LazyLoader).
+
+    Ciężkie biblioteki (scipy.stats, seaborn) i moduły testów nie spowalniają importu
+    funct, gdy skrypt używa tylko części funkcji (np. statystyk opisowych).
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+stats = leniwy_import('scipy.stats')
+sns = leniwy_import('seaborn')
+agregaty = leniwy_import('agregaty')
+bootstrap = leniwy_import('bootstrap')
+normalnosc = leniwy_import('normalnosc')
+permutacje = leniwy_import('permutacje')
+posthoc = leniwy_import('posthoc')
+
+
+@lru_cache(maxsize=64)
+def _kwantyle_teoretyczne(n):
+    # Kwantyle rozkładu normalnego dla próby o liczności n (liczone raz na n)
+    theoretical = stats.norm.ppf((np.arange(1, n + 1) - 0.5) / n)
+    theoretical.flags.writeable = False
+    return theoretical
+
+
+@lru_cache(maxsize=64)
+def _pasmo_ufnosci(n, ci, band, max_points=None):
+    """
+    Analityczne pasmo ufności wykresu kwantyl-kwantyl w jednostkach standaryzowanych,
+    liczone tylko w punktach _indeksy_rozrzedzone(n, max_points).
+
+    - 'pointwise': i-ta statystyka pozycyjna U(i) ~ Beta(i, n - i + 1), kwantyle
+      (1 - ci)/2 i (1 + ci)/2 przeniesione przez odwrotną dystrybuantę normalną
+    - 'simultaneous': pasmo Dworetzky'ego-Kiefera-Wolfowitza p ± sqrt(ln(2/α) / 2n),
+      obejmujące wszystkie punkty jednocześnie z prawdopodobieństwem >= ci
+    """
+    alpha = 1 - ci
+    i = _indeksy_rozrzedzone(n, max_points) + 1
+    if band == 'pointwise':
+        lower = stats.beta.ppf(alpha / 2, i, n - i + 1)
+        upper = stats.beta.ppf(1 - alpha / 2, i, n - i + 1)
+    elif band == 'simultaneous':
+        eps = np.sqrt(np.log(2 / alpha) / (2 * n))
+        p = (i - 0.5) / n
+        lower = np.clip(p - eps, 0, 1)
+        upper = np.clip(p + eps, 0, 1)
+    else:
+        raise ValueError(f"Nieznany typ pasma: {band}")
+    z_lower, z_upper = stats.norm.ppf(lower), stats.norm.ppf(upper)
+    z_lower.flags.writeable = False
+    z_upper.flags.writeable = False
+    return z_lower, z_upper
+
+
+def _indeksy_rozrzedzone(n, max_points):
+    # Indeksy punktów równomiernie rozłożonych po kwantylach (zawsze z min. i maks.)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+    return np.unique(np.round(np.linspace(0, n - 1, max_points)).astype(np.int64))
+
+
+def qqplot_punkty(data, ci=0.95, band='pointwise', max_points=2000, is_sorted=False):
+    """
+    Punkty szybkiego wykresu kwantyl-kwantyl: rozrzedzone punkty, analityczne pasmo
+    ufności i końce prostej regresji (rozmiar wyniku nie zależy od liczby danych).
+
+    Zwraca dict z tablicami x, y (punkty), dolna, gorna (pasmo w punktach x)
+    oraz linia_x, linia_y (końce prostej).
+    """
+    sample = np.asarray(data, dtype=np.float64)
+    if not is_sorted:
+        sample = np.sort(sample)
+    n = len(sample)
+    theoretical = _kwantyle_teoretyczne(n)
+
+    # Prosta regresji sample = a + b * theoretical w postaci zamkniętej
+    slope, intercept = np.polyfit(theoretical, sample, 1)
+    z_lower, z_upper = _pasmo_ufnosci(n, ci, band, max_points)
+
+    idx = _indeksy_rozrzedzone(n, max_points)
+    return {'x': theoretical[idx], 'y': sample[idx],
+            'dolna': intercept + slope * z_lower, 'gorna': intercept + slope * z_upper,
+            'linia_x': theoretical[[0, -1]], 'linia_y': intercept + slope * theoretical[[0, -1]]}
+
+
+def qqplot_z_punktow(points, ax, color='blue'):
+    # Rysuje szybki wykres kwantyl-kwantyl z wyniku qqplot_punkty (tablice lub listy)
+    ax.fill_between(points['x'], points['dolna'], points['gorna'], color=color, alpha=0.2, linewidth=0)
+    ax.scatter(points['x'], points['y'], color=color, s=40)
+    ax.plot(points['linia_x'], points['linia_y'], color=color)
+    ax.set_xlabel('')
+    ax.set_ylabel('')
+
+
+def qqplot(data, ax, color='blue', fast=False, ci=0.95, band='pointwise', max_points=2000):
     """
     Tworzy wykres kwantyl-kwantyl z linią regresji i obszarem ufności.
 
@@ -18,14 +121,20 @@ def qqplot(data, ax, color='blue'):
     - data: 1D array-like — dane wejściowe
     - ax: matplotlib.axes.Axes — oś, na której ma być narysowany wykres
     - color: str — kolor punktów i linii
-    - x_label: str — etykieta osi X
+    - fast: bool — False: pasmo bootstrapowe seaborn (regplot);
+      True: analityczne pasmo ze statystyk pozycyjnych i rozrzedzone punkty
+    - ci: float — poziom ufności pasma
+    - band: str — w trybie fast: 'pointwise' lub 'simultaneous'
+    - max_points: int | None — w trybie fast: maks. liczba rysowanych punktów
     """
-    # Posortowane dane i kwantyle teoretyczne
-    sample = np.sort(np.asarray(data))
-    n = len(sample)
-    theoretical = stats.norm.ppf((np.arange(1, n + 1) - 0.5) / n)
+    # Posortowane dane
+    sample = np.sort(np.asarray(data, dtype=np.float64))
 
-    df = pd.DataFrame({'Theoretical': theoretical, 'Sample': sample})
+    if fast:
+        qqplot_z_punktow(qqplot_punkty(sample, ci, band, max_points, is_sorted=True), ax, color)
+        return
+
+    df = pd.DataFrame({'Theoretical': _kwantyle_teoretyczne(len(sample)), 'Sample': sample})
 
     # Rysuj wykres z obszarem ufności
     sns.regplot(
@@ -33,7 +142,7 @@ def qqplot(data, ax, color='blue'):
         y='Sample',
         data=df,
         ax=ax,
-        ci=95,
+        ci=int(round(ci * 100)),
         scatter_kws={'color': color, 's': 40},
         line_kws={'color': color}
     )
@@ -46,155 +155,553 @@ def export_data(df: pd.DataFrame, path):
     df.to_csv(path)
     pass
 
+
+def wczytaj_arkusz(csv_path, compact=False):
+    """
+    Wczytuje arkusz wyeksportowany przez eksport_data.py.
+
+    Jeśli obok pliku CSV istnieje nie starsza od niego kopia .parquet lub .feather
+    (eksport_data.py --cache ...), dane są czytane z niej zamiast parsowania CSV.
+
+    Parametry:
+    - csv_path: str | Path — ścieżka do pliku CSV arkusza
+    - compact: bool — zwarte typy kolumn według schemat.SCHEMAT (kategorie, mniejsze liczby)
+    """
+    csv_path = Path(csv_path)
+    csv_mtime = csv_path.stat().st_mtime_ns if csv_path.exists() else -1
+    df = None
+    for suffix, reader in (('.parquet', pd.read_parquet), ('.feather', pd.read_feather)):
+        cache_path = csv_path.with_suffix(suffix)
+        if cache_path.exists() and cache_path.stat().st_mtime_ns >= csv_mtime:
+            df = reader(cache_path)
+            break
+    if df is None:
+        df = pd.read_csv(csv_path, header=1)
+    return schemat.kompaktuj(df) if compact else df
+
 ##################################################
 
-def test_normalnosci(data, results):
-    # Lista dostępnych transformacji z nazwami i funkcjami
-    transformers = [
-        ("pierwiastek kwadratowy", lambda x: np.sqrt(x)),
-        ("pierwiastek czwartego stopnia", lambda x: np.power(x, 0.25)),
-        ("log naturalny", lambda x: np.log(x)),
-        ("log dziesiętny", lambda x: np.log10(x))
-    ]
-    
+# Drabina transformacji: (nazwa, funkcja wektorowa na np.ndarray, czy wymaga wartości > 0)
+TRANSFORMACJE = [
+    ("pierwiastek kwadratowy", np.sqrt, True),
+    ("pierwiastek czwartego stopnia", lambda x: np.sqrt(np.sqrt(x)), True),
+    ("log naturalny", np.log, True),
+    ("log dziesiętny", np.log10, True),
+]
+
+
+def transformacja_boxcox(lmbda=None):
+    """
+    Transformacja Boxa-Coxa do użycia w test_normalnosci.
+
+    Parametry:
+    - lmbda: float | None — stała lambda; None = dopasowanie metodą największej wiarygodności
+    """
+    def func(x):
+        if lmbda is None:
+            return stats.boxcox(x)
+        return stats.boxcox(x, lmbda=lmbda), lmbda
+    return ("Box-Cox", func, True)
+
+
+def transformacja_yeojohnson(lmbda=None):
+    """
+    Transformacja Yeo-Johnsona (dopuszcza wartości <= 0) do użycia w test_normalnosci.
+
+    Parametry:
+    - lmbda: float | None — stała lambda; None = dopasowanie metodą największej wiarygodności
+    """
+    def func(x):
+        if lmbda is None:
+            return stats.yeojohnson(x)
+        return stats.yeojohnson(x, lmbda=lmbda), lmbda
+    return ("Yeo-Johnson", func, False)
+
+
+def transformuj_kandydatow(values, transformacje=None):
+    """
+    Nakłada wszystkie transformacje naraz i zwraca je jako jedną macierz 2-D.
+
+    Warunek dodatniości sprawdzany jest jeden raz dla całej serii. Funkcja transformacji
+    może zwrócić tablicę albo krotkę (tablica, lambda) — wtedy dopasowana lambda
+    trafia do nazwy kandydata.
+
+    Parametry:
+    - values: np.ndarray — dane liczbowe bez NaN
+    - transformacje: list | None — lista krotek (nazwa, funkcja, wymaga_dodatnich);
+      domyślnie TRANSFORMACJE
+
+    Zwraca:
+    - kandydaci: list — krotki (nazwa, decyzja, błąd) w kolejności drabiny; decyzja
+      'pominięto' oznacza niespełniony warunek dodatniości, błąd to opis wyjątku albo None
+    - macierz: np.ndarray — kształt (liczba udanych transformacji, len(values))
+    """
+    if transformacje is None:
+        transformacje = TRANSFORMACJE
+    all_positive = bool(np.all(values > 0))
+
+    kandydaci = []
+    rows = []
+    with np.errstate(all='ignore'):
+        for name, func, requires_positive in transformacje:
+            if requires_positive and not all_positive:
+                kandydaci.append((name, 'pominięto', None))
+                continue
+            try:
+                out = func(values)
+                if isinstance(out, tuple):
+                    out, lmbda = out
+                    name = f"{name} (λ={lmbda:.4f})"
+                rows.append(np.asarray(out, dtype=np.float64))
+                kandydaci.append((name, None, None))
+            except Exception as e:
+                kandydaci.append((name, None, str(e)))
+
+    matrix = np.vstack(rows) if rows else np.empty((0, len(values)))
+    return kandydaci, matrix
+
+
+def opisz_normalnosc(record):
+    # Linie raportu dla rekordu testu normalności (surowe dane lub transformacja)
+    label, _, min_n = normalnosc.BACKENDY.get(record['test'], normalnosc.BACKENDY['shapiro'])
+    name = record['transformacja']
+    if record.get('blad') is not None:
+        if name is None:
+            return [f"  Błąd w teście {label}: {record['blad']}"]
+        if name == '*':
+            return [f"  Błąd w teście {label} dla transformacji: {record['blad']}"]
+        return [f"  Błąd przy transformacji {name}: {record['blad']}"]
+    if record['decyzja'] == 'za mało danych':
+        return [f"  Za mało danych do testu {label} (min. {min_n} wartości)."]
+    if record['decyzja'] == 'pominięto':
+        return [f"  Pominięto transformację ({name}): zawiera wartości <= 0."]
+    is_normal = record['decyzja'] == 'normalny'
+    if name is None:
+        return [f"  Test {label}: statystyka={record['statystyka']:.4f}, p={record['p']:.4f}",
+                f"  TTFF normalny? {'TAK' if is_normal else 'NIE'}"]
+    return [f"  Próba transformacji: {name}",
+            f"    statystyka={record['statystyka']:.4f}, p={record['p']:.4f}",
+            f"    Czy normalne? {'TAK' if is_normal else 'NIE'}"]
+
+
+def test_normalnosci(data, results, transformacje=None, records=None, backend='auto', seed=None):
+    """
+    Test normalności z drabiną transformacji dla danych nienormalnych.
+
+    Wszystkie transformacje są liczone wektorowo do jednej macierzy, a test
+    normalności wykonywany jest jednym wywołaniem dla wszystkich kandydatów.
+    Raport wypisuje kandydatów do pierwszej udanej transformacji.
+
+    Decyzja (zwracana jako normal i przekazywana do anova) zależy tylko od surowych
+    danych i ma tę samą regułę dla każdego testu: p > 0.05.
+
+    Parametry:
+    - data: array-like — dane wejściowe
+    - results: list — lista, do której dopisywane są wyniki
+    - transformacje: list | None — własna drabina transformacji (np. z transformacja_boxcox());
+      domyślnie TRANSFORMACJE
+    - records: list | None — lista, do której dopisywane są rekordy wyników (patrz wyniki.rekord)
+    - backend: str — test normalności (normalnosc.BACKENDY); 'auto' = Shapiro-Wilk do 5000
+      wartości, powyżej D'Agostino-Pearson
+    - seed: int | None — ziarno podpróby warstwowej (normalnosc.testuj)
+    """
+    def report(record):
+        results.extend(opisz_normalnosc(wyniki.dodaj(records, record)))
+
     data = pd.to_numeric(data, errors='coerce').dropna()
-    
-    if len(data) < 3:
-        results.append("  Za mało danych do testu Shapiro-Wilka (min. 3 wartości).")
+    n = len(data)
+    test = normalnosc.wybierz_backend(n, backend)
+
+    if n < normalnosc.BACKENDY[test][2]:
+        report(wyniki.rekord(test, n=n, decyzja='za mało danych'))
         return results, None
 
+    values = data.to_numpy(dtype=np.float64)
     try:
-        stat, p = shapiro(data)
+        stat, p = normalnosc.testuj([values], test, seed).loc[0, ['statystyka', 'p']]
         normal = p > 0.05
-        results.append(f"  Test Shapiro-Wilka: statystyka={stat:.4f}, p={p:.4f}")
-        results.append(f"  TTFF normalny? {'TAK' if normal else 'NIE'}")
+        report(wyniki.rekord(test, stat, p, n=n, decyzja='normalny' if normal else 'nienormalny'))
     except Exception as e:
-        results.append(f"  Błąd w teście Shapiro-Wilka: {e}")
+        report(wyniki.rekord(test, n=n, blad=str(e)))
         return results, None
 
     # Jeśli dane nie są normalne, próbujemy transformacji
     if not normal:
-        for name, func in transformers:
+        kandydaci, matrix = transformuj_kandydatow(values, transformacje)
+        if len(matrix):
             try:
-                # Sprawdź czy wszystkie wartości są dodatnie
-                if any(data <= 0) and ('log' in name or 'pierwiastek' in name):
-                    results.append(f"  Pominięto transformację ({name}): zawiera wartości <= 0.")
-                    continue
-
-                transformed = data.apply(func)
-                stat2, p2 = shapiro(transformed.dropna())
-                is_normal = p2 > 0.05
-                results.append(f"  Próba transformacji: {name}")
-                results.append(f"    statystyka={stat2:.4f}, p={p2:.4f}")
-                results.append(f"    Czy normalne? {'TAK' if is_normal else 'NIE'}")
-                
-                if is_normal:
-                    break  # nie kontynuuj dalszych transformacji jeśli się udało
+                tested = normalnosc.testuj(list(matrix), test, seed)
+                stats2, ps2 = tested['statystyka'].to_numpy(), tested['p'].to_numpy()
             except Exception as e:
-                results.append(f"  Błąd przy transformacji {name}: {e}")
+                report(wyniki.rekord(test, n=n, transformacja='*', blad=str(e)))
+                kandydaci = []
+
+        row = 0
+        for name, decision, error in kandydaci:
+            if decision is not None or error is not None:
+                report(wyniki.rekord(test, n=n, transformacja=name, decyzja=decision, blad=error))
+                continue
+            stat2, p2 = stats2[row], ps2[row]
+            row += 1
+            is_normal = p2 > 0.05
+            report(wyniki.rekord(test, stat2, p2, n=n, transformacja=name,
+                                 decyzja='normalny' if is_normal else 'nienormalny'))
+
+            if is_normal:
+                break  # nie raportuj dalszych transformacji jeśli się udało
 
     results.append("-" * 40)
     return results, normal
 
 
-def statystyki_opisowe(series, results):
-    # Konwersja do typu liczbowego
-    series = pd.to_numeric(series, errors='coerce').dropna()
-
-    # Obliczenia statystyczne
-    mean_val = series.mean()
-    std_val = series.std()
-    median_val = series.median()
-    min_val = series.min()
-    max_val = series.max()
-    q1 = series.quantile(0.25)
-    q3 = series.quantile(0.75)
-
-    results.append(f"  Średnia: {mean_val:.4f}")
-    results.append(f"  Odchylenie standardowe: {std_val:.4f}")
-    results.append(f"  Mediana: {median_val:.4f}")
-    results.append(f"  Min: {min_val:.4f}")
-    results.append(f"  Max: {max_val:.4f}")
-    results.append(f"  Kwartyl 1 (25%): {q1:.4f}")
-    results.append(f"  Kwartyl 3 (75%): {q3:.4f}")
+# Kolumny tabeli statystyk opisowych i odpowiadające im linie raportu
+OPISOWE_ETYKIETY = [
+    ('mean', 'Średnia'),
+    ('std', 'Odchylenie standardowe'),
+    ('median', 'Mediana'),
+    ('min', 'Min'),
+    ('max', 'Max'),
+    ('q1', 'Kwartyl 1 (25%)'),
+    ('q3', 'Kwartyl 3 (75%)'),
+]
+
+
+def _kwantyl_posortowany(sorted_values, starts, counts, q):
+    # Kwantyl z interpolacją liniową (jak w pandas) dla posortowanych bloków grup
+    pos = (counts - 1) * q
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.ceil(pos).astype(np.int64)
+    low_val = sorted_values[starts + lo]
+    high_val = sorted_values[starts + hi]
+    return low_val + (high_val - low_val) * (pos - lo)
+
+
+def statystyki_opisowe_grup(df: pd.DataFrame, value_col='value', group_col='group'):
+    """
+    Statystyki opisowe dla wielu grup naraz (format długi: wartość, grupa).
+
+    Dane są sortowane jeden raz (po grupie, potem po wartości); ten sam porządek
+    służy do mediany, kwartyli, minimum i maksimum, a sumy liczone są blokowo.
+
+    Parametry:
+    - df: pd.DataFrame — ramka w formacie długim
+    - value_col: str — kolumna z wartościami liczbowymi
+    - group_col: str — kolumna z etykietą grupy
+
+    Zwraca:
+    - pd.DataFrame indeksowany grupą, z kolumnami n, mean, std, median, min, max, q1, q3
+    """
+    columns = ['n'] + [name for name, _ in OPISOWE_ETYKIETY]
+    values = pd.to_numeric(df[value_col], errors='coerce')
+    groups = df[group_col]
+    mask = (values.notna() & groups.notna()).to_numpy()
+    if not mask.any():
+        return pd.DataFrame(columns=columns, index=pd.Index([], name=group_col), dtype=float)
+
+    codes, labels = pd.factorize(groups[mask], sort=True)
+    v = values[mask].to_numpy(dtype=np.float64)
+
+    # Jedno sortowanie: najpierw po grupie, w obrębie grupy po wartości
+    order = np.lexsort((v, codes))
+    v_sorted = v[order]
+    c_sorted = codes[order]
+
+    counts = np.bincount(c_sorted, minlength=len(labels))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    mean = np.add.reduceat(v_sorted, starts) / counts
+    sq_dev = np.add.reduceat((v_sorted - mean[c_sorted]) ** 2, starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(sq_dev / (counts - 1))
+    std[counts < 2] = np.nan
+
+    table = pd.DataFrame({
+        'n': counts,
+        'mean': mean,
+        'std': std,
+        'median': _kwantyl_posortowany(v_sorted, starts, counts, 0.5),
+        'min': v_sorted[starts],
+        'max': v_sorted[starts + counts - 1],
+        'q1': _kwantyl_posortowany(v_sorted, starts, counts, 0.25),
+        'q3': _kwantyl_posortowany(v_sorted, starts, counts, 0.75),
+    }, index=pd.Index(labels, name=group_col))
+    return table
+
+
+def opisz_statystyki(row, results):
+    """
+    Dopisuje linie raportu statystyk opisowych na podstawie wiersza tabeli
+    zwróconej przez statystyki_opisowe_grup (lub pola 'opisowe' rekordu wyników).
+    """
+    for name, label in OPISOWE_ETYKIETY:
+        value = np.nan if row[name] is None else row[name]
+        results.append(f"  {label}: {value:.4f}")
+    return results
+
+
+def statystyki_opisowe(series, results, records=None, bootstrap_options=None, table=None):
+    # Pojedyncza seria jako jedna grupa silnika statystyk grupowych; przy bootstrap_options
+    # (argumenty bootstrap.bootstrap_opisowe) także przedziały ufności średniej, mediany i kwartyli.
+    # table: gotowa tabela statystyk serii (np. strumien.opisowe_strumieniowo) zamiast liczenia
+    if table is None:
+        table = statystyki_opisowe_grup(pd.DataFrame({'value': series, 'group': 0}))
+    if table.empty:
+        row = pd.Series(np.nan, index=table.columns)
+    else:
+        row = table.iloc[0]
+    record = wyniki.rekord('opisowe', n=0 if table.empty else int(row['n']),
+                           opisowe={name: row[name] for name, _ in OPISOWE_ETYKIETY})
+    wyniki.dodaj(records, record)
+    results = opisz_statystyki(record['opisowe'], results)
+    if bootstrap_options is not None and not table.empty:
+        with pomiary.etap('bootstrap_opisowe'):
+            intervals = bootstrap.bootstrap_opisowe(pd.to_numeric(series, errors='coerce'), **bootstrap_options)
+        results = przedzialy_bootstrap(intervals, results, bootstrap_options, records)
     return results
 
 
-def test_rownolicznosci(data: list, results: list):
+# Etykiety raportu statystyk z przedziałami bootstrap
+BOOTSTRAP_ETYKIETY = dict(OPISOWE_ETYKIETY, eta2='Eta²', epsilon2='Epsilon²')
+
+
+def przedzialy_bootstrap(intervals, results, bootstrap_options, records=None):
+    """
+    Linie raportu i rekord 'bootstrap' dla tabeli przedziałów z modułu bootstrap.
+
+    Parametry:
+    - intervals: pd.DataFrame — wynik bootstrap_opisowe lub bootstrap_efekt
+    - results: list — lista, do której dopisywane są wyniki
+    - bootstrap_options: dict — użyte argumenty (ci, n_resamples) do opisu
+    - records: list | None — lista, do której dopisywane są rekordy wyników
+    """
+    ci = bootstrap_options.get('ci', 0.95)
+    n_resamples = bootstrap_options.get('n_resamples', 10000)
+    wyniki.dodaj(records, wyniki.rekord('bootstrap', n=n_resamples, ci=ci,
+                                        przedzialy=intervals.to_dict(orient='index')))
+    results.append(f"  Przedziały ufności bootstrap ({ci:.0%}, prób: {n_resamples}):")
+    for name, row in intervals.iterrows():
+        results.append(f"    {BOOTSTRAP_ETYKIETY[name]}: {row['estymata']:.4f}, "
+                       f"percentylowy [{row['perc_lo']:.4f}, {row['perc_hi']:.4f}], "
+                       f"BCa [{row['bca_lo']:.4f}, {row['bca_hi']:.4f}]")
+    return results
+
+
+def wielkosc_efektu(data, results, bootstrap_options, records=None):
+    """
+    Wielkość efektu różnic między grupami (eta², epsilon²) z przedziałami bootstrap.
+
+    Parametry:
+    - data: list — serie danych kolejnych grup
+    - results: list — lista, do której dopisywane są wyniki
+    - bootstrap_options: dict — argumenty bootstrap.bootstrap_efekt
+    - records: list | None — lista, do której dopisywane są rekordy wyników
+    """
+    try:
+        with pomiary.etap('bootstrap_efekt'):
+            intervals = bootstrap.bootstrap_efekt(data, **bootstrap_options)
+    except Exception as e:
+        wyniki.dodaj(records, wyniki.rekord('bootstrap', blad=str(e)))
+        results.append(f"  Błąd w obliczaniu wielkości efektu: {e}")
+        return results
+    results.append("Wielkość efektu między grupami:")
+    return przedzialy_bootstrap(intervals, results, bootstrap_options, records)
+
+
+def opisz_rownolicznosc(record):
+    # Linie raportu dla rekordu testu chi-kwadrat równoliczności
+    lines = ["Test chi-kwadrat dla równoliczności obserwacji:"]
+    if record['n'] is not None and len(record['n']) != 3:
+        lines.append(f"  UWAGA: Oczekiwano 3 grup, znaleziono {len(record['n'])}.")
+    if record.get('blad') is not None:
+        lines.append(f"  Błąd podczas testu chi-kwadrat: {record['blad']}")
+        return lines
+    # Formatowanie słownika z nazwami grup
+    group_counts = dict(zip(record['grupy'], record['n']))
+    lines.append(f"  Liczebności grup: {group_counts}")
+    lines.append(f"  Statystyka chi² = {record['statystyka']:.4f}, p = {record['p']:.4f}")
+    # Wniosek
+    if record['decyzja'] == 'odrzucono H0':
+        lines.append("  Odrzucamy H₀: liczba obserwacji w grupach nie jest równa.")
+    else:
+        lines.append("  Brak podstaw do odrzucenia H₀: liczba obserwacji w grupach może być równa.")
+    return lines
+
+
+def test_rownolicznosci(data: list, results: list, records=None):
     """
     Test chi-kwadrat na równoliczność liczby obserwacji w grupach.
 
     Parametry:
         data: list of pd.Series - lista serii danych pogrupowanych (np. TTFF dla każdej grupy)
         results: list - lista, do której będą dopisywane wyniki
-        file_label: str - etykieta pliku/folderu do opisu
+        records: list | None - lista, do której dopisywane są rekordy wyników
     """
-    results.append(f"Test chi-kwadrat dla równoliczności obserwacji:")
-
+    counts = None
     try:
         # Zlicz liczbę obserwacji w każdej grupie
         counts = [len(group) for group in data]
         num_groups = len(counts)
 
-        # Ostrzeżenie jeśli nie są 3 grupy
-        if num_groups != 3:
-            results.append(f"  UWAGA: Oczekiwano 3 grup, znaleziono {num_groups}.")
-
         # Oczekiwane liczności
         expected = [np.mean(counts)] * num_groups
 
         # Test chi-kwadrat
-        stat, p = chisquare(f_obs=counts, f_exp=expected)
-
-        # Formatowanie słownika z nazwami grup
-        group_counts = {f"Grupa {i+1}": count for i, count in enumerate(counts)}
-        results.append(f"  Liczebności grup: {group_counts}")
-        results.append(f"  Statystyka chi² = {stat:.4f}, p = {p:.4f}")
-
-        # Wniosek
-        if p < 0.05:
-            results.append("  Odrzucamy H₀: liczba obserwacji w grupach nie jest równa.")
-        else:
-            results.append("  Brak podstaw do odrzucenia H₀: liczba obserwacji w grupach może być równa.")
+        stat, p = stats.chisquare(f_obs=counts, f_exp=expected)
+        record = wyniki.rekord('chi2_rownolicznosc', stat, p,
+                               grupy=[f"Grupa {i+1}" for i in range(num_groups)], n=counts,
+                               decyzja='odrzucono H0' if p < 0.05 else 'brak podstaw do odrzucenia H0')
     except Exception as e:
-        results.append(f"  Błąd podczas testu chi-kwadrat: {e}")
+        record = wyniki.rekord('chi2_rownolicznosc', n=counts, blad=str(e))
 
+    results.extend(opisz_rownolicznosc(wyniki.dodaj(records, record)))
     results.append("-" * 40)
     return results
 
 
-def anova(data, results, normal, equal_var):
+def test_permutacyjny_grup(groups, statystyka, results, permutations, records=None):
+    """
+    Permutacyjna p-wartość statystyki F lub H (uzupełnienie p-wartości asymptotycznej).
+
+    Parametry:
+    - groups: list — dane kolejnych grup
+    - statystyka: str — 'F' (ANOVA) lub 'H' (Kruskal-Wallis)
+    - results: list — lista, do której dopisywane są wyniki
+    - permutations: dict — argumenty permutacje.test_permutacyjny (np. n_permutations, seed)
+    - records: list | None — lista, do której dopisywane są rekordy wyników
+    """
+    test = 'anova_perm' if statystyka == 'F' else 'kruskal_perm'
+    try:
+        with pomiary.etap(test):
+            perm = permutacje.test_permutacyjny(groups, statystyka, **permutations)
+    except Exception as e:
+        wyniki.dodaj(records, wyniki.rekord(test, blad=str(e)))
+        results.append(f"    Błąd testu permutacyjnego: {e}")
+        return results
+    decyzja = 'odrzucono H0' if perm['p'] < 0.05 else 'brak podstaw do odrzucenia H0'
+    wyniki.dodaj(records, wyniki.rekord(test, perm['statystyka'], perm['p'], n=[len(g) for g in groups],
+                                        decyzja=decyzja, permutacje=perm['n_permutations'],
+                                        zatrzymano=perm['zatrzymano']))
+    stop = ", wczesne zatrzymanie" if perm['zatrzymano'] else ""
+    results.append(f"    p permutacyjne = {perm['p']:.4f} (permutacji: {perm['n_permutations']}{stop})")
+    return results
+
+
+def opisz_tukey(table, alpha=0.05):
+    # Tabela wyników testu Tukeya w układzie raportu statsmodels (pairwise_tukeyhsd)
+    header = f"Multiple Comparison of Means - Tukey HSD, FWER={alpha:.2f}"
+    if table.empty:
+        return f"{header}\n  brak par do raportu"
+    formatted = pd.DataFrame({
+        'group1': table['grupa_a'], 'group2': table['grupa_b'],
+        'meandiff': table['statystyka'].map('{:.4f}'.format),
+        'p-adj': table['p_adj'].map('{:.4f}'.format),
+        'lower': table['lower'].map('{:.4f}'.format),
+        'upper': table['upper'].map('{:.4f}'.format),
+        'reject': table['istotne'],
+    }).to_string(index=False)
+    width = len(formatted.splitlines()[0])
+    return "\n".join([header.center(width).rstrip(), "=" * width, formatted.splitlines()[0], "-" * width,
+                      *formatted.splitlines()[1:], "-" * width])
+
+
+def anova(data, results, normal, equal_var, records=None, permutations=None, posthoc_options=None):
+    """
+    ANOVA z testem post hoc Tukeya (dane normalne, równe wariancje) albo test
+    Kruskala-Wallisa z testem post hoc Dunna.
+
+    Parametry:
+    - data: pd.DataFrame z kolumnami 'TTFF' i 'group' lub lista serii danych grup
+    - results: list — lista, do której dopisywane są wyniki
+    - normal, equal_var: bool — wyniki testów założeń
+    - records: list | None — lista, do której dopisywane są rekordy wyników
+    - permutations: dict | None — dodatkowo permutacyjna p-wartość F/H
+      (argumenty permutacje.test_permutacyjny); None = tylko p asymptotyczne
+    - posthoc_options: dict | None — p_adjust (korekta Dunna: 'bonferroni', 'holm',
+      'fdr_bh', None) i max_pairs (powyżej tej liczby par raportowane i zapisywane
+      są tylko pary istotne); domyślnie Bonferroni i max_pairs = 45 (10 grup)
+    """
+    def decision(p):
+        return 'odrzucono H0' if p < 0.05 else 'brak podstaw do odrzucenia H0'
+
+    posthoc_options = dict({'p_adjust': 'bonferroni', 'max_pairs': 45}, **(posthoc_options or {}))
+
     if normal and equal_var:
         # ANOVA jednoczynnikowa
         try:
-            df_anova = data.copy()
-            df_anova['group'] = df_anova['group'].astype(str)
-            model = ols('TTFF ~ C(group)', data=df_anova).fit()
-            anova_results = anova_lm(model, typ=2)
-            f_val = anova_results['F'].iloc[0]
-            p_val = anova_results['PR(>F)'].iloc[0]
+            # F i test Tukeya ze statystyk dostatecznych grup (bez macierzy planu modelu OLS);
+            # lista serii (np. plików) jest liczona grupa po grupie i łączona (agregaty.tabela_grup)
+            with pomiary.etap('anova'):
+                if isinstance(data, pd.DataFrame):
+                    df_anova = data.assign(group=data['group'].astype(str))
+                    table = agregaty.statystyki_grup(df_anova['TTFF'], df_anova['group'])
+                    groups = [part.to_numpy() for _, part in df_anova.groupby('group')['TTFF']]
+                else:
+                    table = agregaty.tabela_grup(data)
+                    groups = data
+                f_val, p_val, _, _ = agregaty.anova_z_agregatow(table)
+            wyniki.dodaj(records, wyniki.rekord('anova', f_val, p_val, grupy=[str(g) for g in table.index],
+                                                n=[int(n) for n in table['n']], decyzja=decision(p_val)))
             results.append("  Wynik ANOVA:")
             results.append(f"    F = {f_val:.4f}, p = {p_val:.4f}")
+            if permutations is not None:
+                results = test_permutacyjny_grup(groups, 'F', results, permutations, records)
 
-            # Test post hoc Tukeya
-            tukey = pairwise_tukeyhsd(endog=df_anova['TTFF'],
-                                      groups=df_anova['group'],
-                                      alpha=0.05)
-            results.append("  Test post hoc Tukeya:")
-            results.append(str(tukey.summary()))
+            # Test post hoc Tukeya (wszystkie pary naraz, przy wielu grupach tylko istotne)
+            k = len(table)
+            sparse = k * (k - 1) // 2 > posthoc_options['max_pairs']
+            with pomiary.etap('tukey', grupy=k):
+                tukey = posthoc.tukey_z_agregatow(table, alpha=0.05, only_significant=sparse)
+            for row in tukey.itertuples():
+                wyniki.dodaj(records, wyniki.rekord('tukey', row.statystyka, row.p_adj,
+                                                    grupy=[row.grupa_a, row.grupa_b],
+                                                    decyzja=decision(row.p_adj), q=row.q,
+                                                    ci=[row.lower, row.upper]))
+            results.append("  Test post hoc Tukeya" + (" (tylko pary istotne):" if sparse else ":"))
+            results.append(opisz_tukey(tukey))
         except Exception as e:
+            wyniki.dodaj(records, wyniki.rekord('anova', blad=str(e)))
             results.append(f"  Błąd w obliczaniu ANOVA: {e}")
     else:
         # Test Kruskala-Wallisa
         try:
-            stat_kw, p_kw = kruskal(*data)
+            with pomiary.etap('kruskal'):
+                stat_kw, p_kw = stats.kruskal(*data)
+            groups = list(range(1, len(data) + 1))
+            wyniki.dodaj(records, wyniki.rekord('kruskal', stat_kw, p_kw, grupy=groups,
+                                                n=[len(g) for g in data], decyzja=decision(p_kw)))
             results.append("  Wynik testu Kruskala-Wallisa:")
             results.append(f"    statystyka={stat_kw:.4f}, p={p_kw:.4f}")
+            if permutations is not None:
+                results = test_permutacyjny_grup(data, 'H', results, permutations, records)
 
-            # Test post hoc Dunna
-            dunn = sp.posthoc_dunn(data, val_col='TTFF', group_col='group', p_adjust='bonferroni')
-            results.append("  Test post hoc Dunna (korekty Bonferroniego):")
-            results.append(dunn.to_string())
+            # Test post hoc Dunna (wszystkie pary naraz, przy wielu grupach tylko istotne)
+            sparse = len(groups) * (len(groups) - 1) // 2 > posthoc_options['max_pairs']
+            with pomiary.etap('dunn', grupy=len(groups)):
+                dunn = posthoc.dunn(data, p_adjust=posthoc_options['p_adjust'], only_significant=sparse)
+            pairs = [wyniki.dodaj(records, wyniki.rekord('dunn', row.statystyka, row.p_adj,
+                                                         grupy=[row.grupa_a, row.grupa_b],
+                                                         decyzja=decision(row.p_adj)))
+                     for row in dunn.itertuples()]
+            label = posthoc.KOREKTY[posthoc_options['p_adjust']]
+            if sparse:
+                results.append(f"  Test post hoc Dunna ({label}), pary istotne:")
+                results.extend(f"    {r['grupy'][0]} – {r['grupy'][1]}: z={r['statystyka']:.4f}, p={r['p']:.4f}"
+                               for r in pairs)
+                if not pairs:
+                    results.append("    brak istotnych różnic")
+            else:
+                results.append(f"  Test post hoc Dunna ({label}):")
+                results.append(macierz_posthoc(pairs, groups).to_string())
         except Exception as e:
+            wyniki.dodaj(records, wyniki.rekord('kruskal', blad=str(e)))
             results.append(f"  Błąd w obliczaniu testu Kruskala-Wallisa: {e}")
-    return results
\ No newline at end of file
+    return results
+
+
+def macierz_posthoc(pairs, groups):
+    # Symetryczna macierz p-wartości odtworzona z rekordów porównań parami
+    matrix = pd.DataFrame(np.eye(len(groups)), index=groups, columns=groups)
+    for record in pairs:
+        a, b = record['grupy']
+        matrix.loc[a, b] = matrix.loc[b, a] = record['p']
+    return matrix
@@ -1,14 +1,15 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
+import argparse
 from pathlib import Path
-from pandas.api.types import is_numeric_dtype
 import funct as f
+import podsumowania
+import pomiary
+import render
+import schemat
 import os
 
-# Styl wykresów
-sns.set(style="whitegrid")
+# matplotlib.pyplot i seaborn ładowane przy pierwszym rysowaniu (niezmienione wykresy są pomijane)
+plt = f.leniwy_import('matplotlib.pyplot')
+sns = f.leniwy_import('seaborn')
 
 prefixes = ['T_', 'R_', 'Y_']
 suffixes = ['SEX', 'EXPERIENCE', 'H&STEST_RESULTS', 'TIME', 'AGE', 'TTFF']
@@ -28,10 +29,29 @@ titles = ['Płeć badanych',
 
 save_data_path = Path('data_to_analysis')
 
-for file_idx, suf in enumerate(suffixes):
+# Szybki qqplot (analityczne pasmo ufności, rozrzedzone punkty) zamiast bootstrapu seaborn
+qq_fast = False
+
+
+def draw_category(file_idx, suf, columns, qq_fast=False):
+    """
+    Rysuje histogramy, boxploty i qqploty jednej kategorii.
+
+    Parametry:
+    - file_idx: int — indeks kategorii w suffixes
+    - suf: str — nazwa kategorii
+    - columns: list — dane (pd.Series) dla kolejnych prefiksów gogli albo ich podsumowania
+      (podsumowania.podsumuj; wykresy bez surowych danych, qqplot zawsze szybki)
+    - qq_fast: bool — szybki qqplot (patrz funct.qqplot)
+
+    Zwraca listę par (nazwa pliku bez rozszerzenia, figura) do zapisu.
+    """
+    # Styl wykresów
+    sns.set(style="whitegrid")
+
     # Sprawdzenie czy generować qqplot i boxplot
     if_qqplot = suf == "TTFF"
-    
+
     # stworzenie obrazka z histagramem
     hist_fig, hist_ax = plt.subplots(nrows=1, ncols=3, figsize=[8, 5])
 
@@ -42,56 +62,169 @@ for file_idx, suf in enumerate(suffixes):
     qq_fig, qq_ax = plt.subplots(nrows=1, ncols=3, figsize=[8, 5])
 
     # Tworzenie subplotów dla każdego koloru gogli w tej kategorii
-    for col_idx, pre in enumerate(prefixes):
-        # wczytanie danych
-        file_name = Path(pre + suf + file_format)
-        file_name = Path(data_path) / file_name
-        data = pd.read_csv(file_name, header=1)
-
+    for col_idx, data in enumerate(columns):
+        summary = isinstance(data, dict)
         #sprawdzenie czy rysowanie i zapis boxplotu się odbędzie
-        if_boxplot = is_numeric_dtype(data[col_names[file_idx]])
+        if_boxplot = podsumowania.liczbowe(data)
 
         # rysowanie histogramu
-        hist_ax[col_idx].hist(data[col_names[file_idx]], color=colors[col_idx])
+        if summary:
+            podsumowania.hist(hist_ax[col_idx], data, colors[col_idx])
+        else:
+            hist_ax[col_idx].hist(data, color=colors[col_idx])
         hist_ax[col_idx].set_xlabel(x_labels[col_idx])
 
         # rysowanie boxplotów
-        if if_boxplot:
-            box_ax[col_idx].boxplot(data[col_names[file_idx]], 
+        if if_boxplot and summary:
+            podsumowania.boxplot(box_ax[col_idx], data, colors[col_idx])
+        elif if_boxplot:
+            box_ax[col_idx].boxplot(data, 
                                     orientation='horizontal', 
                                     patch_artist=True,
                                     boxprops=dict(facecolor=colors[col_idx]),
                                     widths=0.5)
         # rysowanie qqplotów
-        if if_qqplot:
-            f.qqplot(data[col_names[file_idx]], qq_ax[col_idx], colors[col_idx])
+        if if_qqplot and summary:
+            if 'qq' in data:
+                f.qqplot_z_punktow(data['qq'], qq_ax[col_idx], colors[col_idx])
+            qq_fig.supxlabel('Dane teoretyczne')
+            qq_fig.supylabel('Dane doświadczalne [s]')
+        elif if_qqplot:
+            f.qqplot(data, qq_ax[col_idx], colors[col_idx], fast=qq_fast)
             qq_fig.supxlabel('Dane teoretyczne')
             qq_fig.supylabel('Dane doświadczalne [s]')
-            pass
-        
-        data = data[col_names[file_idx]]
-        # eksport danych
-        dir_name = suf + '_base'
-        os.makedirs(save_data_path / dir_name, exist_ok=True)
-        f.export_data(data, save_data_path / Path(dir_name) / Path(f'{pre}.csv'))
 
     hist_fig.supylabel("Liczba wystąpień")
-    hist_fig.suptitle(titles[file_idx])   
-    hist_fig.savefig(plot_path / f'{suf}_hist.eps')
-    hist_fig.savefig(plot_path / f'{suf}_hist.png')
-    plt.close(hist_fig)
+    hist_fig.suptitle(titles[file_idx])
+    figures = [(f'{suf}_hist', hist_fig)]
 
     if if_boxplot:
-        box_fig.savefig(plot_path / f'{suf}_box.eps')
-        box_fig.savefig(plot_path / f'{suf}_box.png')
+        figures.append((f'{suf}_box', box_fig))
+    else:
         plt.close(box_fig)
 
     if if_qqplot:
-        qq_fig.savefig(plot_path / f'{suf}_qq.eps')
-        qq_fig.savefig(plot_path / f'{suf}_qq.png')
+        figures.append((f'{suf}_qq', qq_fig))
+    else:
         plt.close(qq_fig)
-    
-    pass
+    return figures
+
+
+def main(sheets=None, export=True, formats=render.formats_default, workers=1, force=False,
+         compact=False, memory_log=None, summary=False):
+    """
+    Rysuje histogramy, boxploty i qqploty dla każdej kategorii.
+
+    Parametry:
+    - sheets: dict | None — arkusze w pamięci {nazwa arkusza: DataFrame};
+      None = wczytanie z folderu data_path
+    - export: bool — zapis danych do folderów save_data_path/*_base
+    - formats: tuple — formaty zapisu wykresów
+    - workers: int — liczba procesów rysujących (jedna kategoria na proces)
+    - force: bool — rysuj wszystkie wykresy, także niezmienione
+    - compact: bool — zwarte typy kolumn arkuszy (schemat.kompaktuj)
+    - memory_log: list | None — jeśli podana, pamięć danych po każdym etapie jest
+      wypisywana i dopisywana do listy (schemat.raport_pamieci)
+    - summary: bool — rysuj z podsumowań grup (wspólne przedziały histogramu, pięć liczb
+      boxplotu, ograniczona liczba wartości odstających), zapisanych też do
+      plot_path/podsumowania.json; czas rysowania i rozmiar plików nie zależą od liczby danych
+
+    Zwraca:
+    - dict {nazwa folderu *_base: {nazwa pliku: pd.Series}} z danymi dla analize_data
+    """
+    frames = {}
+    jobs = []
+    loaded = []
+    summaries = {}
+    for file_idx, suf in enumerate(suffixes):
+        columns = []
+        for pre in prefixes:
+            # wczytanie danych
+            if sheets is not None:
+                data = schemat.kompaktuj(sheets[pre + suf]) if compact else sheets[pre + suf]
+            else:
+                file_name = Path(pre + suf + file_format)
+                file_name = Path(data_path) / file_name
+                with pomiary.etap('wczytanie arkusza', arkusz=pre + suf):
+                    data = f.wczytaj_arkusz(file_name, compact)
+            if memory_log is not None:
+                loaded.append(data)
+
+            data = data[col_names[file_idx]]
+            columns.append(data)
+            dir_name = suf + '_base'
+            frames.setdefault(dir_name, {})[f'{pre}.csv'] = data
+            # eksport danych
+            if export:
+                os.makedirs(save_data_path / dir_name, exist_ok=True)
+                with pomiary.etap('eksport', plik=dir_name):
+                    f.export_data(data, save_data_path / Path(dir_name) / Path(f'{pre}.csv'))
+
+        if summary:
+            with pomiary.etap('podsumowania', kategoria=suf):
+                columns = podsumowania.podsumuj_kategorie(columns, qq=suf == 'TTFF')
+            summaries[suf] = {'tytuly': prefixes, 'grupy': columns}
+        jobs.append((suf, draw_category, dict(file_idx=file_idx, suf=suf, columns=columns, qq_fast=qq_fast)))
+
+    if memory_log is not None:
+        schemat.raport_pamieci('general_plots: arkusze', loaded, memory_log)
+        schemat.raport_pamieci('general_plots: dane do analizy', frames, memory_log)
+
+    if summary:
+        os.makedirs(plot_path, exist_ok=True)
+        podsumowania.zapisz(plot_path, summaries)
+
+    # rysowanie i zapis wykresów
+    with pomiary.etap('render_jobs', wykresy=plot_path.name):
+        render.render_jobs(jobs, plot_path, formats, workers, force)
+    return frames
+
+
+def rysuj_z_podsumowan(formats=render.formats_default, workers=1, force=False):
+    """
+    Rysuje wykresy ponownie z podsumowań zapisanych w plot_path/podsumowania.json
+    (main(summary=True)), bez wczytywania arkuszy.
+    """
+    stored = podsumowania.wczytaj(plot_path)
+    jobs = [(suf, draw_category, dict(file_idx=file_idx, suf=suf, columns=stored[suf]['grupy'], qq_fast=qq_fast))
+            for file_idx, suf in enumerate(suffixes) if suf in stored]
+    if not jobs:
+        print(f"Brak podsumowań w {plot_path / podsumowania.summary_name}.")
+    return render.render_jobs(jobs, plot_path, formats, workers, force)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Wykresy rozkładów dla każdej kategorii.")
+    parser.add_argument("--formats", nargs="+", default=list(render.formats_default),
+                        help="formaty zapisu wykresów (np. png)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="liczba procesów rysujących (0 = liczba rdzeni CPU)")
+    parser.add_argument("--force", action="store_true", help="rysuj także niezmienione wykresy")
+    parser.add_argument("--compact", action="store_true",
+                        help="zwarte typy kolumn (kategorie, mniejsze typy liczbowe)")
+    parser.add_argument("--memory", action="store_true", help="wypisz pamięć danych po każdym etapie")
+    parser.add_argument("--summary", action="store_true",
+                        help="rysuj z podsumowań grup (szybko przy bardzo wielu wierszach)")
+    parser.add_argument("--from-summaries", action="store_true",
+                        help="rysuj ponownie z zapisanych podsumowań, bez wczytywania danych")
+    parser.add_argument("--trace", default=None,
+                        help="zapisz czas, czas CPU i pamięć etapów do pliku (format Chrome trace)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="szczytowa pamięć każdego etapu w śladzie (tracemalloc, wolniej)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.trace:
+        pomiary.wlacz(args.trace_memory)
+    if args.from_summaries:
+        rysuj_z_podsumowan(tuple(args.formats), args.workers, args.force)
+    else:
+        main(formats=tuple(args.formats), workers=args.workers, force=args.force,
+             compact=args.compact, memory_log=[] if args.memory else None, summary=args.summary)
+    if args.trace:
+        pomiary.zakoncz(args.trace)
 
 '''#####################################
 #### 1. Rozkład wieku
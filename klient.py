@@ -0,0 +1,67 @@
+import argparse
+import json
+import sys
+import urllib.error
+import urllib.request
+
+# Adres usługi serwer.py (tylko komputer lokalny)
+host_default = '127.0.0.1'
+port_default = 8765
+
+# Zapytania obsługiwane przez usługę
+ZAPYTANIA = ['analiza', 'test', 'wykresy', 'stan', 'zamknij']
+
+
+def zapytaj(zapytanie, dane=None, host=host_default, port=port_default, timeout=None):
+    """
+    Wysyła zapytanie do usługi serwer.py i zwraca odpowiedź (dict z JSON).
+
+    Klient używa tylko biblioteki standardowej, więc jego uruchomienie nie ładuje
+    pandas ani scipy — czas odpowiedzi dla danych w pamięci podręcznej usługi to
+    milisekundy.
+
+    Parametry:
+    - zapytanie: str — jedno z ZAPYTANIA
+    - dane: dict | None — parametry zapytania (patrz serwer.py)
+    - host, port — adres usługi
+    - timeout: float | None — limit czasu odpowiedzi [s]
+
+    Błąd zgłoszony przez usługę jest zwracany jako {'blad': opis}.
+    """
+    body = json.dumps(dane or {}, ensure_ascii=False).encode('utf-8')
+    request = urllib.request.Request(f'http://{host}:{port}/{zapytanie}', data=body,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Klient lokalnej usługi analizy (serwer.py).")
+    parser.add_argument("zapytanie", choices=ZAPYTANIA, help="rodzaj zapytania")
+    parser.add_argument("--dane", default="{}",
+                        help='parametry zapytania jako JSON, np. \'{"folder": "SEX_TTFF"}\'')
+    parser.add_argument("--host", default=host_default, help="adres usługi")
+    parser.add_argument("--port", type=int, default=port_default, help="port usługi")
+    parser.add_argument("--json", action="store_true",
+                        help="wypisz całą odpowiedź jako JSON zamiast treści results.txt")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        answer = zapytaj(args.zapytanie, json.loads(args.dane), args.host, args.port)
+    except urllib.error.URLError as e:
+        sys.exit(f"Brak połączenia z usługą {args.host}:{args.port}: {e.reason}")
+    if args.json or 'blad' in answer:
+        print(json.dumps(answer, ensure_ascii=False, indent=2))
+    else:
+        # Treść results.txt (analiza) albo linie wyników testów; inne odpowiedzi jako JSON
+        parts = [entry.get('tekst') for entry in answer.get('foldery', [answer])]
+        if all(part is not None for part in parts):
+            print(''.join(parts), end='')
+        else:
+            print(json.dumps(answer, ensure_ascii=False, indent=2))
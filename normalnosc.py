@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Próg liczności, powyżej którego p-wartości testu Shapiro-Wilka są niewiarygodne (scipy)
+SHAPIRO_MAX_N = 5000
+
+# Ziarno podpróby warstwowej, gdy nie podano innego (ten sam wynik przy każdym uruchomieniu)
+seed_default = 0
+
+
+def _shapiro(matrix, seed=None):
+    stat, p = stats.shapiro(matrix, axis=1)
+    return np.atleast_1d(stat), np.atleast_1d(p)
+
+
+def _shapiro_podprobka(matrix, seed=None):
+    """
+    Shapiro-Wilk na warstwowej podpróbie SHAPIRO_MAX_N wartości każdego wiersza: posortowane
+    dane dzielone są na równe warstwy kwantylowe i z każdej losowana jest jedna wartość,
+    więc podpróba zachowuje kształt rozkładu. Losowanie jest powtarzalne (seed; domyślnie
+    seed_default).
+    """
+    n = matrix.shape[1]
+    if n <= SHAPIRO_MAX_N:
+        return _shapiro(matrix)
+    rng = np.random.default_rng(seed_default if seed is None else seed)
+    edges = np.linspace(0, n, SHAPIRO_MAX_N + 1).astype(np.int64)
+    picks = edges[:-1] + (rng.random(SHAPIRO_MAX_N) * np.diff(edges)).astype(np.int64)
+    return _shapiro(np.sort(matrix, axis=1)[:, picks])
+
+
+def _dagostino(matrix, seed=None):
+    stat, p = stats.normaltest(matrix, axis=1)
+    return np.atleast_1d(stat), np.atleast_1d(p)
+
+
+def _jarque_bera(matrix, seed=None):
+    stat, p = stats.jarque_bera(matrix, axis=1)
+    return np.atleast_1d(stat), np.atleast_1d(p)
+
+
+def _anderson(matrix, seed=None):
+    """
+    Anderson-Darling dla rozkładu normalnego z estymowaną średnią i wariancją, wektorowo
+    dla wierszy macierzy. P-wartość z aproksymacji D'Agostino i Stephensa (1986) dla
+    statystyki poprawionej A*² = A²(1 + 0.75/n + 2.25/n²).
+    """
+    n = matrix.shape[1]
+    x = np.sort(matrix, axis=1)
+    z = (x - x.mean(axis=1, keepdims=True)) / x.std(axis=1, ddof=1, keepdims=True)
+    i = np.arange(1, n + 1)
+    log_cdf, log_sf = stats.norm.logcdf(z), stats.norm.logsf(z[:, ::-1])
+    a2 = -n - ((2 * i - 1) * (log_cdf + log_sf)).sum(axis=1) / n
+    a2 = a2 * (1 + 0.75 / n + 2.25 / n ** 2)
+    # Wzór dla A*² >= 0.6 rośnie dla bardzo dużych A*² (człon kwadratowy), stąd obcięcie do 10
+    high = np.minimum(a2, 10.0)
+    p = np.select(
+        [a2 >= 0.6, a2 >= 0.34, a2 >= 0.2],
+        [np.exp(1.2937 - 5.709 * high + 0.0186 * high ** 2),
+         np.exp(0.9177 - 4.279 * a2 - 1.38 * a2 ** 2),
+         1 - np.exp(-8.318 + 42.796 * a2 - 59.938 * a2 ** 2)],
+        1 - np.exp(-13.436 + 101.14 * a2 - 223.73 * a2 ** 2))
+    return a2, np.clip(p, 0.0, 1.0)
+
+
+# Testy normalności: nazwa → (nazwa w raporcie, funkcja na macierzy wierszy, minimalne n)
+BACKENDY = {
+    'shapiro': ("Shapiro-Wilka", _shapiro, 3),
+    'shapiro_podprobka': ("Shapiro-Wilka (podpróba warstwowa)", _shapiro_podprobka, 3),
+    'dagostino': ("D'Agostino-Pearsona", _dagostino, 8),
+    'anderson': ("Andersona-Darlinga", _anderson, 3),
+    'jarque_bera': ("Jarque-Bera", _jarque_bera, 3),
+}
+
+
+def wybierz_backend(n, backend='auto'):
+    """
+    Test normalności dla próby o liczności n.
+
+    W trybie 'auto' do SHAPIRO_MAX_N wartości używany jest Shapiro-Wilk (jak dotąd),
+    powyżej — D'Agostino-Pearson, który nie ma limitu liczności i jest tańszy.
+    """
+    if backend == 'auto':
+        return 'shapiro' if n <= SHAPIRO_MAX_N else 'dagostino'
+    if backend not in BACKENDY:
+        raise ValueError(f"Nieznany test normalności: {backend}")
+    return backend
+
+
+def testuj(samples, backend='auto', seed=None):
+    """
+    Test normalności wielu prób jednym wywołaniem (np. wszystkie grupy i transformacje).
+
+    Próby są bez NaN grupowane według liczności i testu; każda taka grupa jest
+    testowana jednym wektorowym wywołaniem na macierzy (próba × obserwacje).
+
+    Parametry:
+    - samples: list — tablice danych (NaN są pomijane)
+    - backend: str — 'auto' lub klucz BACKENDY
+    - seed: int | None — ziarno podpróby warstwowej (None = seed_default)
+
+    Zwraca:
+    - pd.DataFrame z kolumnami test, statystyka, p, n (wiersz na próbę; p = NaN, gdy
+      próba jest za mała dla testu)
+    """
+    samples = [np.asarray(s, dtype=np.float64) for s in samples]
+    samples = [s[~np.isnan(s)] for s in samples]
+    n = np.array([len(s) for s in samples], dtype=np.int64)
+    tests = [wybierz_backend(size, backend) for size in n]
+    out = pd.DataFrame({'test': tests, 'statystyka': np.nan, 'p': np.nan, 'n': n})
+
+    blocks = {}
+    for row, (test, size) in enumerate(zip(tests, n)):
+        if size >= BACKENDY[test][2]:
+            blocks.setdefault((test, size), []).append(row)
+    for (test, size), rows in blocks.items():
+        stat, p = BACKENDY[test][1](np.vstack([samples[r] for r in rows]), seed)
+        out.loc[rows, 'statystyka'] = stat
+        out.loc[rows, 'p'] = p
+    return out
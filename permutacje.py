@@ -0,0 +1,132 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy import stats
+
+# Obsługiwane statystyki: F (ANOVA) i H (Kruskal-Wallis)
+STATYSTYKI = ('F', 'H')
+
+
+def _przygotuj(data, statystyka):
+    """
+    Dane posortowane po grupach (F: wartości, H: rangi) i początki bloków grup.
+
+    Statystyka liczona dla permutacji jest monotoniczną funkcją sumy Σ S_g² / n_g
+    (S_g — suma wartości lub rang w grupie), więc wystarczy porównywać tę sumę.
+    """
+    # Puste grupy nie wpływają na statystykę, a np.add.reduceat nie obsługuje pustych bloków
+    groups = [g for g in (np.asarray(g, dtype=np.float64) for g in data) if len(g)]
+    if len(groups) < 2:
+        raise ValueError("Test permutacyjny wymaga co najmniej dwóch niepustych grup.")
+    counts = np.array([len(g) for g in groups])
+    values = np.concatenate(groups)
+    if statystyka == 'H':
+        values = stats.rankdata(values)
+    elif statystyka != 'F':
+        raise ValueError(f"Nieznana statystyka: {statystyka}")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return values, counts, starts
+
+
+def _suma_miedzygrupowa(batch, counts, starts):
+    # Σ S_g² / n_g dla każdego wiersza macierzy (permutacja × obserwacje)
+    sums = np.add.reduceat(batch, starts, axis=1)
+    return (sums ** 2 / counts).sum(axis=1)
+
+
+def _statystyka(values, counts, statystyka):
+    # Wartość F lub H dla danych w układzie grup (bez permutacji)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    between = _suma_miedzygrupowa(values[None, :], counts, starts)[0]
+    n, k, total = len(values), len(counts), values.sum()
+    if statystyka == 'F':
+        ss_between = between - total ** 2 / n
+        ss_within = (values ** 2).sum() - between
+        return (ss_between / (k - 1)) / (ss_within / (n - k))
+    h = 12 / (n * (n + 1)) * between - 3 * (n + 1)
+    _, ties = np.unique(values, return_counts=True)
+    correction = 1 - (ties ** 3 - ties).sum() / (n ** 3 - n)
+    return h / correction
+
+
+def _licz_fragment(values, counts, starts, observed, size, seed):
+    """
+    Jeden fragment: size permutacji naraz jako macierz (size × N), sumy grup przez
+    np.add.reduceat. Zwraca liczbę permutacji ze statystyką >= obserwowanej.
+    """
+    rng = np.random.default_rng(seed)
+    batch = rng.permuted(np.broadcast_to(values, (size, len(values))), axis=1)
+    between = _suma_miedzygrupowa(batch, counts, starts)
+    # Tolerancja względna chroni przed błędami zaokrągleń przy wartościach równych obserwowanej
+    return int((between >= observed * (1 - 1e-12)).sum())
+
+
+def _decyzja_pewna(hits, total, alpha, confidence):
+    # Przedział Cloppera-Pearsona dla p nie obejmuje alpha → decyzja rozstrzygnięta
+    tail = (1 - confidence) / 2
+    lower = stats.beta.ppf(tail, hits, total - hits + 1) if hits > 0 else 0.0
+    upper = stats.beta.ppf(1 - tail, hits + 1, total - hits) if hits < total else 1.0
+    return upper < alpha or lower > alpha
+
+
+def test_permutacyjny(data, statystyka='F', n_permutations=9999, seed=None, alpha=0.05,
+                      early_stop=True, confidence=0.999, chunk_size=1000, max_memory_mb=64, workers=1):
+    """
+    Permutacyjny test równości grup dla statystyki F (ANOVA) lub H (Kruskal-Wallis).
+
+    Permutacje są losowane wektorowo w fragmentach (macierz permutacja × obserwacje),
+    a statystyka liczona dla całego fragmentu naraz z sum grup. Fragmenty mają stały
+    rozmiar (chunk_size, zmniejszany do limitu pamięci). Przy early_stop obliczenia kończą się, gdy przedział
+    ufności Cloppera-Pearsona dla p nie obejmuje już alpha.
+
+    Parametry:
+    - data: list — serie danych kolejnych grup (puste grupy są pomijane; ValueError,
+      gdy zostaje mniej niż dwie)
+    - statystyka: str — 'F' lub 'H'
+    - n_permutations: int — maksymalna liczba permutacji
+    - seed: int | None — ziarno; bez wczesnego zatrzymania wynik nie zależy od liczby procesów
+    - alpha: float — poziom istotności dla wczesnego zatrzymania
+    - early_stop: bool — zatrzymanie po rozstrzygnięciu decyzji
+    - confidence: float — poziom ufności przedziału dla p przy wczesnym zatrzymaniu
+    - chunk_size: int — liczba permutacji w jednym fragmencie
+    - max_memory_mb: float — limit pamięci jednego fragmentu
+    - workers: int — liczba procesów (1 = w bieżącym procesie, 0 = liczba rdzeni CPU)
+
+    Zwraca:
+    - dict: statystyka (wartość F/H), p, n_permutations (wykonane), zatrzymano (bool)
+    """
+    values, counts, starts = _przygotuj(data, statystyka)
+    observed_value = _statystyka(values, counts, statystyka)
+    observed = _suma_miedzygrupowa(values[None, :], counts, starts)[0]
+
+    size = int(max(1, min(n_permutations, chunk_size, max_memory_mb * 2**20 // (16 * len(values)))))
+    sizes = [size] * (n_permutations // size)
+    if n_permutations % size:
+        sizes.append(n_permutations % size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if not workers:
+        workers = os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    hits, done, stopped = 0, 0, False
+    try:
+        # Fragmenty liczone rundami po `workers`; decyzja o zatrzymaniu po każdej rundzie
+        for start in range(0, len(sizes), workers):
+            round_args = [(values, counts, starts, observed, sizes[i], seeds[i])
+                          for i in range(start, min(start + workers, len(sizes)))]
+            if executor is None:
+                round_hits = [_licz_fragment(*args) for args in round_args]
+            else:
+                round_hits = list(executor.map(_licz_fragment, *zip(*round_args)))
+            hits += sum(round_hits)
+            done += sum(args[4] for args in round_args)
+            if early_stop and done < n_permutations and _decyzja_pewna(hits, done, alpha, confidence):
+                stopped = True
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {'statystyka': observed_value, 'p': (hits + 1) / (done + 1),
+            'n_permutations': done, 'zatrzymano': stopped}
@@ -0,0 +1,120 @@
+import argparse
+import os
+import pandas as pd
+from pathlib import Path
+import eksport_data as ek
+import general_plots as gp
+import corelation_plots as cp
+import analize_data as ad
+import pomiary
+import render
+import schemat
+import wyniki
+
+
+def analyze_frames(base_frames, ttff_frames, write=True):
+    """
+    Analiza danych przekazanych z modułów wykresów bez zapisu i odczytu plików CSV.
+
+    Parametry:
+    - base_frames: dict — wynik general_plots.main: {folder *_base: {nazwa: pd.Series}}
+    - ttff_frames: dict — wynik corelation_plots.main: {folder *_TTFF: {nazwa: pd.DataFrame}}
+    - write: bool — zapis results.txt do folderów w gp.save_data_path / cp.save_data_path
+
+    Zwraca dict {ścieżka folderu: lista linii wyników lub None}. Rekordy wyników testów
+    trafiają do magazynu results.jsonl w gp.save_data_path.
+    """
+    all_results = {}
+    records = []
+    for dir_name, frames in base_frames.items():
+        folder = gp.save_data_path / dir_name
+        # Pliki po nazwie, jak read_csv_items (decyzja o normalności z ostatniego pliku)
+        all_results[folder] = ad.analyze_base_data(sorted(frames.items()), folder, records)
+
+    for dir_name, frames in ttff_frames.items():
+        folder = cp.save_data_path / dir_name
+        # Kolumny po nazwach: TTFF z 'R jacket', grupa z kolumny kategorii
+        group_col = cp.col_names[cp.suffixes.index(dir_name[:-len('_TTFF')])]
+        items = [(name, pd.DataFrame({'TTFF': df['R jacket'], 'group': df[group_col]}))
+                 for name, df in sorted(frames.items())]
+        all_results[folder] = ad.analyze_ttff_data(items, folder, records)
+
+    if write:
+        for folder, results in all_results.items():
+            if results is not None:
+                os.makedirs(folder, exist_ok=True)
+                ad.zapisz_wyniki(results, folder / "results.txt")
+        os.makedirs(gp.save_data_path, exist_ok=True)
+        wyniki.aktualizuj_magazyn(gp.save_data_path / wyniki.store_name, records,
+                                  {folder.name for folder in all_results})
+    return all_results
+
+
+def main(source=ek.file_path, from_csv=False, export_csv=False,
+         formats=render.formats_default, render_workers=1, force_render=False,
+         compact=False, memory_log=None):
+    """
+    Cały potok w jednym procesie: eksport → wykresy → analiza.
+
+    Parametry:
+    - source: str | Path — plik .ods
+    - from_csv: bool — zamiast pliku .ods użyj wcześniej wyeksportowanych arkuszy z gp.data_path
+    - export_csv: bool — dodatkowy zapis danych pośrednich do data_to_analysis (CSV)
+    - formats, render_workers, force_render — ustawienia rysowania (patrz render.render_jobs)
+    - compact: bool — zwarte typy kolumn arkuszy (schemat.kompaktuj)
+    - memory_log: list | None — jeśli podana, pamięć danych po każdym etapie jest
+      wypisywana i dopisywana do listy (schemat.raport_pamieci)
+    """
+    # Eksport arkuszy do pamięci
+    with pomiary.etap('eksport arkuszy'):
+        sheets = None if from_csv else ek.wczytaj_arkusze(source)
+    if sheets is not None and compact:
+        sheets = {name: schemat.kompaktuj(df) for name, df in sheets.items()}
+    if sheets is not None and memory_log is not None:
+        schemat.raport_pamieci('eksport: arkusze', sheets, memory_log)
+
+    # Wykresy; zwracają dane pogrupowane do analizy (arkusze w pamięci są już zwarte)
+    with pomiary.etap('general_plots'):
+        base_frames = gp.main(sheets, export_csv, formats, render_workers, force_render,
+                              compact and sheets is None, memory_log)
+    with pomiary.etap('corelation_plots'):
+        ttff_frames = cp.main(sheets, export_csv, formats, render_workers, force_render,
+                              compact and sheets is None, memory_log)
+
+    # Analiza danych w pamięci
+    with pomiary.etap('analiza'):
+        return analyze_frames(base_frames, ttff_frames)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Potok eksport → wykresy → analiza w jednym procesie.")
+    parser.add_argument("--source", default=ek.file_path, help="plik .ods")
+    parser.add_argument("--from-csv", action="store_true",
+                        help="wczytaj arkusze z folderu eksport_csv zamiast z pliku .ods")
+    parser.add_argument("--export-csv", action="store_true",
+                        help="zapisz dane pośrednie do data_to_analysis jako CSV")
+    parser.add_argument("--formats", nargs="+", default=list(render.formats_default),
+                        help="formaty zapisu wykresów (np. png)")
+    parser.add_argument("-j", "--render-workers", type=int, default=1,
+                        help="liczba procesów rysujących (0 = liczba rdzeni CPU)")
+    parser.add_argument("--force-render", action="store_true",
+                        help="rysuj także niezmienione wykresy")
+    parser.add_argument("--compact", action="store_true",
+                        help="zwarte typy kolumn (kategorie, mniejsze typy liczbowe)")
+    parser.add_argument("--memory", action="store_true", help="wypisz pamięć danych po każdym etapie")
+    parser.add_argument("--trace", default=None,
+                        help="zapisz czas, czas CPU i pamięć etapów do pliku (format Chrome trace)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="szczytowa pamięć każdego etapu w śladzie (tracemalloc, wolniej)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.trace:
+        pomiary.wlacz(args.trace_memory)
+    main(Path(args.source), args.from_csv, args.export_csv,
+         tuple(args.formats), args.render_workers, args.force_render,
+         args.compact, [] if args.memory else None)
+    if args.trace:
+        pomiary.zakoncz(args.trace)
@@ -0,0 +1,136 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from pandas.api.types import is_numeric_dtype
+import funct as f
+
+# Liczba przedziałów histogramu (jak domyślnie w ax.hist)
+bins_default = 10
+
+# Maksymalna liczba zapisywanych wartości odstających boxplotu na grupę
+max_outliers = 200
+
+# Plik z podsumowaniami kategorii w folderze wykresów
+summary_name = 'podsumowania.json'
+
+
+def wspolne_przedzialy(columns, bins=bins_default):
+    """
+    Wspólne granice przedziałów histogramu dla wszystkich grup liczbowych kategorii
+    (np.histogram_bin_edges na zakresie od najmniejszej do największej wartości).
+    Zwraca None, gdy żadna grupa nie jest liczbowa lub nie ma danych.
+    """
+    ranges = [(np.nanmin(values), np.nanmax(values)) for values in
+              (pd.Series(c).to_numpy(dtype=np.float64) for c in columns if is_numeric_dtype(pd.Series(c)))
+              if np.isfinite(values).any()]
+    if not ranges:
+        return None
+    low, high = min(r[0] for r in ranges), max(r[1] for r in ranges)
+    return np.histogram_bin_edges(np.empty(0), bins, range=(low, high))
+
+
+def podsumuj(data, edges=None, max_outliers=max_outliers, qq=False):
+    """
+    Podsumowanie jednej grupy do rysowania histogramu i boxplotu bez surowych danych.
+
+    Dane liczbowe: liczebności przedziałów edges (np.histogram), pięć liczb boxplotu
+    (kwartyle i wąsy 1.5 IQR jak w ax.boxplot) oraz wartości odstające — przy więcej niż
+    max_outliers równomiernie rozrzedzone po kwantylach, zawsze z najmniejszą i największą.
+    Dane nieliczbowe: liczebności etykiet w kolejności pierwszego wystąpienia.
+    Wszystkie tablice są listami, więc podsumowanie można zapisać do JSON.
+
+    Parametry:
+    - data: pd.Series | array-like — dane grupy (braki są pomijane)
+    - edges: array-like | None — granice przedziałów (wspolne_przedzialy); None = bins_default
+      przedziałów na zakresie grupy
+    - max_outliers: int — maks. liczba zapisanych wartości odstających
+    - qq: bool — dodaj punkty szybkiego wykresu kwantyl-kwantyl (funct.qqplot_punkty)
+    """
+    series = pd.Series(data).dropna()
+    if not is_numeric_dtype(series):
+        counts = series.astype(str).value_counts(sort=False)
+        return {'typ': 'kategorie', 'n': len(series), 'etykiety': list(counts.index),
+                'liczebnosci': counts.tolist()}
+
+    values = series.to_numpy(dtype=np.float64)
+    if edges is None:
+        edges = np.histogram_bin_edges(values, bins_default)
+    counts, edges = np.histogram(values, edges)
+    summary = {'typ': 'liczby', 'n': len(values), 'przedzialy': np.asarray(edges).tolist(),
+               'liczebnosci': counts.tolist()}
+    if len(values):
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        iqr = q3 - q1
+        inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+        whislo = min(inside.min(), q1) if len(inside) else q1
+        whishi = max(inside.max(), q3) if len(inside) else q3
+        outliers = np.sort(values[(values < whislo) | (values > whishi)])
+        n_outliers = len(outliers)
+        if n_outliers > max_outliers:
+            outliers = outliers[np.unique(np.round(np.linspace(0, len(outliers) - 1, max_outliers)).astype(np.int64))]
+        summary.update(q1=float(q1), mediana=float(median), q3=float(q3), whislo=float(whislo),
+                       whishi=float(whishi), odstajace=outliers.tolist(),
+                       n_odstajacych=n_outliers)
+        if qq:
+            summary['qq'] = {key: np.asarray(value).tolist() for key, value in f.qqplot_punkty(values).items()}
+    return summary
+
+
+def podsumuj_kategorie(columns, bins=bins_default, max_outliers=max_outliers, qq=False):
+    # Podsumowania grup jednej kategorii ze wspólnymi przedziałami histogramu
+    edges = wspolne_przedzialy(columns, bins)
+    return [podsumuj(c, edges, max_outliers, qq) for c in columns]
+
+
+def liczbowe(data):
+    # Czy grupa (seria albo podsumowanie) ma dane liczbowe, czyli czy rysować boxplot
+    if isinstance(data, dict):
+        return data['typ'] == 'liczby'
+    return is_numeric_dtype(data)
+
+
+def hist(ax, summary, color):
+    """
+    Histogram z podsumowania: jeden słupek na przedział (lub etykietę), koszt rysowania
+    i rozmiar pliku nie zależą od liczby danych.
+    """
+    if summary['typ'] == 'kategorie':
+        return ax.hist(summary['etykiety'], weights=summary['liczebnosci'], color=color)
+    edges = summary['przedzialy']
+    return ax.hist(edges[:-1], bins=edges, weights=summary['liczebnosci'], color=color)
+
+
+def boxplot(ax, summary, color):
+    # Boxplot poziomy z pięciu liczb i zapisanych wartości odstających (ax.bxp)
+    if 'mediana' not in summary:
+        return None
+    stats = {'med': summary['mediana'], 'q1': summary['q1'], 'q3': summary['q3'],
+             'whislo': summary['whislo'], 'whishi': summary['whishi'], 'fliers': summary['odstajace']}
+    return ax.bxp([stats], orientation='horizontal', patch_artist=True,
+                  boxprops=dict(facecolor=color), widths=0.5)
+
+
+def zapisz(plot_path, summaries):
+    """
+    Zapisuje podsumowania kategorii do plot_path/podsumowania.json, dopisując je do
+    podsumowań zapisanych wcześniej (ten sam klucz kategorii jest zastępowany).
+
+    Parametry:
+    - plot_path: str | Path — folder wykresów
+    - summaries: dict {kategoria: {'tytuly': [...], 'grupy': [podsumowanie, ...]}}
+    """
+    path = Path(plot_path) / summary_name
+    stored = wczytaj(plot_path)
+    stored.update(summaries)
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(stored, handle, ensure_ascii=False)
+
+
+def wczytaj(plot_path):
+    # Podsumowania zapisane przez zapisz(); {} gdy pliku nie ma
+    path = Path(plot_path) / summary_name
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
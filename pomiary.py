@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from pathlib import Path
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: bez szczytowej pamięci procesu (ru_maxrss)
+    resource = None
+
+# Zdarzenia bieżącego przebiegu; None = pomiary wyłączone (etap() zwraca pusty kontekst)
+_zdarzenia = None
+
+# Szczytowa pamięć etapów z tracemalloc (wolniejsze, więc osobno włączane)
+_pamiec = False
+
+# Otwarte etapy bieżącego wątku (szczyt pamięci etapu podrzędnego przechodzi do nadrzędnego)
+_stos = threading.local()
+
+_pusty = nullcontext()
+
+# Kolumny tabeli podsumowania
+KOLUMNY = ['etap', 'liczba', 'czas [s]', 'czas max [s]', 'cpu [s]', 'pamiec max [MB]']
+
+
+def wlacz(memory=False):
+    """
+    Włącza zbieranie pomiarów etapów (czas, czas CPU, szczytowa pamięć).
+
+    Parametry:
+    - memory: bool — szczytowa pamięć alokacji każdego etapu (tracemalloc; spowalnia
+      kod Pythona). Bez tego zapisywana jest tylko szczytowa pamięć procesu (ru_maxrss).
+    """
+    global _zdarzenia, _pamiec
+    _zdarzenia = []
+    _pamiec = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def wylacz():
+    # Wyłącza pomiary i zwraca zebrane zdarzenia
+    global _zdarzenia, _pamiec
+    events, _zdarzenia = _zdarzenia or [], None
+    if _pamiec:
+        tracemalloc.stop()
+    _pamiec = False
+    return events
+
+
+def wlaczone():
+    return _zdarzenia is not None
+
+
+def pamiec_wlaczona():
+    return _pamiec
+
+
+class _Etap:
+    __slots__ = ('nazwa', 'args', 'start', 'cpu', 'peak')
+
+    def __init__(self, nazwa, args):
+        self.nazwa = nazwa
+        self.args = args
+
+    def __enter__(self):
+        stack = _stos.__dict__.setdefault('etapy', [])
+        if _pamiec:
+            # Szczyt do tej chwili należy do etapu nadrzędnego; od teraz liczony od nowa
+            peak = tracemalloc.get_traced_memory()[1]
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+        self.peak = 0
+        stack.append(self)
+        self.cpu = time.process_time_ns()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        cpu = time.process_time_ns() - self.cpu
+        stack = _stos.etapy
+        stack.pop()
+        peak = None
+        if _pamiec:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+        if _zdarzenia is not None:
+            _zdarzenia.append({
+                'nazwa': self.nazwa, 'args': self.args, 'start_us': self.start // 1000,
+                'czas': (end - self.start) / 1e9, 'cpu': cpu / 1e9, 'pamiec': peak,
+                'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+                'pid': os.getpid(), 'tid': threading.get_ident(), 'poziom': len(stack),
+            })
+        return False
+
+
+def etap(nazwa, **args):
+    """
+    Kontekst mierzący etap przetwarzania: with pomiary.etap('read_csv', plik=name): ...
+
+    Przy wyłączonych pomiarach zwraca współdzielony pusty kontekst (koszt jednego
+    wywołania funkcji). Czasy etapów zagnieżdżonych są wliczane w etap nadrzędny.
+
+    Parametry:
+    - nazwa: str — nazwa etapu (wiersz podsumowania)
+    - args: folder, kategoria, plik itp. — opis w śladzie
+    """
+    if _zdarzenia is None:
+        return _pusty
+    return _Etap(nazwa, args)
+
+
+def w_procesie(memory, func, *args, **kwargs):
+    """
+    Uruchamia func z włączonymi pomiarami w procesie roboczym puli.
+
+    Zwraca (wynik, zdarzenia); zdarzenia dołącza się w procesie głównym przez dolacz().
+    """
+    wlacz(memory)
+    try:
+        return func(*args, **kwargs), wylacz()
+    except BaseException:
+        wylacz()
+        raise
+
+
+def dolacz(events):
+    # Dołącza zdarzenia z procesu roboczego do bieżącego przebiegu
+    if _zdarzenia is not None:
+        _zdarzenia.extend(events)
+
+
+def zapisz_slad(path, events):
+    """
+    Zapisuje zdarzenia w formacie Chrome trace (chrome://tracing, Perfetto): jedno
+    zdarzenie 'X' na etap, procesy robocze jako osobne pid.
+    """
+    trace = [{'name': e['nazwa'], 'cat': 'etap', 'ph': 'X', 'ts': e['start_us'],
+              'dur': max(1, round(e['czas'] * 1e6)), 'pid': e['pid'], 'tid': e['tid'],
+              'args': dict(e['args'], cpu_s=e['cpu'], pamiec_b=e['pamiec'], maxrss_kb=e['maxrss_kb'])}
+             for e in events]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False, default=str)
+
+
+def podsumowanie(events):
+    """
+    Tabela etapów: liczba wystąpień, suma i maksimum czasu, suma czasu CPU i szczytowa
+    pamięć (tracemalloc, a bez niego ru_maxrss procesu), posortowana malejąco po czasie.
+    """
+    if not events:
+        return pd.DataFrame(columns=KOLUMNY)
+    frame = pd.DataFrame(events)
+    memory = frame['pamiec'] if frame['pamiec'].notna().any() else frame['maxrss_kb'] * 1024
+    frame = frame.assign(pamiec_mb=pd.to_numeric(memory, errors='coerce') / 2**20)
+    table = frame.groupby('nazwa', sort=False).agg(liczba=('czas', 'size'), czas=('czas', 'sum'),
+                                                  czas_max=('czas', 'max'), cpu=('cpu', 'sum'),
+                                                  pamiec=('pamiec_mb', 'max'))
+    table = table.sort_values('czas', ascending=False).reset_index()
+    table.columns = KOLUMNY
+    return table
+
+
+def zakoncz(path=None):
+    """
+    Kończy przebieg z pomiarami: zapisuje ślad (jeśli podano path) i wypisuje podsumowanie.
+
+    Zwraca tabelę podsumowania (pd.DataFrame).
+    """
+    events = wylacz()
+    if path is not None:
+        zapisz_slad(Path(path), events)
+        print(f"Ślad pomiarów zapisano do {path}")
+    table = podsumowanie(events)
+    print(table.to_string(index=False, float_format=lambda x: f'{x:.4f}'))
+    return table
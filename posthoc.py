@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.interpolate import CubicSpline
+
+# Korekty wielokrotnych porównań: nazwa → opis w raporcie
+KOREKTY = {
+    'bonferroni': 'korekty Bonferroniego',
+    'holm': 'korekty Holma',
+    'fdr_bh': 'korekty Benjaminiego-Hochberga',
+    None: 'bez korekty',
+}
+
+
+def koryguj(p, method='bonferroni'):
+    """
+    Skorygowane p-wartości wektora porównań (bonferroni, holm, fdr_bh lub None).
+
+    Holm i BH są liczone jednym sortowaniem i skumulowanym maksimum/minimum.
+    """
+    p = np.asarray(p, dtype=np.float64)
+    m = len(p)
+    if method is None or m == 0:
+        return p.copy()
+    if method == 'bonferroni':
+        return np.minimum(p * m, 1.0)
+    order = np.argsort(p, kind='stable')
+    ranked = p[order]
+    if method == 'holm':
+        adjusted = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    elif method == 'fdr_bh':
+        adjusted = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"Nieznana korekta: {method}")
+    out = np.empty(m)
+    out[order] = np.minimum(adjusted, 1.0)
+    return out
+
+
+def _grupy(data):
+    # Wartości bez NaN, liczności i kody grup z listy serii albo ramki ('TTFF', 'group')
+    if isinstance(data, pd.DataFrame):
+        data = data.dropna(subset=['TTFF', 'group'])
+        labels, parts = zip(*[(label, part.to_numpy(dtype=np.float64))
+                              for label, part in data.groupby('group', sort=True)['TTFF']])
+    else:
+        labels = list(range(1, len(data) + 1))
+        parts = [np.asarray(pd.to_numeric(pd.Series(g), errors='coerce').dropna(), dtype=np.float64)
+                 for g in data]
+    counts = np.array([len(p) for p in parts])
+    return list(labels), np.concatenate(parts), counts, np.repeat(np.arange(len(parts)), counts)
+
+
+def _pary(labels, stat, p, p_adj, alpha, only_significant, **columns):
+    # Tabela porównań z górnego trójkąta macierzy (każda para raz)
+    i, j = np.triu_indices(len(labels), k=1)
+    table = pd.DataFrame({'grupa_a': np.asarray(labels, dtype=object)[i],
+                          'grupa_b': np.asarray(labels, dtype=object)[j],
+                          'statystyka': stat[i, j], 'p': p[i, j], 'p_adj': p_adj,
+                          **{name: value[i, j] for name, value in columns.items()}})
+    table['istotne'] = table['p_adj'] < alpha
+    if only_significant:
+        table = table[table['istotne']].reset_index(drop=True)
+    return table
+
+
+def dunn(data, p_adjust='bonferroni', alpha=0.05, only_significant=False):
+    """
+    Test post hoc Dunna dla wszystkich par grup jako operacje macierzowe.
+
+    Rangi całej próby liczone są raz; z-wartości wszystkich par wynikają ze średnich
+    rang grup (różnice przez broadcasting), z poprawką na wiązania jak w
+    scikit_posthocs.posthoc_dunn.
+
+    Parametry:
+    - data: list | pd.DataFrame — serie grup (etykiety 1..k) albo ramka z kolumnami 'TTFF' i 'group'
+    - p_adjust: str | None — korekta: 'bonferroni', 'holm', 'fdr_bh' lub None
+    - alpha: float — poziom istotności (kolumna istotne)
+    - only_significant: bool — zwróć tylko istotne pary (przy wielu poziomach czynnika)
+
+    Zwraca:
+    - pd.DataFrame z kolumnami grupa_a, grupa_b, statystyka (z), p, p_adj, istotne
+    """
+    labels, values, counts, codes = _grupy(data)
+    n = len(values)
+    ranks = stats.rankdata(values)
+    mean_ranks = np.bincount(codes, weights=ranks) / counts
+
+    _, ties = np.unique(values, return_counts=True)
+    tie_term = (ties ** 3 - ties).sum() / (12 * (n - 1))
+    scale = np.sqrt((n * (n + 1) / 12 - tie_term) * (1 / counts[:, None] + 1 / counts[None, :]))
+    z = np.abs(mean_ranks[:, None] - mean_ranks[None, :]) / scale
+    p = 2 * stats.norm.sf(z)
+
+    i, j = np.triu_indices(len(labels), k=1)
+    return _pary(labels, z, p, koryguj(p[i, j], p_adjust), alpha, only_significant)
+
+
+# Powyżej tej liczby par (k > 10 grup) p-wartości Tukeya są interpolowane z siatki zamiast
+# liczone dokładnie: siatka kosztuje tyle co ~100 par liczonych osobno (błąd p poniżej 1e-6)
+TUKEY_DOKLADNIE_MAX = 45
+Q_MAX = 15.0
+
+
+def _rozstep_sf(q, k, df, grid_size=128):
+    """
+    Funkcja przeżycia rozkładu studentyzowanego rozstępu dla wektora q. Dla wielu par
+    (scipy całkuje numerycznie każdą wartość osobno) log sf jest interpolowany funkcją
+    sklejaną z równomiernej siatki grid_size punktów.
+    """
+    if len(q) <= TUKEY_DOKLADNIE_MAX:
+        return stats.studentized_range.sf(q, k, df)
+    # Powyżej Q_MAX p jest pomijalnie małe; takie pary dostają p(Q_MAX) jako górne ograniczenie
+    grid = np.linspace(0.0, min(np.nanmax(q), Q_MAX), grid_size)
+    with np.errstate(divide='ignore'):
+        log_sf = np.log(stats.studentized_range.sf(grid, k, df))
+    finite = np.isfinite(log_sf)
+    return np.exp(CubicSpline(grid[finite], log_sf[finite])(np.minimum(q, grid[finite][-1])))
+
+
+def tukey(data, alpha=0.05, only_significant=False):
+    """
+    Test post hoc Tukeya (HSD, Tukey-Kramer dla nierównych grup) jako operacje macierzowe.
+
+    Średnie i wspólna wariancja pochodzą z jednego przebiegu po danych (bincount);
+    statystyki q i przedziały ufności wszystkich par liczone są przez broadcasting.
+    P-wartości z rozkładu studentyzowanego rozstępu kontrolują już FWER (przy bardzo
+    wielu parach interpolowane, patrz _rozstep_sf).
+
+    Parametry:
+    - data: list | pd.DataFrame — jak w dunn
+    - alpha: float — poziom istotności przedziałów i kolumny istotne
+    - only_significant: bool — zwróć tylko istotne pary
+
+    Zwraca:
+    - pd.DataFrame z kolumnami grupa_a, grupa_b, statystyka (różnica średnich b - a),
+      p, p_adj, q, lower, upper, istotne
+    """
+    labels, values, counts, codes = _grupy(data)
+    means = np.bincount(codes, weights=values) / counts
+    m2 = np.bincount(codes, weights=(values - means[codes]) ** 2, minlength=len(counts))
+    return _tukey(labels, counts, means, m2, alpha, only_significant)
+
+
+def tukey_z_agregatow(table, alpha=0.05, only_significant=False):
+    """
+    Test post hoc Tukeya z tabeli statystyk dostatecznych (agregaty.statystyki_grup /
+    agregaty.tabela_grup): liczności, średnie i M2 grup wystarczą, surowe dane nie są potrzebne.
+
+    Parametry i wynik jak w tukey; etykiety grup z indeksu tabeli.
+    """
+    return _tukey(list(table.index), table['n'].to_numpy(), table['mean'].to_numpy(),
+                  table['m2'].to_numpy(), alpha, only_significant)
+
+
+def _tukey(labels, counts, means, m2, alpha, only_significant):
+    # Wszystkie pary naraz z liczności, średnich i M2 grup (wspólna wariancja = Σ M2 / (n - k))
+    k, n = len(counts), counts.sum()
+    mse = m2.sum() / (n - k)
+
+    diff = means[None, :] - means[:, None]
+    se = np.sqrt(mse / 2 * (1 / counts[:, None] + 1 / counts[None, :]))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        q = np.abs(diff) / se
+    p = np.ones_like(q)
+    i, j = np.triu_indices(k, k=1)
+    p[i, j] = _rozstep_sf(q[i, j], k, n - k)
+    margin = stats.studentized_range.ppf(1 - alpha, k, n - k) * se
+    return _pary(labels, diff, p, np.minimum(p[i, j], 1.0), alpha, only_significant,
+                 q=q, lower=diff - margin, upper=diff + margin)
+
+
+def macierz(pairs, labels, column='p_adj'):
+    # Symetryczna macierz wartości z tabeli par (przekątna 1), jak w scikit_posthocs
+    matrix = pd.DataFrame(np.eye(len(labels)), index=labels, columns=labels)
+    for a, b, value in zip(pairs['grupa_a'], pairs['grupa_b'], pairs[column]):
+        matrix.loc[a, b] = matrix.loc[b, a] = value
+    return matrix
@@ -0,0 +1,177 @@
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import pomiary
+
+# Domyślne formaty zapisu wykresów
+formats_default = ('eps', 'png')
+
+# Plik z hashami danych i parametrów ostatnio narysowanych wykresów
+manifest_name = '.render_manifest.json'
+
+# Moduły pomocnicze rysowania (qqplot, histogramy, boxploty z podsumowań) i biblioteki,
+# od których zależy wygląd wykresu: zmiana ich kodu lub wersji unieważnia manifest
+moduly_pomocnicze = ('funct', 'podsumowania')
+biblioteki = ('matplotlib', 'seaborn')
+
+
+def _update_digest(digest, obj):
+    # Rekurencyjny hash danych wejściowych wykresu (ramki pandas po zawartości)
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        digest.update(repr(obj.dtypes if isinstance(obj, pd.DataFrame) else obj.dtype).encode())
+        digest.update(repr(getattr(obj, 'columns', obj.name)).encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=repr):
+            digest.update(repr(key).encode())
+            _update_digest(digest, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        digest.update(f'{type(obj).__name__}{len(obj)}'.encode())
+        for item in obj:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(obj).encode())
+
+
+def figure_hash(func, kwargs):
+    """
+    Hash zadania rysowania: kod modułu funkcji rysującej (razem z jego zmiennymi globalnymi:
+    tytułami, kolorami, etykietami), kod modułów pomocniczych, wersje bibliotek wykresów,
+    dane wejściowe i parametry.
+
+    Parametry:
+    - func: callable — funkcja rysująca
+    - kwargs: dict — argumenty funkcji rysującej (dane i parametry wykresu)
+    """
+    digest = hashlib.sha256()
+    try:
+        sources = [Path(inspect.getsourcefile(func))]
+    except TypeError:
+        sources = []
+        digest.update(f'{func.__module__}.{func.__qualname__}'.encode())
+    # Ścieżki modułów pomocniczych obok render, bez ładowania ich
+    sources += [Path(__file__).with_name(f'{name}.py') for name in moduly_pomocnicze]
+    for source in sources:
+        with open(source, 'rb') as f:
+            digest.update(f.read())
+    digest.update(func.__qualname__.encode())
+    for library in biblioteki:
+        digest.update(f'{library}=={importlib.metadata.version(library)}'.encode())
+    _update_digest(digest, kwargs)
+    return digest.hexdigest()
+
+
+def load_manifest(plot_path):
+    manifest_path = Path(plot_path) / manifest_name
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(plot_path, manifest):
+    with open(Path(plot_path) / manifest_name, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def _init_worker():
+    # Procesy robocze rysują bez interfejsu graficznego
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render(func, kwargs, plot_path, formats):
+    # Rysuje wykresy zadania i zapisuje je we wskazanych formatach; zwraca nazwy wykresów
+    import matplotlib.pyplot as plt
+    stems = []
+    with pomiary.etap('rysowanie', funkcja=func.__name__):
+        figures = func(**kwargs)
+    for stem, fig in figures:
+        for fmt in formats:
+            with pomiary.etap(f'savefig {fmt}', wykres=stem):
+                fig.savefig(Path(plot_path) / f'{stem}.{fmt}')
+        plt.close(fig)
+        stems.append(stem)
+    return stems
+
+
+def render_jobs(jobs, plot_path, formats=formats_default, workers=1, force=False):
+    """
+    Rysuje zestaw wykresów z pominięciem tych, których dane i parametry się nie zmieniły.
+
+    Każde zadanie to krotka (nazwa, funkcja, kwargs). Funkcja rysująca zwraca listę
+    par (nazwa pliku bez rozszerzenia, figura). Zadanie jest pomijane, gdy jego hash
+    (kod modułów rysujących, dane, parametry) zgadza się z zapisanym w manifeście i istnieją
+    wszystkie pliki w żądanych formatach.
+
+    Parametry:
+    - jobs: list — zadania rysowania, zwykle jedno na kategorię
+    - plot_path: str | Path — folder docelowy wykresów
+    - formats: tuple — formaty zapisu (np. ('png',) pomija wolny eksport EPS)
+    - workers: int — liczba procesów (1 = w bieżącym procesie, 0 = liczba rdzeni CPU)
+    - force: bool — rysuj wszystko niezależnie od manifestu
+
+    Zwraca listę nazw zadań, które zostały narysowane.
+    """
+    plot_path = Path(plot_path)
+    os.makedirs(plot_path, exist_ok=True)
+    manifest = {} if force else load_manifest(plot_path)
+
+    pending = []
+    for name, func, kwargs in jobs:
+        key = figure_hash(func, kwargs)
+        entry = manifest.get(name)
+        if entry is not None and entry['hash'] == key and all(
+                (plot_path / f'{stem}.{fmt}').exists() for stem in entry['stems'] for fmt in formats):
+            print(f"Bez zmian, pominięto: {name}")
+            continue
+        pending.append((name, func, kwargs, key))
+
+    if not workers:
+        workers = os.cpu_count() or 1
+
+    if workers == 1 or len(pending) < 2:
+        outputs = []
+        for name, func, kwargs, key in pending:
+            try:
+                outputs.append(_render(func, kwargs, plot_path, formats))
+            except Exception as e:
+                outputs.append(e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            if pomiary.wlaczone():
+                # Pomiary procesów roboczych wracają razem z nazwami wykresów
+                futures = [executor.submit(pomiary.w_procesie, pomiary.pamiec_wlaczona(), _render,
+                                           func, kwargs, plot_path, formats)
+                           for name, func, kwargs, key in pending]
+            else:
+                futures = [executor.submit(_render, func, kwargs, plot_path, formats)
+                           for name, func, kwargs, key in pending]
+            outputs = []
+            for future in futures:
+                try:
+                    output = future.result()
+                    if pomiary.wlaczone():
+                        output, events = output
+                        pomiary.dolacz(events)
+                    outputs.append(output)
+                except Exception as e:
+                    outputs.append(e)
+
+    rendered = []
+    for (name, func, kwargs, key), output in zip(pending, outputs):
+        if isinstance(output, Exception):
+            print(f"Błąd rysowania {name}: {type(output).__name__}: {output}")
+            manifest.pop(name, None)
+            continue
+        manifest[name] = {'hash': key, 'stems': output}
+        rendered.append(name)
+        print(f"Narysowano: {name}")
+
+    save_manifest(plot_path, manifest)
+    return rendered
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_float_dtype, is_integer_dtype, is_numeric_dtype
+
+# Typy kolumn arkuszy eksperymentu: 'category' dla kolumn grupujących, 'integer' i 'float'
+# dla liczb (najmniejszy typ, który zachowuje wszystkie wartości bez straty). Numer uczestnika
+# jest unikalny w arkuszu, więc zostaje tekstem.
+SCHEMAT = {
+    'sex': 'category',
+    'Experience': 'category',
+    'TEST 0-10 points': 'integer',
+    'T task [s]': 'integer',
+    'AGE': 'integer',
+    'R jacket': 'float',
+    'TTFF': 'float',
+    'group': 'category',
+}
+
+# Kolumny tekstowe spoza schematu stają się kategoriami, gdy udział unikalnych wartości jest mniejszy
+max_unique_ratio = 0.5
+
+
+def _float_bez_straty(series):
+    # float32, jeśli każda wartość float64 wraca po konwersji bez zmiany; inaczej float64
+    values = series.to_numpy(dtype=np.float64)
+    compact = values.astype(np.float32)
+    if np.array_equal(compact.astype(np.float64), values, equal_nan=True):
+        return pd.Series(compact, index=series.index, name=series.name)
+    return series.astype(np.float64)
+
+
+def _liczba(series, kind):
+    numeric = pd.to_numeric(series, errors='coerce')
+    if kind == 'integer' and numeric.notna().all() and (numeric % 1 == 0).all():
+        return pd.to_numeric(numeric.astype(np.int64), downcast='integer')
+    return _float_bez_straty(numeric)
+
+
+def kompaktuj(df, schema=None):
+    """
+    Zamienia typy kolumn ramki na zwarte według schematu, bez utraty wartości.
+
+    Kolumny grupujące dostają typ category, liczby całkowite najmniejszy typ int
+    (pd.to_numeric(downcast='integer')), liczby rzeczywiste float32 tylko wtedy,
+    gdy wszystkie wartości mają w nim dokładną reprezentację (TTFF z sześcioma
+    miejscami po przecinku zostaje float64). Kolumny spoza schematu: tekst o małej
+    liczbie unikalnych wartości → category, liczby → bezstratnie zmniejszone.
+
+    Parametry:
+    - df: pd.DataFrame | pd.Series — dane
+    - schema: dict | None — nazwa kolumny → 'category' | 'integer' | 'float'; domyślnie SCHEMAT
+
+    Zwraca nową ramkę (lub serię); dane wejściowe nie są modyfikowane.
+    """
+    if schema is None:
+        schema = SCHEMAT
+    if isinstance(df, pd.Series):
+        return kompaktuj(df.to_frame(), schema).iloc[:, 0]
+
+    columns = {}
+    for name, series in df.items():
+        kind = schema.get(name)
+        if kind is None:
+            if is_integer_dtype(series.dtype):
+                kind = 'integer'
+            elif is_float_dtype(series.dtype):
+                kind = 'float'
+            elif not is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype) \
+                    and series.nunique() < max_unique_ratio * len(series):
+                kind = 'category'
+        if kind == 'category':
+            columns[name] = series.astype('category')
+        elif kind in ('integer', 'float'):
+            columns[name] = _liczba(series, kind)
+        else:
+            columns[name] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def pamiec(obj):
+    """
+    Pamięć zajmowana przez dane w bajtach (memory_usage(deep=True)); słowniki, listy
+    i krotki są sumowane rekurencyjnie.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(pamiec(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(pamiec(v) for v in obj)
+    return 0
+
+
+def raport_pamieci(etap, obj, log=None):
+    """
+    Wypisuje pamięć danych po etapie przetwarzania i dopisuje ją do log (jeśli podany).
+
+    Parametry:
+    - etap: str — nazwa etapu (np. 'wczytanie arkuszy')
+    - obj: dane etapu (ramka, seria, dict lub lista ramek)
+    - log: list | None — lista par (etap, bajty)
+    """
+    size = pamiec(obj)
+    print(f"Pamięć [{etap}]: {size / 2**20:.3f} MB")
+    if log is not None:
+        log.append((etap, size))
+    return size
@@ -0,0 +1,377 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+import pandas as pd
+import analize_data as ad
+import corelation_plots as cp
+import funct as f
+import general_plots as gp
+import klient
+import render
+import schemat
+import skaner
+import wyniki
+
+# Domyślny limit pamięci podręcznej usługi [MB]
+cache_mb_default = 512
+
+# Testy zapytania 'test': na danych każdego pliku folderu albo na grupach (plikach) folderu
+TESTY_PLIKU = ['statystyki_opisowe', 'test_normalnosci']
+TESTY_GRUP = ['levene', 'test_rownolicznosci', 'anova', 'kruskal']
+
+# Skrypty wykresów zapytania 'wykresy'
+SKRYPTY = {'general_plots': gp, 'corelation_plots': cp}
+
+# Stan usługi (ustawiany przez serwuj)
+_data_dir = Path('data_to_analysis')
+_podreczna = None
+
+
+def rozmiar(obj):
+    """
+    Przybliżona pamięć obiektu w bajtach: dane pandas i numpy jak schemat.pamiec,
+    teksty i kontenery przez sys.getsizeof (rekurencyjnie).
+    """
+    if isinstance(obj, (str, bytes)):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(rozmiar(k) + rozmiar(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(rozmiar(v) for v in obj)
+    return schemat.pamiec(obj) or sys.getsizeof(obj)
+
+
+class PamiecPodreczna:
+    """
+    Pamięć podręczna LRU z limitem pamięci: po przekroczeniu max_bytes usuwane są
+    najdawniej używane wpisy. Wpis większy niż limit nie jest zapamiętywany.
+
+    Klucze zawierają sygnaturę plików wejściowych (sygnatura()), więc zmiana danych
+    daje nowy klucz, a nieaktualne wpisy wypadają jako najdawniej używane.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._wpisy = OrderedDict()
+
+    def pobierz(self, key, compute):
+        """
+        Wartość dla klucza: z pamięci albo obliczona przez compute() i zapamiętana.
+
+        Zwraca (wartość, czy z pamięci).
+        """
+        if key in self._wpisy:
+            self._wpisy.move_to_end(key)
+            self.hits += 1
+            return self._wpisy[key][0], True
+        self.misses += 1
+        value = compute()
+        size = rozmiar(value)
+        if size <= self.max_bytes:
+            self._wpisy[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, old_size) = self._wpisy.popitem(last=False)
+                self.bytes -= old_size
+        return value, False
+
+    def stan(self):
+        return {'wpisy': len(self._wpisy), 'pamiec_mb': self.bytes / 2**20,
+                'limit_mb': self.max_bytes / 2**20, 'trafienia': self.hits, 'chybienia': self.misses}
+
+
+def sygnatura(folder, pattern='*.csv'):
+    # Nazwy, rozmiary i czasy modyfikacji plików folderu (bez czytania treści)
+    return tuple((p.name, p.stat().st_size, p.stat().st_mtime_ns) for p in sorted(Path(folder).glob(pattern)))
+
+
+def _folder(name):
+    # Folder *_base / *_TTFF bezpośrednio w drzewie danych usługi (bez ścieżek i '..')
+    folder = _data_dir / str(name)
+    if not (folder.parent == _data_dir and folder.name == name and folder.is_dir()
+            and skaner.FOLDER_RE.match(folder.name)):
+        raise ValueError(f"Nieznany folder: {name}")
+    return folder
+
+
+def _elementy(folder, signature):
+    # Elementy folderu (read_csv_items) w pamięci podręcznej
+    check = ad.base_column if folder.name.endswith('_base') else ad.ttff_columns
+    return _podreczna.pobierz(('elementy', str(folder), signature), lambda: ad.read_csv_items(folder, check))[0]
+
+
+def _tekst(results):
+    # Treść results.txt dla listy linii wyników (jak analize_data.zapisz_wyniki)
+    return None if results is None else ''.join(line + '\n' for line in results)
+
+
+def analiza_folderu(name, options=None, write=False):
+    """
+    Analiza jednego folderu (jak analize_data.py), wyniki z pamięci podręcznej dla
+    niezmienionych plików i tych samych opcji.
+
+    Zwraca dict: folder, wyniki (linie), tekst (treść results.txt), rekordy, z_pamieci.
+    """
+    folder = _folder(name)
+    signature = sygnatura(folder)
+    analyze = ad.analyze_base_folder if folder.name.endswith('_base') else ad.analyze_ttff_folder
+
+    def oblicz():
+        records = []
+        results = analyze(folder, write=False, records=records, options=options,
+                          items=_elementy(folder, signature))
+        return results, records
+
+    key = ('analiza', str(folder), signature, json.dumps(options, sort_keys=True))
+    (results, records), cached = _podreczna.pobierz(key, oblicz)
+    if write and results is not None:
+        ad.zapisz_wyniki(results, folder / "results.txt")
+    return {'folder': folder.name, 'wyniki': results, 'tekst': _tekst(results), 'rekordy': records,
+            'z_pamieci': cached}
+
+
+def analiza(dane):
+    """
+    Zapytanie 'analiza': {'folder': nazwa folderu (domyślnie wszystkie), 'opcje': opcje
+    analize_data.main, 'zapisz': zapis results.txt}. Bez folderu zwraca {'foldery': [...]}
+    w kolejności analize_data.py.
+    """
+    options, write = dane.get('opcje'), dane.get('zapisz', False)
+    if dane.get('folder') is not None:
+        return analiza_folderu(dane['folder'], options, write)
+    folders = [folder for pair in ad.find_folder_pairs(_data_dir) for folder in pair if folder is not None]
+    return {'foldery': [analiza_folderu(folder.name, options, write) for folder in folders]}
+
+
+def _grupy(folder, signature):
+    # Dane liczbowe plików folderu po odrzuceniu braków, jak w analyze_base_data / analyze_ttff_data
+    groups = []
+    for name, data in _elementy(folder, signature):
+        if isinstance(data, str):
+            continue
+        if isinstance(data, pd.DataFrame):
+            data = data.assign(TTFF=pd.to_numeric(data['TTFF'], errors='coerce'))
+            data = data.dropna(subset=['TTFF', 'group'])['TTFF']
+        else:
+            data = pd.to_numeric(data, errors='coerce').dropna()
+        if not data.empty:
+            groups.append((name, data))
+    return groups
+
+
+def test(dane):
+    """
+    Zapytanie 'test': {'folder', 'test': jeden z TESTY_PLIKU lub TESTY_GRUP, 'plik': tylko ten
+    plik (testy pliku), 'opcje': jak w analizie}. Zwraca linie wyników, tekst i rekordy.
+    """
+    folder = _folder(dane['folder'])
+    name, options = dane['test'], dane.get('opcje') or {}
+    if name not in TESTY_PLIKU + TESTY_GRUP:
+        raise ValueError(f"Nieznany test: {name}")
+    signature = sygnatura(folder)
+
+    def oblicz():
+        # Rekordy z kontekstem folderu (i pliku), jak w analize_data
+        results, records = [], []
+        groups = _grupy(folder, signature)
+        if name in TESTY_PLIKU:
+            for file_name, data in groups:
+                if dane.get('plik') not in (None, file_name):
+                    continue
+                results.append(f"Plik: {file_name} w folderze {folder}")
+                file_records = []
+                if name == 'statystyki_opisowe':
+                    results = f.statystyki_opisowe(data, results, file_records, ad.bootstrap_options(options))
+                else:
+                    results, _ = f.test_normalnosci(data, results, records=file_records,
+                                                    backend=options.get("normality", "auto"),
+                                                    seed=options.get("seed"))
+                ad.add_records(records, file_records, folder=folder.name, plik=file_name)
+            return results, records
+        data = [data for _, data in groups]
+        group_records = []
+        if name == 'levene':
+            stat_lev, p_lev = f.agregaty.levene(data)
+            record = wyniki.rekord('levene', stat_lev, p_lev, n=[len(g) for g in data],
+                                   decyzja='równe wariancje' if p_lev > 0.05 else 'różne wariancje')
+            group_records.append(record)
+            results.extend(ad.opisz_levene(record))
+        elif name == 'test_rownolicznosci':
+            results = f.test_rownolicznosci(data, results, group_records)
+        else:
+            results = f.anova(data, results, name == 'anova', dane.get('rowne_wariancje', True), group_records,
+                              ad.permutation_options(options), ad.posthoc_options(options))
+        ad.add_records(records, group_records, folder=folder.name)
+        return results, records
+
+    key = ('test', str(folder), signature, name, dane.get('plik'), dane.get('rowne_wariancje', True),
+           json.dumps(options, sort_keys=True))
+    (results, records), cached = _podreczna.pobierz(key, oblicz)
+    return {'folder': folder.name, 'test': name, 'wyniki': results, 'tekst': _tekst(results),
+            'rekordy': records, 'z_pamieci': cached}
+
+
+def _arkusze():
+    # Arkusze eksportu (gp.data_path) wczytane raz dla obu skryptów wykresów
+    names = [pre + suf for pre in gp.prefixes for suf in gp.suffixes]
+
+    def wczytaj():
+        return {name: f.wczytaj_arkusz(Path(gp.data_path) / (name + gp.file_format)) for name in names}
+    return _podreczna.pobierz(('arkusze', sygnatura(gp.data_path, '*.*')), wczytaj)
+
+
+def wykresy(dane):
+    """
+    Zapytanie 'wykresy': {'skrypt': 'general_plots' | 'corelation_plots', 'formaty',
+    'wymus', 'podsumowania', 'eksport'} — jak main skryptu, ale z arkuszami z pamięci
+    podręcznej. Niezmienione wykresy są pomijane (manifest render.py).
+
+    Zwraca folder wykresów i pliki zapisane przez to zapytanie.
+    """
+    module = SKRYPTY.get(dane.get('skrypt', 'general_plots'))
+    if module is None:
+        raise ValueError(f"Nieznany skrypt: {dane['skrypt']}")
+    sheets, cached = _arkusze()
+    start = time.time_ns()
+    module.main(sheets=sheets, export=dane.get('eksport', False),
+                formats=tuple(dane.get('formaty', render.formats_default)), force=dane.get('wymus', False),
+                summary=dane.get('podsumowania', False))
+    written = sorted(p.name for p in module.plot_path.iterdir()
+                     if not p.name.startswith('.') and p.stat().st_mtime_ns >= start)
+    return {'folder': str(module.plot_path), 'zapisane': written, 'z_pamieci': cached}
+
+
+def rozgrzej():
+    """
+    Ładuje biblioteki (scipy.stats, seaborn, matplotlib) i wczytuje pliki wszystkich
+    folderów drzewa oraz arkusze eksportu do pamięci podręcznej.
+    """
+    for module in (f.stats, f.sns, gp.plt, f.agregaty, f.normalnosc, f.posthoc):
+        module.__name__
+    for pair in ad.find_folder_pairs(_data_dir):
+        for folder in pair:
+            if folder is not None:
+                _elementy(folder, sygnatura(folder))
+    if Path(gp.data_path).is_dir():
+        try:
+            _arkusze()
+        except FileNotFoundError as e:
+            print(f"Arkusze niewczytane: {e}")
+
+
+def stan(dane):
+    return dict(_podreczna.stan(), data_dir=str(_data_dir))
+
+
+# Obsługa zapytań: ścieżka URL → funkcja(parametry) zwracająca dict JSON
+OBSLUGA = {'/analiza': analiza, '/test': test, '/wykresy': wykresy, '/stan': stan}
+
+
+class _Zapytanie(BaseHTTPRequestHandler):
+
+    def _odpowiedz(self, status, answer):
+        body = json.dumps(answer, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        start = time.perf_counter()
+        length = int(self.headers.get('Content-Length') or 0)
+        # Tylko JSON (jak wysyła klient.zapytaj): strona WWW w przeglądarce może wysłać bez
+        # zapytania wstępnego CORS jedynie text/plain, formularz lub multipart
+        if self.headers.get_content_type() != 'application/json':
+            self._odpowiedz(415, {'blad': "Wymagany nagłówek Content-Type: application/json"})
+            return
+        if self.path == '/zamknij':
+            self._odpowiedz(200, {'zamknieto': True})
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        handler = OBSLUGA.get(self.path)
+        if handler is None:
+            self._odpowiedz(404, {'blad': f"Nieznane zapytanie: {self.path}"})
+            return
+        try:
+            dane = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(dane, dict):
+                raise ValueError("Treść zapytania musi być obiektem JSON")
+            answer = handler(dane)
+        except (KeyError, ValueError) as e:
+            self._odpowiedz(400, {'blad': f"{type(e).__name__}: {e}"})
+            return
+        except Exception as e:
+            self._odpowiedz(500, {'blad': f"{type(e).__name__}: {e}"})
+            return
+        self._odpowiedz(200, answer)
+        print(f"{self.path}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def do_GET(self):
+        # Zapytania mogą zapisywać pliki lub zamknąć usługę, więc tylko POST
+        self.send_response(405)
+        self.send_header('Allow', 'POST')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # Czas zapytania jest wypisywany w do_POST; bez domyślnego logu każdego połączenia
+        pass
+
+
+def serwuj(data_dir="data_to_analysis", host=klient.host_default, port=klient.port_default,
+           cache_mb=cache_mb_default, warm=True):
+    """
+    Uruchamia lokalną usługę analizy (HTTP, JSON), działającą do zapytania 'zamknij'.
+
+    Usługa trzyma załadowane biblioteki i wczytane dane w pamięci podręcznej LRU
+    (PamiecPodreczna), więc kolejne zapytania o niezmienione dane nie czytają plików
+    ani nie liczą testów ponownie. Zapytania są obsługiwane po kolei (jeden wątek).
+
+    Parametry:
+    - data_dir: str | Path — katalog z folderami *_base / *_TTFF
+    - host, port — adres usługi (domyślnie tylko komputer lokalny)
+    - cache_mb: float — limit pamięci podręcznej [MB]
+    - warm: bool — wczytaj biblioteki i dane przy starcie (rozgrzej)
+    """
+    global _data_dir, _podreczna
+    _data_dir = Path(data_dir)
+    _podreczna = PamiecPodreczna(int(cache_mb * 2**20))
+    if warm:
+        start = time.perf_counter()
+        rozgrzej()
+        print(f"Rozgrzano w {time.perf_counter() - start:.2f} s: {_podreczna.stan()}")
+    server = HTTPServer((host, port), _Zapytanie)
+    print(f"Usługa analizy: http://{host}:{port} (dane: {_data_dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Lokalna usługa analizy z danymi i bibliotekami w pamięci.")
+    parser.add_argument("--data-dir", default="data_to_analysis",
+                        help="katalog główny z folderami *_base i *_TTFF")
+    parser.add_argument("--host", default=klient.host_default, help="adres nasłuchu")
+    parser.add_argument("--port", type=int, default=klient.port_default, help="port usługi")
+    parser.add_argument("--cache-mb", type=float, default=cache_mb_default,
+                        help="limit pamięci podręcznej [MB]")
+    parser.add_argument("--no-warm", action="store_true",
+                        help="nie wczytuj bibliotek i danych przy starcie")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    serwuj(args.data_dir, args.host, args.port, args.cache_mb, not args.no_warm)
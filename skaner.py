@@ -0,0 +1,136 @@
+import csv
+import os
+import re
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import eksport_data as ek
+
+# Kolor gogli z prefiksu pliku folderu *_base
+GOGLE = {'T_': 'transparentne', 'R_': 'czerwone', 'Y_': 'żółte'}
+
+# Kolumny partycji tabeli skanera (przechowywane jako pd.Categorical)
+PARTYCJE = ['kategoria', 'rodzaj', 'plik', 'grupa', 'gogle']
+
+# Kolumny plików czytane jako tekst: numer uczestnika i poziom zmiennej grupującej w *_TTFF
+TEKST = {'TTFF': (1, 3)}
+
+# Folder danych: kategoria i rodzaj (base / TTFF) z nazwy
+FOLDER_RE = re.compile(r'^(?P<kategoria>.+)_(?P<rodzaj>base|TTFF)$')
+
+
+def wczytaj_csv(path, tekst=()):
+    """
+    Jeden plik CSV z nagłówkiem zapisanym przez to_csv: ramka albo komunikat błędu
+    (wspólne dla skanera i analize_data.read_csv_items).
+
+    Plik jest parsowany przez pyarrow.csv (wielowątkowo, z typami kolumn wykrytymi
+    przez Arrow), więc kolumny liczbowe przychodzą od razu jako int64 / float64;
+    bez pyarrow te same ustawienia dostaje pd.read_csv.
+    Kolumny są nazwane jak w nagłówku pliku, ale odwołania do nich są pozycyjne.
+
+    Parametry:
+    - path: Path — plik CSV
+    - tekst: iterable — numery kolumn czytanych zawsze jako tekst (np. numer uczestnika
+      i poziom zmiennej grupującej, żeby '01' nie stało się liczbą 1)
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:  # pyarrow jest opcjonalny (jak cache Parquet / Feather)
+        pacsv = None
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), None)
+        if not header:
+            return f"Plik {path.name} jest pusty lub nie zawiera danych."
+        # Nazwy pozycyjne: nagłówek może zawierać puste lub powtórzone nazwy
+        names = [str(i) for i in range(len(header))]
+        tekst = [str(i) for i in tekst if i < len(names)]
+        if pacsv is None:
+            df = pd.read_csv(path, header=None, skiprows=1, names=names,
+                             dtype={name: str for name in tekst},
+                             na_values=sorted(ek.BRAKI), keep_default_na=False)
+        else:
+            df = pacsv.read_csv(
+                path,
+                read_options=pacsv.ReadOptions(column_names=names, skip_rows=1),
+                # Braki jak w pd.read_csv, także w kolumnach tekstowych
+                convert_options=pacsv.ConvertOptions(
+                    column_types={name: pa.string() for name in tekst},
+                    null_values=sorted(ek.BRAKI), strings_can_be_null=True),
+            ).to_pandas()
+    except Exception as e:
+        return f"Nie można wczytać pliku {path.name}: {e}"
+    if df.empty:
+        return f"Plik {path.name} jest pusty lub nie zawiera danych."
+    df.columns = header
+    return df
+
+
+def _ramka_pliku(df, folder, path):
+    """
+    Wiersze jednego pliku w układzie tabeli skanera.
+
+    Kolumny pozycyjnie jak w analize_data: 0 — indeks wiersza, w *_base 1 — wartość,
+    w *_TTFF 1 — numer uczestnika, 2 — wartość (TTFF), 3 — poziom zmiennej grupującej.
+    """
+    match = FOLDER_RE.match(folder.name)
+    n = len(df)
+    column = lambda i: df.iloc[:, i] if df.shape[1] > i else pd.Series(np.nan, index=df.index)
+    ttff = match['rodzaj'] == 'TTFF'
+    prefix = path.name[:2]
+    return pd.DataFrame({
+        'kategoria': match['kategoria'],
+        'rodzaj': match['rodzaj'],
+        'plik': path.name,
+        # Grupa porównania: plik (TTFF, np. '18 - 29 [y]') albo prefiks koloru gogli (base)
+        'grupa': path.stem if ttff else prefix,
+        'gogle': None if ttff else GOGLE.get(prefix),
+        'uczestnik': column(1).astype('string') if ttff else pd.NA,
+        'wiersz': pd.to_numeric(column(0), errors='coerce'),
+        'wartosc': pd.to_numeric(column(2 if ttff else 1), errors='coerce'),
+        'poziom': column(3).astype('string') if ttff else pd.NA,
+    }, index=pd.RangeIndex(n))
+
+
+def skanuj(data_dir="data_to_analysis", workers=8):
+    """
+    Wczytuje całe drzewo data_to_analysis jednym wielowątkowym przebiegiem do jednej tabeli.
+
+    Parametry:
+    - data_dir: str | Path — katalog z folderami <kategoria>_base / <kategoria>_TTFF
+    - workers: int — liczba wątków czytających pliki (0 = liczba rdzeni CPU)
+
+    Zwraca:
+    - table: pd.DataFrame — wiersz na obserwację; partycje PARTYCJE jako kategorie,
+      uczestnik i poziom jako tekst, wiersz (kolumna 0 pliku) i wartosc jako float64
+    - files: pd.DataFrame — wiersz na plik (folder, plik, kolumny, blad) w kolejności
+      odczytu folderu, także pliki z błędem
+    """
+    data_dir = Path(data_dir)
+    paths = []
+    for folder in sorted(data_dir.iterdir()):
+        if folder.is_dir() and FOLDER_RE.match(folder.name):
+            # Kolejność plików jak w read_csv_items (po nazwie)
+            paths.extend((folder, path) for path in sorted(folder.glob("*.csv")))
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        frames = list(executor.map(
+            lambda item: wczytaj_csv(item[1], TEKST.get(FOLDER_RE.match(item[0].name)['rodzaj'], ())), paths))
+
+    parts, files = [], []
+    for (folder, path), df in zip(paths, frames):
+        error = df if isinstance(df, str) else None
+        files.append({'folder': folder.name, 'plik': path.name,
+                      'kolumny': None if error else df.shape[1], 'blad': error})
+        if error is None:
+            parts.append(_ramka_pliku(df, folder, path))
+
+    columns = PARTYCJE + ['uczestnik', 'wiersz', 'wartosc', 'poziom']
+    table = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+    table = table.astype({name: 'category' for name in PARTYCJE})
+    table = table.astype({'uczestnik': 'string', 'poziom': 'string',
+                          'wiersz': 'float64', 'wartosc': 'float64'})
+    return table[columns], pd.DataFrame(files, columns=['folder', 'plik', 'kolumny', 'blad'])
@@ -0,0 +1,164 @@
+import argparse
+import numpy as np
+import pandas as pd
+import agregaty
+import funct as fun
+
+
+class SzkicKLL:
+    """
+    Szkic kwantyli KLL (Karnin, Lang, Liberty) o stałym rozmiarze, łączony funkcją merge.
+
+    Dopóki liczba wartości nie przekroczy k, szkic przechowuje wszystkie wartości i kwantyle
+    są dokładne (interpolacja liniowa jak w pandas). Powyżej k błąd normalizowanej rangi
+    jest rzędu O(1/k): dla k = 200 ok. 1.65%, dla k = 2000 ok. 0.17% (z prawdopodobieństwem
+    99%). Pamięć: O(k) wartości niezależnie od liczby danych.
+    """
+
+    def __init__(self, k=2000, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        # Pojemności maleją geometrycznie (2/3) od najwyższego poziomu w dół
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                buffer = np.sort(self.levels[level])
+                keep = buffer[len(buffer) - len(buffer) % 2:]
+                # Co druga wartość (losowe przesunięcie) przechodzi poziom wyżej z podwójną wagą
+                promoted = buffer[self.rng.integers(2):len(buffer) - len(keep):2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = keep
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        # Kwantyl z wartości ważonych 2^poziom; przy wagach 1 równy interpolacji pandas
+        items = np.concatenate(self.levels)
+        if not len(items):
+            return np.nan
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, weights = items[order], weights[order]
+        ranks = np.cumsum(weights) - weights + (weights - 1) / 2
+        total = weights.sum()
+        return float(np.interp(q * (total - 1), ranks, items))
+
+
+def opisowe_strumieniowo(chunks, k=2000, seed=None):
+    """
+    Statystyki opisowe grup liczone fragmentami przy stałym zużyciu pamięci.
+
+    Średnia i wariancja są łączone wzorem Welforda/Chana (agregaty.polacz), min i max
+    dokładnie, a mediana i kwartyle ze szkicu KLL każdej grupy (patrz SzkicKLL).
+
+    Parametry:
+    - chunks: iterable — krotki (values, groups) kolejnych fragmentów danych
+    - k: int — dokładność szkicu kwantyli
+    - seed: int | None — ziarno losowania szkicu
+
+    Zwraca:
+    - pd.DataFrame jak funct.statystyki_opisowe_grup (n, mean, std, median, min, max, q1, q3)
+    """
+    moments = agregaty.polacz()
+    sketches, minima, maxima = {}, {}, {}
+    for values, groups in chunks:
+        values = pd.to_numeric(pd.Series(np.asarray(values)), errors='coerce').to_numpy(dtype=np.float64)
+        groups = pd.Series(np.asarray(groups))
+        mask = ~np.isnan(values) & groups.notna().to_numpy()
+        values, groups = values[mask], groups[mask]
+        if not len(values):
+            continue
+        moments = agregaty.polacz(moments, agregaty.statystyki_grup(values, groups))
+        for group, part in pd.Series(values, index=groups.to_numpy()).groupby(level=0):
+            part = part.to_numpy()
+            sketches.setdefault(group, SzkicKLL(k, seed)).update(part)
+            minima[group] = min(minima.get(group, np.inf), part.min())
+            maxima[group] = max(maxima.get(group, -np.inf), part.max())
+
+    labels = list(moments.index)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(moments['m2'] / (moments['n'] - 1)).where(moments['n'] > 1)
+    return pd.DataFrame({
+        'n': moments['n'].astype(np.int64),
+        'mean': moments['mean'],
+        'std': std,
+        'median': [sketches[g].quantile(0.5) for g in labels],
+        'min': [minima[g] for g in labels],
+        'max': [maxima[g] for g in labels],
+        'q1': [sketches[g].quantile(0.25) for g in labels],
+        'q3': [sketches[g].quantile(0.75) for g in labels],
+    }, index=pd.Index(labels, name='group'))
+
+
+def fragmenty_csv(path, value_col, group_col=None, chunksize=1_000_000, **read_csv_kwargs):
+    """
+    Generator fragmentów (values, groups) pliku CSV czytanego po chunksize wierszy.
+
+    Parametry:
+    - path: str | Path — plik CSV
+    - value_col: int | str — kolumna z wartościami (numer przy header=None)
+    - group_col: int | str | None — kolumna grupująca; None = jedna grupa 0
+    - chunksize: int — liczba wierszy fragmentu
+    """
+    for chunk in pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs):
+        groups = chunk[group_col] if group_col is not None else np.zeros(len(chunk), dtype=np.int64)
+        yield chunk[value_col], groups
+
+
+def statystyki_opisowe_pliku(path, results, value_col=0, chunksize=1_000_000, k=2000, **read_csv_kwargs):
+    """
+    Odpowiednik funct.statystyki_opisowe dla pliku CSV czytanego fragmentami.
+
+    Linie raportu są takie same jak w funct.statystyki_opisowe; dla plików o nie więcej
+    niż k wartościach także liczby są identyczne.
+    """
+    table = opisowe_strumieniowo(fragmenty_csv(path, value_col, None, chunksize, **read_csv_kwargs), k)
+    row = table.iloc[0] if len(table) else pd.Series(np.nan, index=table.columns)
+    return fun.opisz_statystyki(row, results)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Statystyki opisowe dużych plików CSV liczone fragmentami.")
+    parser.add_argument("path", help="plik CSV")
+    parser.add_argument("--column", type=int, default=1,
+                        help="numer kolumny z danymi (domyślnie 1: wartości pliku zapisanego z indeksem, "
+                             "jak w analize_data.base_column)")
+    parser.add_argument("--no-header", action="store_true",
+                        help="pierwszy wiersz pliku to dane, nie nagłówek")
+    parser.add_argument("--chunksize", type=int, default=1_000_000, help="liczba wierszy fragmentu")
+    parser.add_argument("-k", type=int, default=2000, help="dokładność szkicu kwantyli")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # Nagłówek zapisany przez to_csv jest pomijany, kolumny liczone pozycyjnie
+    for line in statystyki_opisowe_pliku(args.path, [], args.column, args.chunksize, args.k, header=None,
+                                         skiprows=0 if args.no_header else 1):
+        print(line)
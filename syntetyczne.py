@@ -0,0 +1,108 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Prefiksy gogli i kategorie arkuszy jak w eksporcie z pliku .ods (general_plots / corelation_plots)
+prefixes = ['T_', 'R_', 'Y_']
+suffixes = ['SEX', 'EXPERIENCE', 'H&STEST_RESULTS', 'TIME', 'AGE', 'TTFF']
+col_names = ['sex', 'Experience', 'TEST 0-10 points', 'T task [s]', 'AGE', 'R jacket']
+id_column = 'participant nr'
+
+# Dodatkowa kategoria o zadanej liczbie poziomów (folder GRUPA_base / GRUPA_TTFF)
+grupa_name = 'GRUPA'
+
+# Przesunięcie gogli w TTFF [s]: różnice między grupami jak w danych z badania
+przesuniecie = {'T_': 0.0, 'R_': -0.05, 'Y_': 0.05}
+
+
+def uczestnicy(n, levels=3, seed=None):
+    """
+    Syntetyczna ramka uczestników: jeden wiersz na uczestnika, kolumny arkuszy badania.
+
+    TTFF ('R jacket') ma rozkład prawostronnie skośny (log-normalny wokół 83.5 s,
+    zaokrąglony do 6 miejsc jak w eksporcie). Kolumna 'grupa' ma levels poziomów
+    o nierównych licznościach (wagi z rozkładu Dirichleta).
+
+    Parametry:
+    - n: int — liczba uczestników (10² … 10⁷)
+    - levels: int — liczba poziomów kolumny 'grupa' (3 … setki)
+    - seed: int | None — ziarno generatora
+
+    Zwraca:
+    - pd.DataFrame z kolumnami 'participant nr', 'gogle' (prefiks), col_names i 'grupa'
+    """
+    rng = np.random.default_rng(seed)
+    gogle = np.asarray(prefixes)[rng.integers(0, len(prefixes), n)]
+    shift = pd.Series(przesuniecie)[gogle].to_numpy()
+    weights = rng.dirichlet(np.full(levels, 2.0))
+    return pd.DataFrame({
+        id_column: np.char.add('P', np.char.zfill(np.arange(n).astype(str), max(3, len(str(n - 1))))),
+        'gogle': gogle,
+        'sex': rng.choice(['M', 'F', 'O'], n, p=[0.6, 0.38, 0.02]),
+        'Experience': rng.choice(['0-1', '2-5', '6-10', '>10'], n, p=[0.2, 0.35, 0.25, 0.2]),
+        'TEST 0-10 points': rng.binomial(10, 0.7, n),
+        'T task [s]': rng.integers(60, 600, n),
+        'AGE': rng.integers(18, 66, n),
+        'R jacket': np.round(83.45 + shift + rng.lognormal(-3.0, 0.8, n), 6),
+        'grupa': np.char.add('G', np.char.zfill(rng.choice(levels, n, p=weights).astype(str),
+                                                len(str(levels - 1)))),
+    })
+
+
+def zapisz_arkusze(frame, folder='eksport_csv'):
+    """
+    Zapisuje arkusze w układzie eksport_data.py: plik <prefiks><kategoria>.csv na arkusz,
+    pierwszy wiersz z nazwą arkusza, drugi z nagłówkami ('participant nr', kolumna kategorii).
+    """
+    folder = Path(folder)
+    os.makedirs(folder, exist_ok=True)
+    for pre, part in frame.groupby('gogle', sort=False):
+        for suf, col in zip(suffixes, col_names):
+            path = folder / f'{pre}{suf}.csv'
+            with open(path, 'w', encoding='utf-8', newline='') as handle:
+                handle.write(f'{pre}{suf},\n')
+                part[[id_column, col]].to_csv(handle, index=False)
+
+
+def zapisz_drzewo(frame, data_dir='data_to_analysis'):
+    """
+    Zapisuje drzewo danych do analizy w układzie general_plots / corelation_plots:
+    <kategoria>_base/<prefiks>.csv (wartości kategorii dla gogli) i <kategoria>_TTFF/<poziom>.csv
+    (participant nr, R jacket, kolumna kategorii) — także dla kategorii GRUPA z kolumny 'grupa'.
+    """
+    data_dir = Path(data_dir)
+    categories = list(zip(suffixes, col_names)) + [(grupa_name, 'grupa')]
+    by_goggles = dict(list(frame.groupby('gogle', sort=False)))
+    for category, col in categories:
+        base = data_dir / f'{category}_base'
+        os.makedirs(base, exist_ok=True)
+        for pre in prefixes:
+            if pre in by_goggles:
+                by_goggles[pre][col].reset_index(drop=True).to_csv(base / f'{pre}.csv')
+        if category == 'TTFF':
+            continue
+        ttff = data_dir / f'{category}_TTFF'
+        os.makedirs(ttff, exist_ok=True)
+        for level, part in frame.groupby(col, sort=True):
+            part[[id_column, 'R jacket', col]].reset_index(drop=True).to_csv(ttff / f'{level}.csv')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generator syntetycznych danych badania.")
+    parser.add_argument("-n", "--participants", type=int, default=1000, help="liczba uczestników")
+    parser.add_argument("--levels", type=int, default=3, help="liczba poziomów kategorii GRUPA")
+    parser.add_argument("--seed", type=int, default=0, help="ziarno generatora")
+    parser.add_argument("--sheets", default=None, help="folder arkuszy (układ eksport_csv)")
+    parser.add_argument("--data-dir", default=None, help="folder drzewa danych (układ data_to_analysis)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    frame = uczestnicy(args.participants, args.levels, args.seed)
+    if args.sheets:
+        zapisz_arkusze(frame, args.sheets)
+    if args.data_dir:
+        zapisz_drzewo(frame, args.data_dir)
@@ -0,0 +1,218 @@
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import stats
+import bootstrap
+import normalnosc
+import skaner
+import wyniki
+
+# Kolumny tabeli wyników trybu szerokiego: pola rekordów, nazwa metryki i statystyki opisowe
+KOLUMNY = wyniki.POLA + ['metryka', 'mean', 'std', 'median', 'min', 'max', 'q1', 'q3']
+
+# Plik z tabelą wyników trybu szerokiego całego drzewa danych
+output_name = 'results_wide.csv'
+
+
+def wczytaj_szeroko(folder, columns=None, group_col=3):
+    """
+    Wczytuje pliki CSV folderu *_TTFF jeden raz do ramki długiej ze wszystkimi metrykami.
+
+    Parametry:
+    - folder: str | Path — folder z plikami CSV (jeden plik = jedna grupa porównania)
+    - columns: list | None — nazwy kolumn metryk; domyślnie wszystkie kolumny liczbowe
+      poza pierwszą (indeks), drugą (numer uczestnika, jak skaner.TEKST) i kolumną grupującą
+    - group_col: int — numer kolumny zmiennej grupującej (jak w analyze_ttff_folder)
+
+    Zwraca:
+    - frame: pd.DataFrame z kolumną 'plik' i kolumnami metryk (wiersze bez grupy pominięte)
+    - metrics: list — nazwy analizowanych metryk
+    - errors: list — komunikaty o plikach, których nie udało się wczytać
+    """
+    frames, errors = [], []
+    metrics = None
+    # Kolejność plików jak w analyze_ttff_folder (decyzja o normalności z ostatniego pliku)
+    for file_path in sorted(Path(folder).glob("*.csv")):
+        # Wspólny odczyt CSV (braki jak w analize_data); numer uczestnika i grupa jako tekst
+        df = skaner.wczytaj_csv(file_path, {1, group_col})
+        if isinstance(df, str):
+            errors.append(df)
+            continue
+        if df.shape[1] <= group_col:
+            errors.append(f"Plik {file_path.name}: zbyt mało kolumn (wymagane min. {group_col + 1}).")
+            continue
+        # Kolumny podane jawnie mogą obejmować numer uczestnika; domyślne kandydatki nie
+        skipped = {0, group_col} if columns is not None else {0, 1, group_col}
+        numeric = df.iloc[:, [i for i in range(df.shape[1]) if i not in skipped]]
+        numeric = numeric.apply(pd.to_numeric, errors='coerce')
+        selected = list(columns) if columns is not None else [c for c in numeric.columns if numeric[c].notna().any()]
+        metrics = selected if metrics is None else [m for m in metrics if m in selected]
+        part = numeric.reindex(columns=selected)[df.iloc[:, group_col].notna()]
+        frames.append(part.assign(plik=file_path.name))
+    if not frames:
+        return pd.DataFrame(columns=['plik']), [], errors
+    frame = pd.concat(frames, ignore_index=True)
+    return frame[['plik'] + metrics], metrics, errors
+
+
+def _anova_kolumn(values, files):
+    # F i p jednoczynnikowej ANOVA dla każdej kolumny (grupy = pliki, NaN pomijane w kolumnie)
+    grouped = values.groupby(files, sort=False)
+    n, mean = grouped.count(), grouped.mean()
+    m2 = ((values - mean.reindex(files).to_numpy()) ** 2).groupby(files, sort=False).sum()
+    total = n.sum()
+    k = (n > 0).sum()
+    grand_mean = (n * mean).sum() / total
+    ss_between = (n * (mean - grand_mean) ** 2).sum()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        f_val = (ss_between / (k - 1)) / (m2.sum() / (total - k))
+    return f_val, pd.Series(stats.f.sf(f_val, k - 1, total - k), index=f_val.index)
+
+
+def _levene_kolumn(values, files):
+    # Levene / Brown-Forsythe (środek = mediana grupy, jak scipy.stats.levene) dla każdej kolumny
+    median = values.groupby(files, sort=False).median()
+    z = (values - median.reindex(files).to_numpy()).abs()
+    return _anova_kolumn(z, files)
+
+
+def _kruskal_kolumn(values, files):
+    # H i p Kruskala-Wallisa dla każdej kolumny z poprawką na wiązania
+    ranks = values.rank()
+    grouped = ranks.groupby(files, sort=False)
+    n = grouped.count()
+    total = n.sum()
+    k = (n > 0).sum()
+    h = 12 / (total * (total + 1)) * (grouped.sum() ** 2 / n).sum() - 3 * (total + 1)
+    ties = pd.Series(bootstrap.poprawka_wiazan(values.to_numpy(dtype=np.float64).T), index=values.columns)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        h = h / (1 - ties / (total ** 3 - total))
+    return h, pd.Series(stats.chi2.sf(h, k - 1), index=h.index)
+
+
+def bateria(frame, metrics, folder=None, backend='auto', seed=None):
+    """
+    Pełny zestaw testów (statystyki opisowe, normalność, Levene, równoliczność chi²,
+    ANOVA lub Kruskal-Wallis) dla wszystkich metryk naraz.
+
+    Statystyki opisowe i testy porównawcze liczone są dla wszystkich kolumn jednocześnie
+    (agregacje groupby po plikach), testy normalności jednym wywołaniem normalnosc.testuj.
+    Reguły decyzji są takie jak w analize_data: normalność z ostatniego pliku, równe
+    wariancje przy p Levene'a > 0.05, ANOVA tylko przy obu spełnionych założeniach.
+    Transformacje i testy post hoc są pomijane.
+
+    Parametry:
+    - frame: pd.DataFrame — wynik wczytaj_szeroko (kolumna 'plik' i metryki)
+    - metrics: list — nazwy metryk
+    - folder: str | None — nazwa folderu do rekordów
+    - backend: str — test normalności (normalnosc.BACKENDY lub 'auto')
+    - seed: int | None — ziarno podpróby warstwowej (normalnosc.testuj)
+
+    Zwraca:
+    - list — rekordy wyników (wyniki.rekord) z polami folder, plik i metryka
+    """
+    records = []
+    if frame.empty or not metrics:
+        return records
+    values, files = frame[metrics], frame['plik']
+    order = list(pd.unique(files))
+
+    # Statystyki opisowe: jedna agregacja dla wszystkich plików i metryk
+    grouped = values.groupby(files, sort=False)
+    table = pd.concat({'n': grouped.count(), 'mean': grouped.mean(), 'std': grouped.std(),
+                       'median': grouped.median(), 'min': grouped.min(), 'max': grouped.max(),
+                       'q1': grouped.quantile(0.25), 'q3': grouped.quantile(0.75)}, axis=1)
+    for name in order:
+        for metric in metrics:
+            row = table.loc[name].xs(metric, level=1)
+            wyniki.dodaj(records, wyniki.rekord('opisowe', n=int(row['n']),
+                                                opisowe=row.drop('n').to_dict()),
+                         folder=folder, plik=name, metryka=metric)
+
+    # Normalność: wszystkie pary (plik, metryka) jednym wywołaniem
+    keys = [(name, metric) for name in order for metric in metrics]
+    samples = [values.loc[files == name, metric].to_numpy(dtype=np.float64) for name, metric in keys]
+    tested = normalnosc.testuj(samples, backend, seed)
+    normal = {}
+    for (name, metric), row in zip(keys, tested.itertuples()):
+        if np.isnan(row.p):
+            verdict, normal[metric] = 'za mało danych', None
+        else:
+            normal[metric] = bool(row.p > 0.05)
+            verdict = 'normalny' if normal[metric] else 'nienormalny'
+        wyniki.dodaj(records, wyniki.rekord(row.test, row.statystyka, row.p, n=row.n, decyzja=verdict),
+                     folder=folder, plik=name, metryka=metric)
+
+    # Testy porównawcze grup (pliki) dla wszystkich metryk naraz
+    counts = grouped.count().reindex(order)
+    lev_w, lev_p = _levene_kolumn(values, files)
+    chi_stat, chi_p = stats.chisquare(counts.to_numpy(dtype=np.float64), axis=0)
+    f_val, f_p = _anova_kolumn(values, files)
+    h_val, h_p = _kruskal_kolumn(values, files)
+
+    def decision(p):
+        return 'odrzucono H0' if p < 0.05 else 'brak podstaw do odrzucenia H0'
+
+    for j, metric in enumerate(metrics):
+        n = [int(c) for c in counts[metric]]
+        context = {'folder': folder, 'metryka': metric}
+        if len(n) < 2 or all(c < 2 for c in n):
+            continue
+        equal_var = bool(lev_p[metric] > 0.05)
+        wyniki.dodaj(records, wyniki.rekord('levene', lev_w[metric], lev_p[metric], n=n,
+                                            decyzja='równe wariancje' if equal_var else 'różne wariancje'),
+                     **context)
+        wyniki.dodaj(records, wyniki.rekord('chi2_rownolicznosc', chi_stat[j], chi_p[j], grupy=order, n=n,
+                                            decyzja=decision(chi_p[j])), **context)
+        if normal[metric] and equal_var:
+            wyniki.dodaj(records, wyniki.rekord('anova', f_val[metric], f_p[metric], grupy=order, n=n,
+                                                decyzja=decision(f_p[metric])), **context)
+        else:
+            wyniki.dodaj(records, wyniki.rekord('kruskal', h_val[metric], h_p[metric], grupy=order, n=n,
+                                                decyzja=decision(h_p[metric])), **context)
+    return records
+
+
+def main(data_dir="data_to_analysis", columns=None, group_col=3, backend='auto', seed=None):
+    """
+    Tryb szeroki dla wszystkich folderów *_TTFF: każdy plik czytany jest raz, wyniki
+    wszystkich metryk trafiają do jednej tabeli data_dir/results_wide.csv.
+
+    Zwraca tabelę wyników (pd.DataFrame, kolumny KOLUMNY).
+    """
+    data_dir = Path(data_dir)
+    records = []
+    for folder in sorted(data_dir.iterdir()):
+        if not (folder.is_dir() and folder.name.endswith("_TTFF")):
+            continue
+        print(f"Analiza folderu (tryb szeroki): {folder}")
+        frame, metrics, errors = wczytaj_szeroko(folder, columns, group_col)
+        for error in errors:
+            print(f"  {error}")
+        records.extend(bateria(frame, metrics, folder.name, backend, seed))
+    # Statystyki opisowe rekordów 'opisowe' jako osobne kolumny tabeli
+    descriptive = pd.DataFrame([r.get('opisowe') or {} for r in records])
+    table = pd.concat([pd.DataFrame(records).drop(columns='opisowe', errors='ignore'), descriptive],
+                      axis=1).reindex(columns=KOLUMNY)
+    table.to_csv(data_dir / output_name, index=False)
+    return table
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Testy statystyczne wielu metryk naraz (tryb szeroki).")
+    parser.add_argument("--data-dir", default="data_to_analysis",
+                        help="katalog główny z folderami *_TTFF")
+    parser.add_argument("--columns", nargs="+", default=None,
+                        help="nazwy kolumn metryk (domyślnie wszystkie kolumny liczbowe)")
+    parser.add_argument("--group-col", type=int, default=3, help="numer kolumny grupującej")
+    parser.add_argument("--normality", default="auto", choices=["auto"] + list(normalnosc.BACKENDY),
+                        help="test normalności")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="ziarno podpróby testu normalności (shapiro_podprobka)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args.data_dir, args.columns, args.group_col, args.normality, args.seed)
@@ -0,0 +1,92 @@
+import json
+import os
+import pandas as pd
+from pathlib import Path
+
+# Pola wspólne wszystkich rekordów wyników testów
+POLA = ['folder', 'plik', 'test', 'statystyka', 'p', 'grupy', 'n', 'transformacja', 'decyzja']
+
+# Plik z rekordami całego drzewa danych (JSON lines, jeden rekord w linii)
+store_name = 'results.jsonl'
+
+
+def _to_builtin(value):
+    # Konwersja typów numpy/pandas na typy zapisywalne w JSON
+    if isinstance(value, dict):
+        return {str(k): _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def rekord(test, statystyka=None, p=None, grupy=None, n=None, transformacja=None, decyzja=None, **extra):
+    """
+    Rekord wyniku pojedynczego testu.
+
+    Parametry:
+    - test: str — nazwa testu (np. 'shapiro', 'levene', 'kruskal')
+    - statystyka: float | None — wartość statystyki testowej
+    - p: float | None — p-wartość
+    - grupy: list | None — etykiety porównywanych grup
+    - n: int | list | None — liczność próby (lub liczności grup)
+    - transformacja: str | None — transformacja danych, na których wykonano test
+    - decyzja: str | None — wniosek z testu
+    - extra: dodatkowe pola (np. blad, opisowe)
+    """
+    record = {'folder': None, 'plik': None, 'test': test, 'statystyka': statystyka, 'p': p,
+              'grupy': grupy, 'n': n, 'transformacja': transformacja, 'decyzja': decyzja}
+    record.update(extra)
+    return _to_builtin(record)
+
+
+def dodaj(records, record, **context):
+    # Dopisuje rekord (z kontekstem, np. folder i plik) do listy, jeśli lista jest zbierana
+    if records is not None:
+        record = dict(record)
+        record.update({k: _to_builtin(v) for k, v in context.items()})
+        records.append(record)
+    return record
+
+
+def zapisz_rekordy(records, path):
+    # Zapis rekordów jako JSON lines
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def wczytaj_rekordy(path):
+    """
+    Wczytuje magazyn rekordów jako pd.DataFrame (jedna kolumna na pole rekordu).
+    """
+    path = Path(path)
+    if not path.exists():
+        return pd.DataFrame(columns=POLA)
+    return pd.read_json(path, lines=True, dtype=False)
+
+
+def aktualizuj_magazyn(path, records, folders):
+    """
+    Podmienia w magazynie rekordy wskazanych folderów na nowe, pozostałe zachowuje.
+
+    Parametry:
+    - path: str | Path — plik magazynu (JSON lines)
+    - records: list — nowe rekordy
+    - folders: set — foldery, których rekordy są zastępowane
+    """
+    path = Path(path)
+    kept = []
+    if path.exists():
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get('folder') not in folders:
+                        kept.append(record)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    zapisz_rekordy(kept + list(records), tmp_path)
+    os.replace(tmp_path, path)